@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Build info memory benchmark.
+
+Loads the bundled stable build caches of all platforms, the way the Downloads page holds them, and reports the
+memory taken by the `BuildInfo` objects and the `BasicBuildInfo` copies the build lists keep for filtering.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "source"))
+
+from modules.scraper_cache import ScraperCache
+from modules.version_matcher import BasicBuildInfo
+
+API_FOLDER = Path("source/resources/api")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the memory taken by the bundled stable build caches")
+    parser.add_argument("--copies", type=int, default=1, help="Load every cache this many times")
+    args = parser.parse_args()
+
+    # The internal API files are found relative to the repository
+    os.chdir(Path(__file__).parent.parent)
+    paths = sorted(API_FOLDER.glob("stable_builds_api_*.json"))
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    # Parsed documents are dropped as soon as they are loaded, like the scrapers do
+    caches = [
+        ScraperCache.from_dict(json.loads(path.read_text(encoding="utf-8")))
+        for path in paths
+        for _ in range(args.copies)
+    ]
+    builds = [build for cache in caches for folder in cache.folders.values() for build in folder.assets]
+    loaded = time.perf_counter()
+    build_info_memory = tracemalloc.get_traced_memory()[0]
+
+    for build in builds:
+        build.semversion  # noqa: B018
+    basic = [BasicBuildInfo.from_buildinfo(build) for build in builds]
+    done = time.perf_counter()
+    total_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"{len(builds)} builds from {len(caches)} caches")
+    print(f"  load        {loaded - start:8.2f} s")
+    print(f"  BuildInfo   {build_info_memory / 1024**2:8.2f} MB  ({build_info_memory / len(builds):.0f} B per build)")
+    basic_memory = total_memory - build_info_memory
+    print(
+        f"  versions and BasicBuildInfo {basic_memory / 1024**2:8.2f} MB  ({basic_memory / len(basic):.0f} B per build)"
+    )
+    print(f"  semversion and copies {done - loaded:8.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Command line launch startup benchmark.
+
+Creates a library of fake builds, whose executable only prints its arguments, and a config pointing at it, then
+reports the wall time of ``main.py`` from process start to exit for the commands that run without a window.
+``--source`` times another checkout, e.g. a worktree of an older commit.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+SOURCE = Path(__file__).parent.parent / "source"
+sys.path.insert(0, str(SOURCE))
+
+from modules.build_info import BuildInfo  # noqa: E402
+
+COMMANDS = {
+    "help": ["--help"],
+    "launch help": ["launch", "--help"],
+    "launch -c": ["launch", "-c", "-v", "4.2.^", "--", "--factory-startup"],
+    "list --json": ["list", "--json"],
+}
+
+
+def make_library(root: Path, count: int):
+    library = root / "library"
+    for i in range(count):
+        build = library / "daily" / f"blender-4.{i % 5}.{i}"
+        build.mkdir(parents=True)
+        exe = build / "blender"
+        exe.write_text('#!/bin/sh\necho "$@" > /dev/null\n')
+        exe.chmod(0o755)
+        commit_time = datetime(2025, 1, 1 + i % 28, tzinfo=UTC)
+        BuildInfo(build.as_posix(), f"4.{i % 5}.{i}", f"{i:012x}", commit_time, "daily").write_to(build)
+
+    config = root / "config" / "Blender Launcher"
+    config.mkdir(parents=True)
+    (config / "Blender Launcher.ini").write_text(
+        f"[General]\nlibrary_folder={library.as_posix()}\nlaunch_blender_no_console=true\n", encoding="utf-8"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time command line launches from process start to exit")
+    parser.add_argument("--source", type=Path, default=SOURCE, help="Source folder of the launcher to time")
+    parser.add_argument("--builds", type=int, default=100, help="Number of builds in the library")
+    parser.add_argument("--runs", type=int, default=10, help="Runs of every command")
+    args = parser.parse_args()
+
+    if sys.platform == "win32":
+        sys.exit("The fake builds are shell scripts, run this on Linux or macOS")
+
+    with tempfile.TemporaryDirectory(prefix="bl-cli-bench-") as tmp:
+        root = Path(tmp)
+        make_library(root, args.builds)
+        env = os.environ | {
+            "XDG_CONFIG_HOME": str(root / "config"),
+            "XDG_CACHE_HOME": str(root / "cache"),
+            "HOME": str(root),
+            # Time the launcher, not compiling it
+            "PYTHONPYCACHEPREFIX": str(root / "pycache"),
+        }
+        env.pop("PYTHONDONTWRITEBYTECODE", None)
+
+        print(f"{args.builds} builds, {args.runs} runs of {args.source / 'main.py'}")
+        for name, command in COMMANDS.items():
+            times = []
+            # The first run compiles the bytecode and fills the library index
+            for _ in range(args.runs + 1):
+                start = time.perf_counter()
+                subprocess.run(
+                    [sys.executable, str(args.source / "main.py"), *command],
+                    cwd=root,
+                    env=env,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    check=True,
+                )
+                times.append(time.perf_counter() - start)
+            times = times[1:]
+            print(f"  {name:12} best {min(times) * 1000:7.1f} ms  median {statistics.median(times) * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Extraction benchmark.
+
+Generates a synthetic build archive and times extracting it with every decompression backend
+available on this machine, including the pure-Python fallback.
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "source"))
+
+from modules.decompression import (
+    DecompressionStream,
+    available_backends,
+    extract_zip_parallel,
+    plan_zip_extraction,
+)
+from threads import extractor
+
+
+def generate_tree(root: Path, size_mb: int, file_kb: int = 256):
+    """Write a build-like tree: a mix of compressible text and incompressible binaries."""
+    folder = root / "blender-9.9.9-benchmark"
+    remaining = size_mb * 1024 * 1024
+    i = 0
+    while remaining > 0:
+        size = min(remaining, file_kb * 1024)
+        sub = folder / f"dir{i % 32}"
+        sub.mkdir(parents=True, exist_ok=True)
+        if i % 3 == 0:
+            data = os.urandom(size)
+        else:
+            data = (f"line {i} of some fairly repetitive python source\n" * (size // 48 + 1)).encode()[:size]
+        (sub / f"file{i}.bin").write_bytes(data)
+        remaining -= size
+        i += 1
+    return folder
+
+
+def make_archive(folder: Path, out: Path) -> Path:
+    archive = out / f"{folder.name}.tar.xz"
+    xz = shutil.which("xz")
+    if xz:
+        # Multi-threaded xz writes several blocks, which is what parallel decompressors need
+        tar_path = out / f"{folder.name}.tar"
+        with tarfile.open(tar_path, "w") as tar:
+            tar.add(folder, arcname=folder.name)
+        subprocess.check_call([xz, "-T0", "-6", str(tar_path)])
+    else:
+        with tarfile.open(archive, "w:xz") as tar:
+            tar.add(folder, arcname=folder.name)
+    return archive
+
+
+def make_zip(folder: Path, out: Path) -> Path:
+    archive = out / f"{folder.name}.zip"
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+        for path in sorted(folder.rglob("*")):
+            zf.write(path, path.relative_to(folder.parent).as_posix())
+    return archive
+
+
+def report(results: dict[str, float]):
+    baseline = results["python"]
+    print()
+    for name, elapsed in results.items():
+        print(f"  {name:<10} x{baseline / elapsed:5.2f}")
+    print()
+
+
+def bench_tar(folder: Path, work: Path):
+    archive = make_archive(folder, work)
+    print(f"Archive: {archive.name} ({archive.stat().st_size / 1024 / 1024:.1f} MB)")
+
+    def python(dest: Path):
+        with tarfile.open(archive) as tar:
+            tar.extractall(dest)
+
+    results = {"python": run("python", python, work / "out")}
+    for backend in available_backends(".xz"):
+
+        def stream(dest: Path, backend=backend):
+            extractor.extract_tar_stream(DecompressionStream(archive, backend), dest, lambda *_: None)
+
+        results[backend.name] = run(backend.name, stream, work / "out")
+    report(results)
+
+
+def bench_zip(folder: Path, work: Path):
+    archive = make_zip(folder, work)
+    print(f"Archive: {archive.name} ({archive.stat().st_size / 1024 / 1024:.1f} MB)")
+
+    with zipfile.ZipFile(archive) as zf:
+        members = zf.infolist()
+
+        def python(dest: Path):
+            for member in members:
+                zf.extract(member, dest)
+
+        def parallel(dest: Path):
+            extract_zip_parallel(archive, plan_zip_extraction(members, dest), lambda *_: None)
+
+        report({"python": run("python", python, work / "out"), "parallel": run("parallel", parallel, work / "out")})
+
+
+def run(name: str, fn, destination: Path) -> float:
+    shutil.rmtree(destination, ignore_errors=True)
+    start = time.perf_counter()
+    fn(destination)
+    elapsed = time.perf_counter() - start
+    print(f"  {name:<10} {elapsed:8.2f} s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare extraction backends used by the extractor")
+    parser.add_argument("--size-mb", type=int, default=256, help="Uncompressed size of the generated build")
+    parser.add_argument("--format", choices=("tar", "zip", "all"), default="all", help="Archive formats to compare")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated files")
+    args = parser.parse_args()
+
+    work = Path(tempfile.mkdtemp(prefix="bl-extract-bench-"))
+    try:
+        print(f"Generating {args.size_mb} MB build in {work}")
+        folder = generate_tree(work / "src", args.size_mb)
+        if args.format in ("tar", "all"):
+            bench_tar(folder, work)
+        if args.format in ("zip", "all"):
+            bench_zip(folder, work)
+    finally:
+        if not args.keep:
+            shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
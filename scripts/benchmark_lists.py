@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Build list benchmark.
+
+Fills a library or downloads page with synthetic builds and reports the time and memory it takes to create
+and insert the rows, to show the page, scroll it from top to bottom, filter and sort it, and to open the context
+menu of one of the rows.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "source"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from items.base_list_widget_item import BaseListWidgetItem
+from modules.build_info import BuildInfo
+from modules.icons import Icons
+from modules.version_matcher import VersionSearchQuery
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtWidgets import QApplication, QVBoxLayout, QWidget
+from widgets.base_menu_widget import BaseMenuWidget
+from widgets.base_page_widget import BasePageWidget
+from widgets.download_widget import DownloadWidget
+from widgets.library_widget import LibraryWidget
+
+
+def rss() -> int | None:
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss
+
+
+class Launcher(QWidget):
+    """The parts of BlenderLauncher the build widgets touch while they are created."""
+
+    def __init__(self):
+        super().__init__()
+        self.icons = Icons.get()
+        self.quick_launch_handler = type("QuickLaunchHandler", (), {"quick_launch_build": None})()
+
+    def reload_custom_builds(self):
+        pass
+
+
+def make_build_info(i: int, now: datetime) -> BuildInfo:
+    return BuildInfo(
+        f"https://example.com/blender-4.{i % 5}.{i}-daily.zip",
+        f"4.{i % 5}.{i % 100}",
+        f"{i:012x}",
+        now - timedelta(hours=i),
+        ("daily", "experimental")[i % 2],
+    )
+
+
+def fill(launcher: Launcher, page: BasePageWidget, kind: str, count: int, library: Path):
+    now = datetime.now(tz=UTC)
+    widget = None
+    for i in range(count):
+        build_info = make_build_info(i, now)
+        item = BaseListWidgetItem(build_info.commit_time)
+        if kind == "library":
+            widget = LibraryWidget(launcher, item, library / "daily" / f"blender-{i}", page.list_widget, build_info)
+        else:
+            widget = DownloadWidget(launcher, page.list_widget, item, build_info, installed=None)
+        page.list_widget.add_item(item, widget)
+    return widget
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time creating and inserting build list rows")
+    parser.add_argument("--kind", choices=("library", "downloads"), default="library", help="Row widget to create")
+    parser.add_argument("--count", type=int, default=500, help="Number of builds")
+    args = parser.parse_args()
+
+    app = QApplication([])
+    launcher = Launcher()
+    page = BasePageWidget(launcher, "BenchmarkPage", "Benchmark", "")
+
+    # Close menus right after they open instead of waiting for a click
+    BaseMenuWidget.exec_ = lambda self, *_: QTimer.singleShot(0, self.close)
+
+    with tempfile.TemporaryDirectory(prefix="bl-lists-bench-") as library:
+        before = rss()
+        start = time.perf_counter()
+        last = fill(launcher, page, args.kind, args.count, Path(library))
+        created = time.perf_counter()
+        QVBoxLayout(launcher).addWidget(page)
+        launcher.resize(900, 700)
+        launcher.show()
+        app.processEvents()
+        settled = time.perf_counter()
+        after = rss()
+
+        # A page at a time, pausing after each page like a user would, which lets the rows scrolled into view
+        # create their widgets. The slowest frame is the longest the list stops responding.
+        list_widget = page.list_widget
+        scroll_bar = list_widget.verticalScrollBar()
+        pages = 0
+        frames = []
+        while scroll_bar.value() < scroll_bar.maximum():
+            frame = time.perf_counter()
+            scroll_bar.setValue(scroll_bar.value() + list_widget.viewport().height())
+            pages += 1
+            pause = time.perf_counter() + 0.05
+            while time.perf_counter() < pause:
+                app.processEvents()
+                frames.append(time.perf_counter() - frame)
+                frame = time.perf_counter()
+        scrolled = time.perf_counter()
+
+        list_widget.update_tab_filter(VersionSearchQuery.any().with_branch(("daily",)))
+        list_widget.update_tab_filter(VersionSearchQuery.any())
+        app.processEvents()
+        filtered = time.perf_counter()
+
+        list_widget.sortItems(Qt.SortOrder.DescendingOrder)
+        app.processEvents()
+        sorted_ = time.perf_counter()
+
+        assert last is not None
+        list_widget.scroll_to_widget(last)
+        last.context_menu()
+        menu = time.perf_counter()
+
+        print(f"{args.count} {args.kind} rows")
+        print(f"  create   {created - start:8.2f} s  ({(created - start) / args.count * 1000:.2f} ms per row)")
+        print(f"  show     {settled - created:8.2f} s")
+        frames.sort()
+        slowest = frames[-1] * 1000 if frames else 0
+        typical = frames[len(frames) * 95 // 100] * 1000 if frames else 0
+        print(f"  scroll   {pages:8d} pages, 95% of frames under {typical:.1f} ms, slowest {slowest:.1f} ms")
+        print(f"  filter   {(filtered - scrolled) * 1000:8.2f} ms  (one tab and back)")
+        print(f"  sort     {(sorted_ - filtered) * 1000:8.2f} ms")
+        print(f"  menu     {(menu - sorted_) * 1000:8.2f} ms")
+        if before is not None and after is not None:
+            used = after - before
+            print(f"  memory   {used / 1024**2:8.1f} MB  ({used / args.count / 1024:.1f} KB per row)")
+        else:
+            print("  memory   install psutil to measure")
+
+    # Tearing down thousands of widgets at interpreter exit is slow and can crash PySide
+    sys.stdout.flush()
+    os._exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Version parser benchmark.
+
+Times `parse_blender_ver` on the version strings of the parser tests and on the file names and versions of the
+bundled stable build caches, which is what the scrapers parse, both uncached and through its cache.
+"""
+
+import argparse
+import contextlib
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "source"))
+
+from modules.build_info import parse_blender_ver
+
+from tests.backend.test_build_parser import PARSER_CASES
+
+API_FOLDER = Path(__file__).parent.parent / "source" / "resources" / "api"
+
+
+def corpus() -> list[tuple[str, bool]]:
+    strings = [case for case, _ in PARSER_CASES]
+    for path in sorted(API_FOLDER.glob("stable_builds_api_*.json")):
+        for folder in json.loads(path.read_text(encoding="utf-8"))["folders"].values():
+            for link, info in folder["assets"]:
+                # Like ScraperStable.new_blender_build and the build info checks
+                strings.append((Path(link).stem, True))
+                strings.append((info["blinfo"][0]["subversion"], False))
+    return strings
+
+
+def run(parse, strings: list[tuple[str, bool]], rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for s, search in strings:
+            with contextlib.suppress(ValueError):
+                parse(s, search)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time parsing Blender version strings")
+    parser.add_argument("--rounds", type=int, default=5, help="Best of this many runs")
+    args = parser.parse_args()
+
+    strings = corpus()
+    uncached = run(parse_blender_ver.__wrapped__, strings, args.rounds)
+    cached = run(parse_blender_ver, strings, args.rounds)
+
+    print(f"{len(strings)} version strings ({len(set(strings))} distinct)")
+    print(f"  uncached  {uncached * 1000:8.2f} ms  ({uncached / len(strings) * 1e6:.2f} µs per string)")
+    print(f"  cached    {cached * 1000:8.2f} ms  ({cached / len(strings) * 1e6:.2f} µs per string)")
+
+
+if __name__ == "__main__":
+    main()
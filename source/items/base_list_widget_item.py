@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-from datetime import UTC
+from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Generic, TypeVar
 
-from PySide6.QtWidgets import QListWidgetItem
+from PySide6.QtCore import Qt
 from widgets.base_build_widget import BaseBuildWidget
 
 if TYPE_CHECKING:
@@ -12,73 +12,63 @@ if TYPE_CHECKING:
 
 _WT = TypeVar("_WT", bound=BaseBuildWidget)
 
+_NO_DATE = datetime.min.replace(tzinfo=UTC)
 
-class BaseListWidgetItem(QListWidgetItem, Generic[_WT]):
-    def __init__(self, date=None):
-        super().__init__()
-        self.date = date
-
-    def list_widget(self) -> BaseListWidget[_WT]:
-        return self.listWidget()  # type: ignore
-
-    def __lt__(self, other):
-        sorting_type = self.list_widget().page.sorting_type
-
-        if sorting_type.name == "DATETIME":
-            return self.compare_datetime(other)
-        if sorting_type.name == "VERSION":
-            return self.compare_version(other)
-        if sorting_type.name == "LABEL":
-            return self.compare_label(other)
-        return False
-
-    def compare_datetime(self, other):
-        if (self.date is None) or (other.date is None):
-            return False
-
-        if self.date.tzinfo is None or other.date.tzinfo is None:
-            self.date = self.date.replace(tzinfo=UTC)
-            other.date = other.date.replace(tzinfo=UTC)
-
-        return self.date > other.date
-
-    def compare_version(self, other):
-        list_widget = self.list_widget()
-
-        this_widget = list_widget.itemWidget(self)
-        other_widget = list_widget.itemWidget(other)
 
-        if (
-            this_widget is None
-            or other_widget is None
-            or this_widget.build_info is None
-            or other_widget.build_info is None
-        ):
-            return False
+class BaseListWidgetItem(Generic[_WT]):
+    """The row of a build widget in a `BaseListWidget`, set up when the widget is added to the list."""
 
-        this_version: Version = this_widget.build_info.semversion
-        other_version: Version = other_widget.build_info.semversion
-
-        if this_version == other_version:
-            return self.compare_datetime(other)
-
-        return this_version > other_version
-
-    def compare_label(self, other):
-        list_widget = self.list_widget()
-
-        this_widget = list_widget.itemWidget(self)
-        other_widget = list_widget.itemWidget(other)
-
-        if (
-            this_widget is None
-            or other_widget is None
-            or this_widget.build_info is None
-            or other_widget.build_info is None
-        ):
-            return False
-
-        this_label = this_widget.build_info.display_label
-        other_label = other_widget.build_info.display_label
-
-        return this_label < other_label
+    def __init__(self, date=None):
+        self.date = date
+        self._list: BaseListWidget[_WT] | None = None
+        self._widget: _WT | None = None
+        self._flags = Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled
+
+    def attach(self, list_widget: BaseListWidget[_WT], widget: _WT):
+        self._list = list_widget
+        self._widget = widget
+
+    def listWidget(self) -> BaseListWidget[_WT] | None:
+        return self._list
+
+    def widget(self) -> _WT | None:
+        return self._widget
+
+    def flags(self) -> Qt.ItemFlag:
+        return self._flags
+
+    def setFlags(self, flags: Qt.ItemFlag):
+        self._flags = flags
+
+    def isHidden(self) -> bool:
+        return self._list is None or self._widget is None or self._list.is_hidden(self._widget)
+
+    def isSelected(self) -> bool:
+        return self._list is not None and self._widget is not None and self._list.is_selected(self._widget)
+
+    def setSelected(self, selected: bool):
+        if self._list is not None and self._widget is not None:
+            self._list.set_selected(self._widget, selected)
+
+    def sort_key(self, sorting_type: str) -> tuple:
+        """The date, version and date, or label of the build of this row, depending on ``sorting_type``."""
+        if sorting_type == "LABEL":
+            return (self._widget.build_info.display_label,) if self._widget is not None else ("",)
+        date = self.date
+        if date is None:
+            date = _NO_DATE
+        elif date.tzinfo is None:
+            date = date.replace(tzinfo=UTC)
+        if sorting_type == "VERSION" and self._widget is not None:
+            return (_version_key(self._widget.build_info.semversion), date)
+        return (date,)
+
+
+def _version_key(version: Version) -> tuple:
+    """``version`` as a tuple that orders like it, build metadata aside."""
+    if version.prerelease is None:
+        prerelease: tuple = (1,)
+    else:
+        # Numeric identifiers order before alphanumeric ones, and a longer prerelease after its prefix
+        prerelease = (0, *((0, int(p), "") if p.isdigit() else (1, 0, p) for p in str(version.prerelease).split(".")))
+    return (version.major, version.minor, version.patch, prerelease)
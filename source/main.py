@@ -10,22 +10,18 @@ from pathlib import Path
 from typing import TYPE_CHECKING, NoReturn
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from modules.version_matcher import VersionSearchQuery
+    from PySide6.QtWidgets import QApplication
 
-import modules._resources_rc  # noqa: F401
-import utils.i18n_init  # noqa: F401
+# Everything else is imported where it is used; tests/backend/test_import_time.py keeps startup imports in check.
+# Nothing imported here may import Qt, commands in modules.headless and modules.automation run without it.
 from modules import argument_parsing as ap
-from modules.cli_launching import cli_launch
+from modules.automation import add_automation_parsers
 from modules.file_utils import retry_on_permission_error
-from modules.fonts import Fonts
+from modules.headless import find_headless_command
 from modules.platform_utils import _popen, get_cache_path, get_cwd, get_launcher_name, get_platform, is_frozen
-from modules.settings import get_auto_register_winget, get_log_level
-from modules.shortcut import register_windows_filetypes, unregister_windows_filetypes
-from modules.uninstall import perform_uninstall
-from modules.version_matcher import VALID_FULL_QUERIES, VERSION_SEARCH_SYNTAX
-from modules.winget_integration import register_with_winget
-from PySide6.QtCore import QFile, QTextStream
-from PySide6.QtWidgets import QApplication
+from modules.settings import get_auto_register_winget, get_log_level, preload_credentials, use_ini_settings
+from modules.version_matcher import VERSION_SEARCH_SYNTAX
 from semver import Version
 from utils.dpi import apply_scale_factor
 from utils.logger import setup_logging
@@ -65,6 +61,7 @@ def add_help(parser: ArgumentParser):
 def main():
     parser = ArgumentParser(description=f"Blender Launcher ({version})", add_help=False)
     add_help(parser)
+    parser.set_defaults(launcher_version=version)
 
     subparsers = parser.add_subparsers(dest="command")
 
@@ -128,6 +125,8 @@ def main():
         help="Additional arguments to pass to Blender, should be provided after double dash. E.g. 'launch -- --background',",
     )
 
+    add_automation_parsers(subparsers, add_help)
+
     if sys.platform == "win32":
         subparsers.add_parser(
             "register",
@@ -165,21 +164,39 @@ def main():
 
     # Custom help is necessary for frozen Windows builds
     if args.help:
-        ap.show_help(parser, update_parser, launch_parser, args)
+        ap.show_help(parser, subparsers.choices, args)
         sys.exit(0)
 
+    headless = find_headless_command(args)
+    if headless is not None:
+        if not headless.qt_core:
+            # Before logging reads the log level, so the settings are never read through Qt
+            use_ini_settings()
+    else:
+        # Reports a PySide6 that can't be imported before anything else tries to
+        import modules._resources_rc  # noqa: F401
+        import utils.i18n_init  # noqa: F401
+
     setup_logging(
         log_path=get_cache_path().absolute() / "blender-launcher.log",
         level="DEBUG" if args.debug else get_log_level(),
         max_bytes=1 * 1024 * 1024,  # 1 MB
         backup_count=2,
         format_string="[%(asctime)s:%(levelname)s] %(message)s",
+        console=sys.stderr if headless is not None and headless.prints_results else None,
     )
     sys.excepthook = handle_exception
 
     # Log Blender Launcher version
     logger.info(f"Blender Launcher Version: {version}")
 
+    if headless is not None:
+        headless.run(args)
+
+    from modules.fonts import Fonts
+    from PySide6.QtCore import QFile, QTextStream
+    from PySide6.QtWidgets import QApplication
+
     with apply_scale_factor():
         # Create an instance of application and set its core properties
         app = QApplication(["blender-launcher-v2"])
@@ -202,24 +219,15 @@ def main():
         start_update(app, args.instanced, args.version)
 
     if args.command == "launch":
-        blender_args: list[str] = args.blender_args.copy()
-        # Skip only first `--`, as it also can be a valid argument to pass to Blender.
-        if "--" in blender_args:
-            blender_args.remove("--")
-        start_launch(
-            app,
-            args.file,
-            args.version,
-            args.open_last,
-            cli=args.cli,
-            blender_args=blender_args,
-        )
+        start_launch(app, args.file, ap.parse_version_query(args.version), args.open_last)
 
     if args.command == "register":
         start_register()
     if args.command == "unregister":
         start_unregister()
     if args.command == "uninstall":
+        from modules.uninstall import perform_uninstall
+
         perform_uninstall(args.quiet)
 
     if not args.instanced:
@@ -227,8 +235,13 @@ def main():
 
     # Register with WinGet on startup
     if get_platform() == "Windows" and get_auto_register_winget():
+        from modules.winget_integration import register_with_winget
+
         register_with_winget(sys.executable, str(version))
 
+    # The GitHub token and proxy credentials are needed by the first requests
+    preload_credentials()
+
     from windows.main_window import BlenderLauncher
 
     app.setQuitOnLastWindowClosed(False)
@@ -288,47 +301,24 @@ def start_update(app: QApplication, is_instanced: bool, tag: str | None):
 def start_launch(
     app: QApplication,
     file: Path | None = None,
-    version_query: str | None = None,
+    query: VersionSearchQuery | None = None,
     open_last: bool = False,
-    cli: bool = False,
-    blender_args: Sequence[str] = (),
 ) -> NoReturn:
-    from modules.version_matcher import VersionSearchQuery
     from windows.launching_window import LaunchingWindow
 
-    # convert version_query to VersionSearchQuery
-    if version_query is not None:
-        try:
-            query = VersionSearchQuery.parse(version_query)
-        except Exception:
-            print("Failed to parse query")
-            print(VERSION_SEARCH_SYNTAX)
-            print("Valid version queries include: ")
-            print(VALID_FULL_QUERIES)
-            sys.exit(1)
-    else:
-        query = None
-
     # remove quotes around file path if they exist
     if file is not None:
         file = Path(str(file).strip('"'))
 
-    if cli:
-        cli_launch(
-            file=file,
-            version_query=query,
-            open_last=open_last,
-            blender_args=blender_args,
-        )
-        sys.exit(1)
-    else:
-        LaunchingWindow(app, version_query=query, blendfile=file, open_last=open_last).show()
-        sys.exit(app.exec())
+    LaunchingWindow(app, version_query=query, blendfile=file, open_last=open_last).show()
+    sys.exit(app.exec())
 
 
 def start_register():
     import sys
 
+    from modules.shortcut import register_windows_filetypes
+
     register_windows_filetypes()
 
     sys.exit(0)
@@ -337,6 +327,8 @@ def start_register():
 def start_unregister():
     import sys
 
+    from modules.shortcut import unregister_windows_filetypes
+
     unregister_windows_filetypes()
     sys.exit(0)
 
@@ -356,4 +348,9 @@ def check_for_instance():
 
 
 if __name__ == "__main__":
+    # Required for the process pool used to extract zip archives in frozen builds
+    if is_frozen():
+        import multiprocessing
+
+        multiprocessing.freeze_support()
     main()
@@ -1,15 +1,24 @@
+from __future__ import annotations
+
 import sys
-from argparse import ArgumentParser, Namespace
+from typing import TYPE_CHECKING
 
-from i18n import t
 from modules.platform_utils import is_frozen, show_windows_help
 
+if TYPE_CHECKING:
+    from argparse import ArgumentParser, Namespace
+    from collections.abc import Mapping
+
+    from modules.version_matcher import VersionSearchQuery
+
 # These custom handlings are necessary for frozen Windows builds to show
 # argparse help messages properly
 
 
 def error(parser: ArgumentParser, msg: str):
     if is_frozen() and sys.platform == "win32":
+        import utils.i18n_init  # noqa: F401
+        from i18n import t
         from PySide6.QtWidgets import QApplication
         from windows.popup_window import Popup
 
@@ -24,23 +33,33 @@ def error(parser: ArgumentParser, msg: str):
         parser.error(msg)
 
 
-def show_help(
-    parser: ArgumentParser,
-    update_parser: ArgumentParser,
-    launch_parser: ArgumentParser,
-    args: Namespace,
-):
+def show_help(parser: ArgumentParser, commands: Mapping[str, ArgumentParser], args: Namespace):
+    command_parser = commands.get(args.command, parser)
     if is_frozen() and sys.platform == "win32":
-        if args.command == "update":
-            show_windows_help(update_parser)
-        elif args.command == "launch":
-            show_windows_help(launch_parser)
-        else:
-            show_windows_help(parser)
+        show_windows_help(command_parser)
     else:
-        if args.command == "update":
-            update_parser.print_help()
-        elif args.command == "launch":
-            launch_parser.print_help()
-        else:
-            parser.print_help()
+        command_parser.print_help()
+
+
+def parse_version_query(version_query: str | None) -> VersionSearchQuery | None:
+    """The query given to ``launch --version``, exiting with the query syntax if it is invalid."""
+    from modules.version_matcher import VALID_FULL_QUERIES, VERSION_SEARCH_SYNTAX, VersionSearchQuery
+
+    if version_query is None:
+        return None
+    try:
+        return VersionSearchQuery.parse(version_query)
+    except Exception:
+        print("Failed to parse query")
+        print(VERSION_SEARCH_SYNTAX)
+        print("Valid version queries include: ")
+        print(VALID_FULL_QUERIES)
+        sys.exit(1)
+
+
+def get_blender_args(args: Namespace) -> list[str]:
+    blender_args: list[str] = args.blender_args.copy()
+    # Skip only first `--`, as it also can be a valid argument to pass to Blender.
+    if "--" in blender_args:
+        blender_args.remove("--")
+    return blender_args
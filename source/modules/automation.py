@@ -0,0 +1,405 @@
+"""
+Commands for managing builds from scripts, e.g. to provision render nodes that have no display.
+
+``list``, ``scrape``, ``download``, ``install`` and ``prune`` run the scrapers, the download, extraction and removal
+tasks and the retention policy of the GUI without opening a window. Downloads and installs of several builds run side
+by side. With ``--json`` a command prints a single JSON document to stdout; the console log goes to stderr either
+way. The exit code tells how it went, see `ExitCode`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from enum import IntEnum
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NoReturn
+
+from modules.headless import headless_command
+from modules.version_matcher import VERSION_SEARCH_SYNTAX, BasicBuildInfo, BuildIndex, VersionSearchQuery
+
+if TYPE_CHECKING:
+    from argparse import ArgumentParser, Namespace
+    from collections.abc import Callable, Iterable, Iterator
+
+    from modules.build_info import BuildInfo
+    from modules.connection_manager import ConnectionManager
+
+
+class ExitCode(IntEnum):
+    OK = 0
+    FAILED = 1
+    """Some of the builds failed to download, install or be removed"""
+    USAGE = 2
+    """Invalid arguments, the code argparse exits with"""
+    NO_MATCH = 3
+    """A version query matched no build"""
+
+
+# Attributes of `Scraper` that enable each source of builds
+SOURCES = {
+    "stable": "scrape_stable",
+    "daily": "scrape_daily",
+    "experimental": "scrape_experimental",
+    "bforartists": "scrape_bfa",
+    "upbge": "scrape_upbge",
+    "upbge-weekly": "scrape_upbge_weekly",
+}
+
+DEFAULT_JOBS = 4
+
+
+def version_query(s: str) -> VersionSearchQuery:
+    try:
+        return VersionSearchQuery.parse(s)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid version query {s!r}, expected {VERSION_SEARCH_SYNTAX}") from None
+
+
+def add_automation_parsers(subparsers: argparse._SubParsersAction, add_help: Callable[[ArgumentParser], None]):
+    """Add the parsers of the commands of this module to ``subparsers``."""
+
+    def add_parser(name: str, help: str) -> ArgumentParser:  # noqa: A002
+        parser = subparsers.add_parser(
+            name, help=f"{help} Run '{name} --help' to see available options.", add_help=False
+        )
+        add_help(parser)
+        parser.add_argument("--json", action="store_true", help="Print the result as JSON.")
+        return parser
+
+    def add_sources(parser: ArgumentParser):
+        parser.add_argument(
+            "-s",
+            "--source",
+            nargs="+",
+            choices=SOURCES,
+            metavar="SOURCE",
+            help=f"Where to look for builds: {', '.join(SOURCES)}. Defaults to the sources enabled in the settings.",
+        )
+
+    def add_jobs(parser: ArgumentParser):
+        parser.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=DEFAULT_JOBS,
+            help=f"How many builds to download at the same time. Defaults to {DEFAULT_JOBS}.",
+        )
+
+    def add_versions(parser: ArgumentParser):
+        parser.add_argument(
+            "versions",
+            # Not required by argparse, so that --help works without them
+            nargs="*",
+            type=version_query,
+            help=f"Versions to look for, one build each. {VERSION_SEARCH_SYNTAX}",
+        )
+        parser.add_argument(
+            "-a",
+            "--all",
+            action="store_true",
+            help="Take every build a version matches instead of the newest one.",
+        )
+
+    list_parser = add_parser("list", "List the builds in the library.")
+    list_parser.add_argument(
+        "-v", "--version", type=version_query, help=f"Only list matching builds. {VERSION_SEARCH_SYNTAX}"
+    )
+
+    scrape_parser = add_parser("scrape", "List the builds available for download.")
+    scrape_parser.add_argument(
+        "-v", "--version", type=version_query, help=f"Only list matching builds. {VERSION_SEARCH_SYNTAX}"
+    )
+    add_sources(scrape_parser)
+
+    download_parser = add_parser("download", "Download the archives of builds without installing them.")
+    add_versions(download_parser)
+    add_sources(download_parser)
+    add_jobs(download_parser)
+    download_parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        default=Path(),
+        help="Folder to save the archives to. Defaults to the current folder.",
+    )
+
+    install_parser = add_parser("install", "Download builds and install them into the library.")
+    add_versions(install_parser)
+    add_sources(install_parser)
+    add_jobs(install_parser)
+    install_parser.add_argument(
+        "-f",
+        "--force",
+        action="store_true",
+        help="Install builds again that are already in the library.",
+    )
+
+    prune_parser = add_parser(
+        "prune",
+        "Remove builds from the library by the retention policy, even if automatic cleanup is turned off.",
+    )
+    prune_parser.add_argument(
+        "--keep-newest", type=int, help="Builds to keep per branch and minor version, instead of the setting."
+    )
+    prune_parser.add_argument(
+        "--max-age", type=int, help="Remove builds built and installed more than this many days ago."
+    )
+    prune_parser.add_argument("--max-size", type=int, help="Gigabytes the builds may take up.")
+    prune_parser.add_argument("--dry-run", action="store_true", help="Only show what would be removed.")
+    prune_parser.add_argument(
+        "--delete", action="store_true", help="Delete the builds instead of sending them to the trash."
+    )
+
+
+def _build_json(info: BuildInfo) -> dict[str, Any]:
+    return {"link": info.link, "version": str(info.full_semversion), **info.to_dict()["blinfo"][0]}
+
+
+def _describe(info: BuildInfo) -> str:
+    return f"{info.full_semversion} ({info.branch}, {info.commit_time:%Y-%m-%d %H:%M})"
+
+
+def _finish(args: Namespace, result: dict[str, Any], lines: Iterable[str], code: ExitCode) -> NoReturn:
+    if args.json:
+        json.dump(result, sys.stdout, indent=2)
+        print()
+    else:
+        for line in lines:
+            print(line)
+    sys.exit(code)
+
+
+def _match(builds: Iterable[BuildInfo], queries: list[VersionSearchQuery], all_matches: bool):
+    """The builds ``queries`` match, newest first, and the queries that match none."""
+    basics: dict[BasicBuildInfo, BuildInfo] = {}
+    for build in builds:
+        try:
+            basics[BasicBuildInfo.from_buildinfo(build)] = build
+        except ValueError:
+            continue
+    index = BuildIndex(basics)
+
+    matched: dict[BasicBuildInfo, BuildInfo] = {}
+    unmatched: list[VersionSearchQuery] = []
+    for query in queries:
+        matches = index.match(query)
+        if not matches:
+            unmatched.append(query)
+        for basic in matches if all_matches else matches[:1]:
+            matched.setdefault(basic, basics[basic])
+    return list(matched.values()), unmatched
+
+
+def _connection_manager(args: Namespace) -> ConnectionManager:
+    from modules.connection_manager import ConnectionManager
+
+    cm = ConnectionManager(version=args.launcher_version)
+    cm.setup()
+    return cm
+
+
+def _scrape(args: Namespace, cm: ConnectionManager) -> tuple[list[BuildInfo], list[str]]:
+    """The builds available for this platform and the errors the scrapers reported."""
+    from PySide6.QtCore import Qt
+    from threads.scraper import Scraper
+
+    scraper = Scraper(None, cm)
+    if args.source:
+        for source, attribute in SOURCES.items():
+            setattr(scraper, attribute, source in args.source)
+
+    errors: list[str] = []
+    scraper.stable_error.connect(errors.append, Qt.ConnectionType.DirectConnection)
+    # The scrapers skip what they couldn't fetch, which must not look like there being nothing to download
+    cm.error.connect(lambda: errors.append("A request failed, see the log"), Qt.ConnectionType.DirectConnection)
+    builds = list(scraper.builds())
+    # Later requests are downloads, which report their own errors
+    return builds, errors.copy()
+
+
+def _find_downloads(
+    args: Namespace,
+) -> tuple[ConnectionManager, list[BuildInfo], list[VersionSearchQuery], list[str]]:
+    """Scrape the builds the versions of ``download`` or ``install`` ask for."""
+    if not args.versions:
+        print(f"{args.command}: error: no versions given", file=sys.stderr)
+        sys.exit(ExitCode.USAGE)
+
+    cm = _connection_manager(args)
+    builds, errors = _scrape(args, cm)
+    builds, unmatched = _match(builds, args.versions, args.all)
+    return cm, builds, unmatched, errors
+
+
+def _in_parallel(
+    f: Callable[[BuildInfo], Any], builds: list[BuildInfo], jobs: int
+) -> Iterator[tuple[BuildInfo, Any, Exception | None]]:
+    """Call ``f`` with each build on ``jobs`` threads and yield the builds with their results as they finish."""
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(builds)))) as pool:
+        futures = {pool.submit(f, build): build for build in builds}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as e:
+                yield futures[future], None, e
+
+
+@headless_command("list", prints_results=True)
+def list_builds(args: Namespace) -> NoReturn:
+    from modules.library_index import read_library_index
+    from modules.settings import build_library_folders
+
+    builds = sorted((info for _, info in read_library_index(build_library_folders)), reverse=True)
+    if args.version is not None:
+        builds, _ = _match(builds, [args.version], all_matches=True)
+
+    _finish(
+        args,
+        {"builds": [_build_json(b) for b in builds]},
+        (f"{_describe(b)}  {b.link}" for b in builds),
+        ExitCode.NO_MATCH if args.version is not None and not builds else ExitCode.OK,
+    )
+
+
+@headless_command("scrape", qt_core=True, prints_results=True)
+def scrape_builds(args: Namespace) -> NoReturn:
+    builds, errors = _scrape(args, _connection_manager(args))
+    if args.version is not None:
+        builds, _ = _match(builds, [args.version], all_matches=True)
+
+    _finish(
+        args,
+        {"builds": [_build_json(b) for b in builds], "errors": errors},
+        [*(f"{_describe(b)}  {b.link}" for b in builds), *(f"error: {e}" for e in errors)],
+        ExitCode.FAILED if errors else ExitCode.NO_MATCH if args.version is not None and not builds else ExitCode.OK,
+    )
+
+
+@headless_command("download", qt_core=True, prints_results=True)
+def download_builds(args: Namespace) -> NoReturn:
+    import shutil
+
+    from threads.installer import download_build
+
+    cm, builds, unmatched, errors = _find_downloads(args)
+    args.output.mkdir(parents=True, exist_ok=True)
+
+    def download(build: BuildInfo) -> Path:
+        archive = download_build(cm, build)
+        return Path(shutil.move(archive, args.output / archive.name))
+
+    downloaded, failed, lines = [], [], []
+    for build, archive, error in _in_parallel(download, builds, args.jobs):
+        if error is None:
+            downloaded.append({"build": _build_json(build), "archive": str(archive)})
+            lines.append(f"downloaded {_describe(build)}  {archive}")
+        else:
+            failed.append({"build": _build_json(build), "error": str(error)})
+            lines.append(f"failed {_describe(build)}: {error}")
+    lines.extend(f"no build matches {q}" for q in unmatched)
+    lines.extend(f"error: {e}" for e in errors)
+
+    _finish(
+        args,
+        {"downloaded": downloaded, "failed": failed, "unmatched": [str(q) for q in unmatched], "errors": errors},
+        lines,
+        ExitCode.FAILED if failed or errors else ExitCode.NO_MATCH if unmatched else ExitCode.OK,
+    )
+
+
+@headless_command("install", qt_core=True, prints_results=True)
+def install_builds(args: Namespace) -> NoReturn:
+    from modules.library_index import read_library_index
+    from modules.settings import build_library_folders
+    from threads.installer import install_build
+
+    cm, builds, unmatched, errors = _find_downloads(args)
+
+    installed, skipped, failed, lines = [], [], [], []
+    if not args.force:
+        library = read_library_index(build_library_folders)
+        to_install = []
+        for build in builds:
+            path = next((path for path, info in library if info == build), None)
+            if path is None:
+                to_install.append(build)
+            else:
+                skipped.append({"build": _build_json(build), "path": str(path)})
+                lines.append(f"already installed {_describe(build)}  {path}")
+        builds = to_install
+
+    for build, result, error in _in_parallel(lambda build: install_build(cm, build), builds, args.jobs):
+        if error is None:
+            path, info = result
+            installed.append({"build": _build_json(build), "path": str(path), "version": str(info.full_semversion)})
+            lines.append(f"installed {_describe(build)}  {path}")
+        else:
+            failed.append({"build": _build_json(build), "error": str(error)})
+            lines.append(f"failed {_describe(build)}: {error}")
+    lines.extend(f"no build matches {q}" for q in unmatched)
+    lines.extend(f"error: {e}" for e in errors)
+
+    _finish(
+        args,
+        {
+            "installed": installed,
+            "skipped": skipped,
+            "failed": failed,
+            "unmatched": [str(q) for q in unmatched],
+            "errors": errors,
+        },
+        lines,
+        ExitCode.FAILED if failed or errors else ExitCode.NO_MATCH if unmatched else ExitCode.OK,
+    )
+
+
+@headless_command("prune", qt_core=True, prints_results=True)
+def prune_builds(args: Namespace) -> NoReturn:
+    from dataclasses import replace
+
+    from modules.settings import get_default_delete_action
+    from threads.installer import run_task
+    from threads.remover import BulkRemovalTask, get_reaper
+    from threads.retention import RetentionPolicy, RetentionTask
+
+    policy = RetentionPolicy.from_settings()
+    if args.keep_newest is not None:
+        policy = replace(policy, keep_newest=args.keep_newest)
+    if args.max_age is not None:
+        policy = replace(policy, max_age_days=args.max_age)
+    if args.max_size is not None:
+        policy = replace(policy, max_total_size=args.max_size * 1024**3)
+
+    retention = RetentionTask(dry_run=args.dry_run, policy=policy)
+    plan, _ = run_task(retention, retention.planned)
+
+    failed: list[Path] = []
+    if plan.remove and not args.dry_run:
+        removal = BulkRemovalTask(plan.paths, trash=get_default_delete_action() == 0 and not args.delete)
+        _, failed = run_task(removal, removal.finished)
+        # The builds are only moved aside, they have to be gone before the process exits
+        get_reaper().idle.wait()
+
+    verb = "would remove" if args.dry_run else "removed"
+    lines = ["no retention rules are set, nothing to remove"] if policy.is_empty else []
+    lines += [f"{verb} {path}  ({reason.value})" for path, reason in plan.remove if path not in failed]
+    lines.extend(f"failed to remove {path}" for path in failed)
+    lines.append(f"kept {plan.kept} builds")
+    _finish(
+        args,
+        {
+            "dry_run": args.dry_run,
+            "removed": [
+                {"path": str(path), "reason": reason.value} for path, reason in plan.remove if path not in failed
+            ],
+            "failed": [str(path) for path in failed],
+            "kept": plan.kept,
+            "freed_bytes": plan.freed_bytes,
+        },
+        lines,
+        ExitCode.FAILED if failed else ExitCode.OK,
+    )
@@ -1,6 +1,8 @@
 import json
 import logging
+import re
 import sys
+from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
 
@@ -91,22 +93,52 @@ def update_local_api_files(data: dict) -> None:
         with BL_API_PATH.open("w", encoding="utf-8") as f:
             json.dump(data, f, indent=1)
             logger.info(f"Updated API file in {BL_API_PATH}")
-        read_bl_api.cache_clear()
+        invalidate_bl_api()
     except OSError as e:
         logger.exception(f"Failed to write API file: {e}")
     except Exception as e:
         logger.exception(f"Failed to update API file: {e}")
 
 
+def invalidate_bl_api():
+    """Forget the API data read so far, so it is read again on next use."""
+    read_bl_api.cache_clear()
+    blender_versions.cache_clear()
+
+
+@dataclass(frozen=True, slots=True)
+class BlenderVersions:
+    """The Blender versions listed in the API file, parsed once per change of the file."""
+
+    versions: tuple[Version, ...]
+    lts: tuple[Version, ...]
+    lts_minor_versions: frozenset[str]
+    """The LTS versions as "major.minor" strings"""
+
+
+@lru_cache(maxsize=1)
+def blender_versions() -> BlenderVersions:
+    api_versions: dict[str, str] = read_bl_api().get("blender_versions", {})
+    versions = tuple(Version.parse(version, optional_minor_and_patch=True) for version in api_versions)
+    lts = tuple(v for v, label in zip(versions, api_versions.values(), strict=True) if label == "LTS")
+    return BlenderVersions(versions, lts, frozenset(f"{v.major}.{v.minor}" for v in lts))
+
+
+_MINOR_VERSION = re.compile(r"\d+\.\d+")
+
+
+def is_lts_version(subversion: str) -> bool:
+    """Whether ``subversion`` belongs to an LTS release. https://www.blender.org/download/lts/"""
+    match = _MINOR_VERSION.match(subversion)
+    return match is not None and match[0] in blender_versions().lts_minor_versions
+
+
 def read_blender_version_list() -> list[Version]:
-    return [
-        Version.parse(version, optional_minor_and_patch=True) for version in read_bl_api().get("blender_versions", {})
-    ]
+    return list(blender_versions().versions)
 
 
 def lts_blender_version() -> list[Version]:
-    versions = read_bl_api().get("blender_versions", {})
-    return [Version.parse(version, optional_minor_and_patch=True) for version, lts in versions.items() if lts == "LTS"]
+    return list(blender_versions().lts)
 
 
 def dropdown_blender_version() -> dict[str, int]:
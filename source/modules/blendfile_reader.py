@@ -9,7 +9,6 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import TYPE_CHECKING
 
-import zstandard
 from semver import Version
 
 if TYPE_CHECKING:
@@ -90,6 +89,8 @@ def __try_read_gzip(pth: Path) -> bytes | None:
 
 def __try_read_zstd(pth: Path) -> bytes | None:
     """Tries to read the file header from a zstandard file, returning None upon failure"""
+    import zstandard
+
     with zstandard.open(pth, "rb") as fs, contextlib.suppress(zstandard.ZstdError):
         return fs.read(BYTE_READ_LIMIT)
     return None
@@ -5,14 +5,13 @@ import logging
 import re
 import shlex
 import sys
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
-from functools import cache
+from functools import cache, lru_cache
 from pathlib import Path
 from typing import TypedDict
 
-import dateparser
-from modules.bl_api_manager import lts_blender_version, read_blender_version_list
+from modules.bl_api_manager import is_lts_version, read_blender_version_list
 from modules.platform_utils import _check_output, _popen, get_platform
 from modules.settings import (
     get_bash_arguments,
@@ -20,8 +19,6 @@ from modules.settings import (
     get_launch_blender_no_console,
     get_library_folder,
 )
-from modules.task import Task
-from PySide6.QtCore import Signal
 from semver import Version
 
 logger = logging.getLogger()
@@ -68,21 +65,55 @@ def get_fork_config_paths(branch: str) -> ConfigFolder | None:
     return None
 
 
-# TODO: Combine some of these
+SEMVER_FORMAT = (
+    r"(?P<ma>0|[1-9]\d*)\.(?P<mi>0|[1-9]\d*)\.(?P<pa>0|[1-9]\d*)"
+    r"(?:-(?P<pre>(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*)(?:\.(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*))?"
+    r"(?:\+(?P<build>[0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?\Z"
+)
+"""The grammar of `semver.Version.parse`"""
 
-patterns: list[str] = [
+# Blender style versions, tried in order when a string is not a semantic version
+BLENDER_VERSION_FORMATS: dict[str, str] = {
     #                                                                                    format                                 examples
-    r"(?P<ma>\d+)\.(?P<mi>\d+)(?:\.(?P<pa>\d+))?[ \-](?P<pre>[^\+]*)",  #                <major>.<minor>.<patch> <Prerelease>   2.80.0 Alpha  -> 2.80.0-alpha
-    r"(?P<ma>\d+)\.(?P<mi>\d+) \(sub (?P<pa>\d+)\)",  #                                  <major>.<minor> (sub <patch>)          2.80 (sub 75) -> 2.80.75
-    r"(?P<ma>\d+)\.(?P<mi>\d+)$",  #                                                     <major>.<minor>                        2.79          -> 2.79.0
-    r"(?P<ma>\d+)\.(?P<mi>\d+)(?P<pre>[^-]{0,3})",  #                                    <major>.<minor><[chars]*(1-3)>         2.79rc1       -> 2.79.0-rc1
-    r"(?P<ma>\d+)\.(?P<mi>\d+)(?P<pre>\D[^\.\s]*)?",  #                                  <major>.<minor><patch?>                2.79          -> 2.79.0       | 2.79b -> 2.79.0-b
-]
-matchers = tuple(re.compile(p) for p in patterns)
+    "prerelease": r"(?P<ma>\d+)\.(?P<mi>\d+)(?:\.(?P<pa>\d+))?[ \-](?P<pre>[^\+]*)",  #    <major>.<minor>.<patch> <Prerelease>   2.80.0 Alpha  -> 2.80.0-alpha
+    "sub": r"(?P<ma>\d+)\.(?P<mi>\d+) \(sub (?P<pa>\d+)\)",  #                                <major>.<minor> (sub <patch>)          2.80 (sub 75) -> 2.80.75
+    "minor": r"(?P<ma>\d+)\.(?P<mi>\d+)$",  #                                                 <major>.<minor>                        2.79          -> 2.79.0
+    "suffix": r"(?P<ma>\d+)\.(?P<mi>\d+)(?P<pre>[^-]{0,3})",  #                                <major>.<minor><[chars]*(0-3)>         2.79rc1       -> 2.79.0-rc1   | 2.79b -> 2.79.0-b
+}
+
+
+def _named(name: str, pattern: str) -> str:
+    # Group names must be unique across the alternatives of one regex
+    return re.sub(r"\(\?P<(\w+)>", rf"(?P<{name}_\1>", pattern)
+
+
+SEMVER_ALTERNATIVE = f"(?P<semver>{_named('semver', SEMVER_FORMAT)})"
+
+
+def _version_regex(search: bool) -> re.Pattern[str]:
+    # Alternatives are tried in order. When searching, each one is tried at every position before the next one,
+    # just like searching the string with one regex per format
+    prefix = ".*?" if search else ""
+    alternatives = [SEMVER_ALTERNATIVE]
+    alternatives += [f"{prefix}(?P<{name}>{_named(name, p)})" for name, p in BLENDER_VERSION_FORMATS.items()]
+    return re.compile("|".join(alternatives), flags=re.DOTALL)
+
+
+semver_matcher = re.compile(SEMVER_ALTERNATIVE)
+version_matcher = _version_regex(search=False)
+version_searcher = _version_regex(search=True)
+# The regexes number their groups alike. Maps the group of each alternative to the groups of its parts,
+# reading them by number is a lot faster than through `groupdict`
+_version_groups: dict[int, tuple[str, int, int, int, int, int]] = {
+    version_matcher.groupindex[kind]: (
+        kind,
+        *(version_matcher.groupindex.get(f"{kind}_{part}", 0) for part in ("ma", "mi", "pa", "pre", "build")),
+    )
+    for kind in ("semver", *BLENDER_VERSION_FORMATS)
+}
 initial_cleaner = re.compile(r"(?:blender|v)-?(\d.*)", flags=re.IGNORECASE)
 
 
-@cache
 def simple_clean(s: str):
     """
     Cleans a version string by removing extraneous information like platform identifiers and "v" prefixes.
@@ -102,7 +133,7 @@ def simple_clean(s: str):
     return s
 
 
-@cache
+@lru_cache(maxsize=8192)
 def parse_blender_ver(s: str, search=False) -> Version:
     """
     Converts Blender's different styles of versioning to a semver Version.
@@ -116,55 +147,42 @@ def parse_blender_ver(s: str, search=False) -> Version:
     Returns:
         Version
     """
-    try:
-        return Version.parse(s)
-    except ValueError as e:
-        s = simple_clean(s)
-        try:
-            return Version.parse(s)
-        except ValueError:
-            pass
-
-        major = 0
-        minor = 0
-        patch = 0
-        prerelease = None
-
-        g = None
-        if search:
-            for matcher in matchers:
-                if (m := matcher.search(s)) is not None:
-                    g = m
-                    break
-        else:
-            for matcher in matchers:
-                if (m := matcher.match(s)) is not None:
-                    g = m
-                    break
+    cleaned = simple_clean(s)
+    # A semantic version is taken as is, even if cleaning would change it
+    if cleaned == s or (g := semver_matcher.match(s)) is None:
+        g = (version_searcher if search else version_matcher).match(cleaned)
         if g is None:
-            raise ValueError("No valid version found") from e
+            raise ValueError("No valid version found")
 
-        major = int(g.group("ma"))
-        minor = int(g.group("mi"))
-        if "pa" in g.groupdict() and g.group("pa") is not None:
-            patch = int(g.group("pa"))
-        if "pre" in g.groupdict() and g.group("pre") is not None:
-            prerelease = g.group("pre").casefold().strip("- ")
-            if prerelease.strip().lower() == "lts":
-                prerelease = None
+    kind, ma, mi, pa, pre, build = _version_groups[g.lastindex]
+    major = int(g[ma])
+    minor = int(g[mi])
+    patch = int(g[pa]) if pa and g[pa] is not None else 0
+    prerelease = g[pre] if pre else None
+    if kind == "semver":
+        return Version(major, minor, patch, prerelease, g[build])
 
-        return Version(major=major, minor=minor, patch=patch, prerelease=prerelease)
+    if prerelease is not None:
+        prerelease = prerelease.casefold().strip("- ")
+        if prerelease.strip().lower() == "lts":
+            prerelease = None
+
+    return Version(major=major, minor=minor, patch=patch, prerelease=prerelease)
 
 
 oldver_cutoff = Version(2, 83, 0)
 
 
-@dataclass
+@lru_cache(maxsize=4096)
+def _parse_commit_time(s: str) -> datetime:
+    # Builds of one release share their commit time, and datetimes are immutable, so they can share the object too
+    return datetime.fromisoformat(s)
+
+
+@dataclass(slots=True)
 class BuildInfo:
     # Class variables
     file_version = "1.5"
-    # https://www.blender.org/download/lts/
-    lts_versions = tuple(f"{v.major}.{v.minor}" for v in lts_blender_version())
 
     # Build variables
     link: str
@@ -177,9 +195,18 @@ class BuildInfo:
     custom_executable: str | None = None
     is_frozen: bool = False
 
+    # The subversion of a build is never changed, so its parsed version is kept with it
+    _semversion: Version | None = field(default=None, init=False, repr=False, compare=False)
+
     def __post_init__(self):
-        if self.branch == "stable" and self.subversion.startswith(self.lts_versions):
-            self.branch = "lts"
+        # Tens of thousands of downloads share a few branches and versions
+        # Corrupt .blinfo files can hold null fields, which `is_valid` reports
+        if isinstance(self.subversion, str):
+            self.subversion = sys.intern(self.subversion)
+            if self.branch == "stable" and is_lts_version(self.subversion):
+                self.branch = "lts"
+        if isinstance(self.branch, str):
+            self.branch = sys.intern(self.branch)
 
     def is_valid(self) -> bool:
         """Check whether critical fields contain usable data."""
@@ -219,7 +246,9 @@ class BuildInfo:
 
     @property
     def semversion(self) -> Version:
-        return parse_blender_ver(self.subversion)
+        if self._semversion is None:
+            self._semversion = parse_blender_ver(self.subversion)
+        return self._semversion
 
     @property
     def full_semversion(self):
@@ -305,11 +334,13 @@ class BuildInfo:
     @classmethod
     def from_dict(cls, link: str, blinfo: dict):
         try:
-            dt = datetime.fromisoformat(blinfo["commit_time"])
-        except (ValueError, KeyError):  # old file version compatibility or missing key
+            dt = _parse_commit_time(blinfo["commit_time"])
+        except (ValueError, KeyError, TypeError):  # old file version compatibility or missing key
             try:
                 dt = datetime.strptime(blinfo["commit_time"], "%d-%b-%y-%H:%M").astimezone()
             except Exception:
+                import dateparser
+
                 dt = dateparser.parse(blinfo.get("commit_time", ""))
                 if dt is None:
                     dt = datetime.now().astimezone()
@@ -359,6 +390,8 @@ class BuildInfo:
         )
 
     def write_to(self, path: Path):
+        from modules.library_index import mark_changed
+
         data = self.to_dict()
         blinfo = path / ".blinfo"
         try:
@@ -366,6 +399,8 @@ class BuildInfo:
                 json.dump(data, file)
         except OSError as e:
             logger.warning(f"Failed to write .blinfo for {path}: {e}")
+        else:
+            mark_changed(path)
         return data
 
     def __lt__(self, other: BuildInfo):
@@ -419,6 +454,8 @@ def fill_blender_info(exe: Path, info: BuildInfo | None = None) -> tuple[datetim
                     "%Y-%m-%d %H:%M",
                 ).astimezone()
             except Exception:
+                import dateparser
+
                 strptime = dateparser.parse(f"{cdate[1].rstrip()} {ctime[1].rstrip()}")
     else:
         strptime = info.commit_time
@@ -563,23 +600,6 @@ def read_blender_version(
     )
 
 
-@dataclass
-class WriteBuildTask(Task):
-    written = Signal()
-    error = Signal()
-
-    path: Path
-    build_info: BuildInfo
-
-    def run(self):
-        try:
-            self.build_info.write_to(self.path)
-            self.written.emit()
-        except Exception:
-            self.error.emit()
-            raise
-
-
 def fill_build_info(
     path: Path,
     archive_name: str | None = None,
@@ -631,29 +651,6 @@ def fill_build_info(
     return build_info
 
 
-@dataclass
-class ReadBuildTask(Task):
-    path: Path
-    info: BuildInfo | None = None
-    archive_name: str | None = None
-    auto_write: bool = True
-
-    finished = Signal(BuildInfo)
-    failure = Signal(Exception)
-
-    def run(self):
-        try:
-            build_info = fill_build_info(self.path, self.archive_name, self.info, self.auto_write)
-            self.finished.emit(build_info)
-
-        except Exception as e:
-            self.failure.emit(e)
-            raise
-
-    def __str__(self):
-        return f"Read build at {self.path}"
-
-
 class LaunchMode: ...
 
 
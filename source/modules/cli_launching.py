@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-import contextlib
-import json
 import logging
 import subprocess
 import sys
@@ -13,9 +11,9 @@ if TYPE_CHECKING:
 
 from modules.blendfile_reader import read_blendfile_header
 from modules.build_info import BuildInfo, LaunchMode, LaunchOpenLast, LaunchWithBlendFile, get_args
+from modules.library_index import read_library_index
 from modules.settings import build_library_folders, get_favorite_path, get_version_specific_queries
-from modules.version_matcher import BasicBuildInfo, VersionSearchQuery
-from threads.library_drawer import get_blender_builds
+from modules.version_matcher import BasicBuildInfo, BuildIndex, VersionSearchQuery
 
 logger = logging.getLogger()
 
@@ -28,14 +26,7 @@ def cli_launch(
 ) -> NoReturn:
     # Search for builds
     logger.info("Searching for all builds")
-    builds: list[BuildInfo] = []
-    for build, _ in get_blender_builds(folders=build_library_folders):
-        if (blinfo := build / ".blinfo").exists():
-            with blinfo.open("r", encoding="utf-8") as f:
-                blinfo = json.load(f)
-            with contextlib.suppress(Exception):
-                info = BuildInfo.from_dict(str(build), blinfo["blinfo"][0])
-                builds.append(info)
+    builds: list[BuildInfo] = [info for _, info in read_library_index(build_library_folders)]
 
     builds.sort(reverse=True)
 
@@ -77,7 +68,7 @@ def cli_launch(
         logger.warning("Could not read file header and no version was provided! defaulting to ^.^.^")
         query = VersionSearchQuery.default()
 
-    matches = query.match(basics.keys())
+    matches = BuildIndex(basics).match(query)
 
     launch_mode: LaunchMode | None = None
     if file is not None:
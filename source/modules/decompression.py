@@ -0,0 +1,345 @@
+"""
+Decompression backends used by the extractor.
+
+Python's ``lzma``, ``gzip`` and ``bz2`` modules decompress on a single core, which makes installing a
+Linux build CPU bound. When a parallel decompressor is available on the system, tar archives are piped
+through it and only the unpacking of the tar stream itself is left to Python.
+
+Zip members are compressed independently, so large zip archives are instead split into shards that are
+extracted by a pool of processes.
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from functools import cache
+from typing import IO, TYPE_CHECKING, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+logger = logging.getLogger()
+
+_T = TypeVar("_T")
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class DecompressionError(Exception):
+    """Raised when an external decompressor exits with an error."""
+
+
+@dataclass(frozen=True)
+class StreamBackend:
+    """An external program that reads a compressed stream on stdin and writes the result to stdout."""
+
+    name: str
+    suffix: str
+    command: tuple[str, ...]
+
+    @property
+    def executable(self) -> str | None:
+        return _which(self.command[0])
+
+    def available(self) -> bool:
+        return self.executable is not None
+
+
+# Ordered by preference for each suffix
+STREAM_BACKENDS: tuple[StreamBackend, ...] = (
+    StreamBackend("pixz", ".xz", ("pixz", "-d")),
+    StreamBackend("xz", ".xz", ("xz", "-d", "-c", "-T0")),
+    StreamBackend("pigz", ".gz", ("pigz", "-d", "-c")),
+    StreamBackend("lbzip2", ".bz2", ("lbzip2", "-d", "-c")),
+    StreamBackend("pbzip2", ".bz2", ("pbzip2", "-d", "-c")),
+    StreamBackend("zstd", ".zst", ("zstd", "-d", "-c", "-q")),
+)
+
+
+@cache
+def _which(name: str) -> str | None:
+    return shutil.which(name)
+
+
+def available_backends(suffix: str | None = None) -> list[StreamBackend]:
+    return [b for b in STREAM_BACKENDS if (suffix is None or b.suffix == suffix) and b.available()]
+
+
+def get_stream_backend(source: Path, name: str | None = None) -> StreamBackend | None:
+    """
+    Pick the backend used to decompress ``source``.
+
+    Args:
+        source: Path to a compressed tar archive.
+        name: Force a specific backend. ``"python"`` disables external backends entirely.
+
+    Returns:
+        The backend to use, or None to fall back to Python's own decompression.
+    """
+    if name == "python":
+        return None
+
+    for backend in available_backends(source.suffix):
+        if name is None or backend.name == name:
+            return backend
+    return None
+
+
+_STDERR_LIMIT = 64 * 1024
+# How long a decompressor gets to exit after the tar stream failed, before it is killed
+_EXIT_TIMEOUT = 1
+
+
+class DecompressionStream:
+    """
+    Pipes ``source`` through an external decompressor.
+
+    Used as a context manager that yields the decompressed byte stream. The number of compressed bytes
+    consumed so far is available as ``bytes_read`` and can be used for progress reporting.
+    Raises OSError on construction if the decompressor cannot be started, and DecompressionError on exit if the
+    decompressor failed, also when that made reading the stream fail.
+    """
+
+    def __init__(self, source: Path, backend: StreamBackend):
+        self.source = source
+        self.backend = backend
+        self.bytes_read = 0
+
+        executable = backend.executable
+        if executable is None:
+            raise FileNotFoundError(backend.command[0])
+
+        kwargs = {}
+        if sys.platform == "win32":
+            kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
+
+        self.process = subprocess.Popen(
+            [executable, *backend.command[1:]],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            **kwargs,
+        )
+        self._feeder = threading.Thread(target=self._feed, daemon=True)
+        self._feeder.start()
+        # Read concurrently, a decompressor that fills the stderr pipe would otherwise block while stdout is read
+        self._stderr = b""
+        self._stderr_reader = threading.Thread(target=self._read_stderr, daemon=True)
+        self._stderr_reader.start()
+
+    def _feed(self):
+        assert self.process.stdin is not None
+        try:
+            with self.source.open("rb") as f, self.process.stdin:
+                while chunk := f.read(CHUNK_SIZE):
+                    self.process.stdin.write(chunk)
+                    self.bytes_read += len(chunk)
+        except (BrokenPipeError, OSError, ValueError):
+            # The decompressor exited early; its return code tells what happened
+            pass
+
+    def _read_stderr(self):
+        assert self.process.stderr is not None
+        while chunk := self.process.stderr.read(CHUNK_SIZE):
+            # Only the end is worth reporting
+            self._stderr = (self._stderr + chunk)[-_STDERR_LIMIT:]
+
+    def _close(self) -> str:
+        assert self.process.stdout is not None
+        assert self.process.stderr is not None
+        self._feeder.join()
+        self._stderr_reader.join()
+        self.process.stdout.close()
+        self.process.stderr.close()
+        return self._stderr.decode(errors="replace").strip()
+
+    def __enter__(self) -> IO[bytes]:
+        assert self.process.stdout is not None
+        return self.process.stdout
+
+    def __exit__(self, exc_type, exc, tb):
+        assert self.process.stdout is not None
+
+        if exc_type is not None:
+            # A stream that ends early is usually a decompressor that died; give it a moment to exit to tell
+            try:
+                returncode = self.process.wait(timeout=_EXIT_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                returncode = None
+                self.process.kill()
+                self.process.wait()
+            stderr = self._close()
+            if returncode:
+                raise DecompressionError(f"{self.backend.name} exited with code {returncode}: {stderr}") from exc
+            return
+
+        # tarfile stops at the end-of-archive marker; drain the padding so the process can exit
+        while self.process.stdout.read(CHUNK_SIZE):
+            pass
+        returncode = self.process.wait()
+        stderr = self._close()
+
+        if returncode != 0:
+            raise DecompressionError(f"{self.backend.name} exited with code {returncode}: {stderr}")
+
+
+# Below these sizes, starting worker processes costs more than it saves
+PARALLEL_ZIP_MIN_SIZE = 64 * 1024 * 1024
+PARALLEL_ZIP_MIN_MEMBERS = 256
+# Rough cost of creating a file, expressed in bytes, so shards of many tiny files stay balanced
+_PER_FILE_COST = 16 * 1024
+# Shards per worker; more shards give smoother progress at a small scheduling cost
+_SHARDS_PER_WORKER = 4
+
+
+def zip_member_path(name: str) -> tuple[str, ...] | None:
+    """
+    Sanitize a zip member name the same way ``ZipFile.extract`` does.
+
+    Returns the path components, or None for entries that resolve to nothing (e.g. ``./``).
+    """
+    arcname = name.replace("/", os.path.sep)
+    if os.path.altsep:
+        arcname = arcname.replace(os.path.altsep, os.path.sep)
+    arcname = os.path.splitdrive(arcname)[1]
+    parts = tuple(p for p in arcname.split(os.path.sep) if p not in ("", os.curdir, os.pardir))
+    return parts or None
+
+
+@dataclass
+class ZipPlan:
+    """Where each member of a zip archive gets written."""
+
+    files: list[tuple[zipfile.ZipInfo, Path]]
+    directories: set[Path]
+
+    @property
+    def total_size(self) -> int:
+        return sum(info.file_size for info, _ in self.files)
+
+    def make_directories(self):
+        for directory in sorted(self.directories):
+            directory.mkdir(parents=True, exist_ok=True)
+
+
+def plan_zip_extraction(
+    members: list[zipfile.ZipInfo],
+    destination: Path,
+    rewrite: Callable[[str], str | None] | None = None,
+) -> ZipPlan:
+    """
+    Resolve the target path of every member.
+
+    Args:
+        members: Members to extract.
+        destination: Folder to extract into.
+        rewrite: Optional mapping applied to member names before they are resolved.
+            Members it maps to None are skipped.
+    """
+    plan = ZipPlan([], {destination})
+    for member in members:
+        name = member.filename if rewrite is None else rewrite(member.filename)
+        relative = zip_member_path(name) if name is not None else None
+        if relative is None:
+            continue
+
+        target = destination.joinpath(*relative)
+        if member.is_dir():
+            plan.directories.add(target)
+        else:
+            plan.directories.add(target.parent)
+            plan.files.append((member, target))
+    return plan
+
+
+def plan_shards(items: list[_T], count: int, size: Callable[[_T], int]) -> list[list[_T]]:
+    """Split ``items`` into at most ``count`` shards of roughly equal total ``size`` (largest first)."""
+    count = max(1, min(count, len(items)))
+    heap = [(0, i) for i in range(count)]
+    shards: list[list[_T]] = [[] for _ in range(count)]
+
+    for item in sorted(items, key=size, reverse=True):
+        load, i = heapq.heappop(heap)
+        shards[i].append(item)
+        heapq.heappush(heap, (load + size(item) + _PER_FILE_COST, i))
+
+    return [shard for shard in shards if shard]
+
+
+def should_extract_in_parallel(members: list[zipfile.ZipInfo], workers: int | None = None) -> bool:
+    if (workers or os.cpu_count() or 1) < 2:
+        return False
+    return len(members) >= PARALLEL_ZIP_MIN_MEMBERS and sum(m.file_size for m in members) >= PARALLEL_ZIP_MIN_SIZE
+
+
+def _extract_zip_shard(source: str, jobs: list[tuple[str, str]]) -> int:
+    """Worker entry point: extract ``(member name, target path)`` pairs, returning the bytes written."""
+    written = 0
+    with zipfile.ZipFile(source) as zf:
+        for name, target in jobs:
+            with zf.open(name) as src, open(target, "wb") as dst:
+                shutil.copyfileobj(src, dst, CHUNK_SIZE)
+            written += zf.getinfo(name).file_size
+    return written
+
+
+def extract_zip_serial(zf: zipfile.ZipFile, plan: ZipPlan, progress_callback: Callable[[int, int], None]):
+    total_size = plan.total_size
+    progress_callback(0, total_size)
+    plan.make_directories()
+
+    extracted_size = 0
+    for info, target in plan.files:
+        with zf.open(info) as src, target.open("wb") as dst:
+            shutil.copyfileobj(src, dst, CHUNK_SIZE)
+        extracted_size += info.file_size
+        progress_callback(extracted_size, total_size)
+
+
+def extract_zip_parallel(
+    source: Path,
+    plan: ZipPlan,
+    progress_callback: Callable[[int, int], None],
+    workers: int | None = None,
+):
+    """
+    Extract the members of ``source`` listed in ``plan`` using a process pool.
+
+    Every directory is created up front so workers never race on ``mkdir``; each worker then opens
+    its own ``ZipFile`` handle and writes its shard of files.
+    """
+    workers = workers or os.cpu_count() or 1
+    total_size = plan.total_size
+    progress_callback(0, total_size)
+    plan.make_directories()
+
+    shards = plan_shards(plan.files, workers * _SHARDS_PER_WORKER, lambda job: job[0].file_size)
+    extracted_size = 0
+    # "spawn" avoids forking a process that is running Qt threads
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(workers, len(shards) or 1), mp_context=context) as pool:
+        futures = [
+            pool.submit(_extract_zip_shard, str(source), [(info.filename, str(target)) for info, target in shard])
+            for shard in shards
+        ]
+        try:
+            for future in as_completed(futures):
+                extracted_size += future.result()
+                progress_callback(extracted_size, total_size)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+    progress_callback(total_size, total_size)
@@ -1,12 +1,17 @@
 import logging
+import sys
 import time
 from collections.abc import Callable
+from pathlib import Path
 from typing import TypeVar
 
 logger = logging.getLogger()
 
 _T = TypeVar("_T")
 
+# Linux ioctl to share the extents of one file with another (copy-on-write)
+_FICLONE = 0x40049409
+
 _DEFAULT_MAX_RETRIES = 10
 _DEFAULT_RETRY_DELAY = 0.5
 
@@ -41,3 +46,24 @@ def retry_on_permission_error(
 
     logger.error(f"All {max_retries} attempts failed: {last_error}")
     raise last_error  # type: ignore
+
+
+def reflink(src: Path, dst: Path) -> bool:
+    """Create ``dst`` as a copy-on-write clone of ``src``.
+
+    Only supported on Linux filesystems with reflink support (btrfs, XFS, ...).
+
+    :returns: False if the clone could not be made; ``dst`` does not exist then.
+    """
+    if sys.platform != "linux":
+        return False
+
+    import fcntl
+
+    try:
+        with src.open("rb") as s, dst.open("wb") as d:
+            fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+    except OSError:
+        dst.unlink(missing_ok=True)
+        return False
+    return True
@@ -0,0 +1,71 @@
+"""
+Commands that run without a window.
+
+`main` looks a command up here before it imports PySide6, the resources or the translations, so these commands
+start as fast as a plain script. They read the settings through `modules.ini_settings` and can't change them, a
+command that changes settings is registered with ``qt_core=True``.
+tests/backend/test_import_time.py checks that nothing on this path imports PySide6.
+
+Commands registered with ``qt_core=True`` run the download, extraction and removal tasks, which are QObjects. They
+import QtCore, but never QtWidgets, and use the settings store of the GUI since connecting may write settings.
+"""
+
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, NoReturn
+
+if TYPE_CHECKING:
+    from argparse import Namespace
+    from collections.abc import Callable
+
+
+@dataclass(frozen=True)
+class HeadlessCommand:
+    run: Callable[[Namespace], NoReturn]
+    when: Callable[[Namespace], bool]
+    qt_core: bool = False
+    """Runs tasks or changes settings, so it imports QtCore and reads and writes the settings through `QSettings`"""
+    prints_results: bool = False
+    """Prints its results to stdout for scripts to read, so the console log goes to stderr"""
+
+
+_commands: dict[str, list[HeadlessCommand]] = {}
+
+
+def headless_command(
+    command: str,
+    when: Callable[[Namespace], bool] = lambda _: True,
+    qt_core: bool = False,
+    prints_results: bool = False,
+):
+    """Register the decorated function to run ``command`` without a window, if ``when`` is true for its arguments."""
+
+    def register(f: Callable[[Namespace], NoReturn]) -> Callable[[Namespace], NoReturn]:
+        _commands.setdefault(command, []).append(HeadlessCommand(f, when, qt_core, prints_results))
+        return f
+
+    return register
+
+
+def find_headless_command(args: Namespace) -> HeadlessCommand | None:
+    """The command that runs the parsed command line ``args`` without a window, if there is one."""
+    for command in _commands.get(args.command, ()):
+        if command.when(args):
+            return command
+    return None
+
+
+@headless_command("launch", when=lambda args: args.cli)
+def launch(args: Namespace) -> NoReturn:
+    from modules.argument_parsing import get_blender_args, parse_version_query
+    from modules.cli_launching import cli_launch
+
+    query = parse_version_query(args.version)
+    # remove quotes around file path if they exist
+    file = Path(str(args.file).strip('"')) if args.file is not None else None
+
+    cli_launch(file=file, version_query=query, open_last=args.open_last, blender_args=get_blender_args(args))
+    sys.exit(1)
@@ -0,0 +1,157 @@
+"""
+Reading the settings file without Qt.
+
+`SettingsStore` reads the INI file through `QSettings`, which means importing PySide6 before the first setting is
+read. Commands that never open a window, like launching a build from the command line, only read the few settings in
+`KEYS`, so they use `IniSettings` instead. It reads those keys from the file as `QSettings` writes them. Commands that
+change settings are registered with ``qt_core=True`` and use the `SettingsStore`.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import TYPE_CHECKING, Any, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_R = TypeVar("_R")
+
+# Everything the commands in `modules.headless` read, including the log level read by `main`
+KEYS = frozenset(
+    {
+        "auto_register_winget",
+        "bash_arguments",
+        "blender_startup_arguments",
+        "Internal/favorite_path",
+        "library_folder",
+        "log_level",
+        "version_specific_queries",
+    }
+)
+
+_ESCAPES = {"a": "\a", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t", "v": "\v"}
+_HEX_DIGITS = "0123456789abcdefABCDEF"
+_OCT_DIGITS = "01234567"
+
+
+def _unescape(value: str) -> str:
+    """The string ``value`` stands for, with the quotes and escapes `QSettings` writes undone."""
+    result = []
+    in_quotes = False
+    # Spaces up to here were quoted or escaped and are kept
+    kept = 0
+    i = 0
+    while i < len(value):
+        ch = value[i]
+        i += 1
+        if ch == '"':
+            in_quotes = not in_quotes
+            kept = len(result)
+        elif ch == ";" and not in_quotes:
+            # A trailing comment
+            break
+        elif ch == "\\" and i < len(value):
+            ch = value[i]
+            i += 1
+            if ch in _ESCAPES:
+                result.append(_ESCAPES[ch])
+            elif ch == "x" or ch in _OCT_DIGITS:
+                digits, base = (_HEX_DIGITS, 16) if ch == "x" else (_OCT_DIGITS, 8)
+                start = i if ch == "x" else i - 1
+                end = start
+                while end < len(value) and value[end] in digits:
+                    end += 1
+                if end > start:
+                    result.append(chr(int(value[start:end], base)))
+                i = end
+            else:
+                result.append(ch)
+            kept = len(result)
+        else:
+            result.append(ch)
+            if in_quotes:
+                kept = len(result)
+    while len(result) > kept and result[-1] in " \t":
+        result.pop()
+    s = "".join(result)
+    # Strings that start with @ are written with another one in front
+    return s[1:] if s.startswith("@@") else s
+
+
+def parse_ini(text: str) -> dict[str, str | None]:
+    """The values of `KEYS` in an INI file written by `QSettings`. Values that were set to None are None."""
+    values: dict[str, str | None] = {}
+    section = ""
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith((";", "#")):
+            continue
+        if line.startswith("["):
+            name = line[1:].split("]", 1)[0].strip()
+            section = "" if name.lower() == "general" else f"{name}/"
+            continue
+        key, equals, value = line.partition("=")
+        if equals and (key := section + key.strip()) in KEYS:
+            value = value.strip()
+            values[key] = None if value == "@Invalid()" else _unescape(value)
+    return values
+
+
+def _convert(v: str | None, type: type) -> Any:  # noqa: A002
+    """``v`` converted to ``type`` like `QSettings.value` does."""
+    if v is None:
+        return type()
+    if type is bool:
+        return v.lower() not in ("", "0", "false")
+    if type is int:
+        try:
+            return int(v)
+        except ValueError:
+            return 0
+    return v
+
+
+class IniSettings:
+    """The settings of the launcher, read from the INI file once and without Qt."""
+
+    def __init__(self, file: Path):
+        self.file = file
+        self._lock = threading.RLock()
+        self._values: dict[str, str | None] | None = None
+        self._derived: dict[str, Any] = {}
+
+    def _read_file(self) -> dict[str, str | None]:
+        try:
+            return parse_ini(self.file.read_text(encoding="utf-8-sig", errors="replace"))
+        except FileNotFoundError:
+            return {}
+        except OSError as e:
+            logger.warning(f"Failed to read settings from {self.file}: {e}")
+            return {}
+
+    def value(self, key: str, defaultValue: Any = None, type: type | None = None) -> Any:  # noqa: A002
+        if key not in KEYS:
+            raise KeyError(f"{key!r} is only read through QSettings, add it to ini_settings.KEYS")
+        if self._values is None:
+            with self._lock:
+                if self._values is None:
+                    self._values = self._read_file()
+        if key not in self._values:
+            return defaultValue
+        v = self._values[key]
+        return v if type is None else _convert(v, type)
+
+    def derived(self, key: str, compute: Callable[[], _R]) -> _R:
+        """The result of ``compute``, remembered for as long as the process runs."""
+        try:
+            return self._derived[key]
+        except KeyError:
+            pass
+        with self._lock:
+            v = self._derived[key] = compute()
+        return v
@@ -0,0 +1,238 @@
+"""
+Index of the build info of the library.
+
+Launching a .blend file from the command line used to list every library folder and read the ``.blinfo`` of
+every build before it could pick one. The index keeps the build info of all builds in one file in the library
+folder. A library folder is listed again only when its modification time changed (a build was added, removed or
+renamed).
+
+The ``.blinfo`` files aren't checked one by one on every read. `BuildInfo.write_to` touches a stamp file in the
+library folder, and only when the stamp changed is every ``.blinfo`` compared with the modification time it had
+when it was read. The GUI verifies every ``.blinfo`` after drawing the library, which catches files changed outside
+of the launcher, so the command line usually finds the index up to date.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from modules.build_info import BuildInfo
+from modules.platform_utils import get_platform
+from modules.settings import build_library_folders, get_library_folder
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+logger = logging.getLogger()
+
+INDEX_NAME = ".library-index.json"
+INDEX_VERSION = 2
+STAMP_NAME = ".library-index.stamp"
+
+
+def get_blender_builds(folders: Iterable[str | Path]) -> Iterable[tuple[Path, bool]]:
+    """Finds blender builds in the library folder, given the subfolders to search in
+
+    Parameters
+    ----------
+    folders : Iterable[str  |  Path]
+        subfolders to search
+
+    Returns
+    -------
+    Iterable[tuple[Path, bool]]
+        an iterable of found builds and whether they're recognized as valid Blender builds
+    """
+
+    library_folder = get_library_folder()
+    platform = get_platform()
+
+    blender_exe = {
+        "Windows": "blender.exe",
+        "Linux": "blender",
+        "macOS": "Blender/Blender.app/Contents/MacOS/Blender",
+    }.get(platform, "blender")
+
+    # Standard executable paths for different platforms
+    bforartists_exe = {
+        "Windows": "bforartists.exe",
+        "Linux": "bforartists",
+        "macOS": "Bforartists/Bforartists.app/Contents/MacOS/Bforartists",
+    }.get(platform, "bforartists")
+
+    for folder in folders:
+        path = library_folder / folder
+        if path.is_dir():
+            for build in path.iterdir():
+                # Hidden folders are staging areas and builds pending removal
+                if build.is_dir() and not build.name.startswith("."):
+                    # Check for .blinfo file or executables
+                    has_blinfo = (folder / build / ".blinfo").is_file()
+                    has_blender_exe = (path / build / blender_exe).is_file()
+                    has_bforartists_exe = (path / build / bforartists_exe).is_file()
+                    # UPBGE uses the same executable name as Blender
+                    has_upbge_exe = (path / build / blender_exe).is_file()
+
+                    # Also check for macOS DMG extraction format (.app directly at root)
+                    if platform == "macOS":
+                        if not has_bforartists_exe:
+                            has_bforartists_exe = (path / build / "Bforartists.app").is_dir()
+                        if not has_blender_exe:
+                            has_blender_exe = (path / build / "Blender.app").is_dir()
+
+                    yield (
+                        folder / build,
+                        has_blinfo or has_blender_exe or has_bforartists_exe or has_upbge_exe,
+                    )
+
+
+def _mtime_ns(path: Path) -> int | None:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def mark_changed(build: Path):
+    """Tell the index of the library that the ``.blinfo`` of ``build`` was written."""
+    library_folder = Path(get_library_folder())
+    try:
+        if build.resolve().is_relative_to(library_folder):
+            (library_folder / STAMP_NAME).touch()
+    except OSError as e:
+        logger.debug(f"Failed to mark the library index as changed: {e}")
+
+
+def _read_blinfo(path: Path) -> dict[str, Any] | None:
+    try:
+        with path.open(encoding="utf-8") as f:
+            return json.load(f)["blinfo"][0]
+    except (OSError, ValueError, KeyError, IndexError, TypeError) as e:
+        logger.debug(f"Skipping unreadable build info {path}: {e}")
+        return None
+
+
+@dataclass
+class LibraryIndex:
+    """The build info of the builds of one library folder, as of the last refresh."""
+
+    library_folder: Path
+    folders: dict[str, tuple[int, dict[str, tuple[int | None, dict[str, Any] | None]]]] = field(default_factory=dict)
+    """
+    Per library folder, its modification time and its builds by folder name. A build has the modification time and
+    contents of its ``.blinfo``, which are None if it has none.
+    """
+    verified: dict[str, int | None] = field(default_factory=dict)
+    """Per library folder, the modification time of the stamp file when its every ``.blinfo`` was last checked"""
+
+    def __post_init__(self):
+        self._dirty = False
+
+    @property
+    def path(self) -> Path:
+        return self.library_folder / INDEX_NAME
+
+    @classmethod
+    def load(cls, library_folder: Path) -> LibraryIndex:
+        index = cls(library_folder)
+        try:
+            data = json.loads(index.path.read_text(encoding="utf-8"))
+            if data.get("version") == INDEX_VERSION:
+                index.verified = dict(data["verified"])
+                index.folders = {
+                    folder: (int(mtime), {name: (entry[0], entry[1]) for name, entry in builds.items()})
+                    for folder, (mtime, builds) in data["folders"].items()
+                }
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError, KeyError, IndexError) as e:
+            logger.warning(f"Ignoring unreadable library index {index.path}: {e}")
+        return index
+
+    def save(self):
+        if not self._dirty:
+            return
+        data = {
+            "version": INDEX_VERSION,
+            "verified": self.verified,
+            "folders": {
+                folder: [mtime, {name: list(entry) for name, entry in builds.items()}]
+                for folder, (mtime, builds) in self.folders.items()
+            },
+        }
+        self._dirty = False
+        # The launcher and a command line launch may save at the same time
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            tmp.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to save library index {self.path}: {e}")
+
+    def _list_folder(self, folder: str, mtime: int) -> set[str]:
+        """List ``folder`` again and return the names of the builds that are new to the index."""
+        old = self.folders.get(folder, (None, {}))[1]
+        # Unrecognized builds are kept too, their .blinfo may be written later without touching the folder
+        names = [path.name for path, _ in get_blender_builds([self.library_folder / folder])]
+        self.folders[folder] = (mtime, {name: old.get(name, (None, None)) for name in names})
+        self._dirty = True
+        return {name for name in names if name not in old}
+
+    def refresh(
+        self, folders: Iterable[str] = build_library_folders, verify: bool = False
+    ) -> list[tuple[Path, BuildInfo]]:
+        """
+        Bring the index up to date with ``folders`` and return their builds that have build info.
+
+        Args:
+            verify: Check every ``.blinfo``, also when the stamp file says none was written.
+        """
+        # Taken before checking, so anything written meanwhile is checked by the next refresh
+        stamp = _mtime_ns(self.library_folder / STAMP_NAME)
+        found = []
+        for folder in folders:
+            path = self.library_folder / folder
+            # Taken before listing, so builds added meanwhile are found by the next refresh
+            mtime = _mtime_ns(path)
+            if mtime is None:
+                if self.folders.pop(folder, None) is not None:
+                    self.verified.pop(folder, None)
+                    self._dirty = True
+                continue
+            added = self._list_folder(folder, mtime) if self.folders.get(folder, (None,))[0] != mtime else set()
+            stale = folder not in self.verified or self.verified[folder] != stamp
+            check_all = verify or stale
+
+            builds = self.folders[folder][1]
+            for name, (blinfo_mtime, blinfo) in builds.items():
+                build = path / name
+                if (check_all or name in added) and (current := _mtime_ns(build / ".blinfo")) != blinfo_mtime:
+                    blinfo = _read_blinfo(build / ".blinfo") if current is not None else None
+                    builds[name] = (current, blinfo)
+                    self._dirty = True
+                if blinfo is None:
+                    continue
+                try:
+                    found.append((build, BuildInfo.from_dict(str(build), blinfo)))
+                except (ValueError, KeyError, TypeError, AttributeError) as e:
+                    logger.debug(f"Skipping {build}: {e}")
+
+            if stale:
+                self.verified[folder] = stamp
+                self._dirty = True
+        return found
+
+
+def read_library_index(
+    folders: Iterable[str] = build_library_folders, verify: bool = False
+) -> list[tuple[Path, BuildInfo]]:
+    """Builds of ``folders`` with their stored build info, read through the library index."""
+    index = LibraryIndex.load(Path(get_library_folder()))
+    builds = index.refresh(folders, verify)
+    index.save()
+    return builds
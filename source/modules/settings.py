@@ -4,20 +4,22 @@ import logging
 import os
 import shutil
 import sys
+import threading
 import uuid
 from collections.abc import Callable, Iterable
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import TypeVar
+from typing import TYPE_CHECKING, TypeVar
 
-import keyring
-from keyring.errors import KeyringError, PasswordDeleteError
 from modules.bl_api_manager import dropdown_blender_version
 from modules.platform_utils import get_config_file, get_config_path, get_cwd, local_config, user_config
 from modules.version_matcher import VersionSearchQuery
-from PySide6.QtCore import QSettings
 from semver import Version
 
+if TYPE_CHECKING:
+    from modules.ini_settings import IniSettings
+    from modules.settings_store import SettingsStore
+
 logger = logging.getLogger(__name__)
 
 EPOCH = datetime.fromtimestamp(0, tz=UTC)
@@ -102,15 +104,32 @@ update_behavior = {
 }
 
 
-def get_settings() -> QSettings:
-    file = get_config_file()
-    if not file.parent.is_dir():
-        file.parent.mkdir(parents=True)
+_R = TypeVar("_R")
+
 
-    return QSettings(get_config_file().as_posix(), QSettings.Format.IniFormat)
+_store: "SettingsStore | IniSettings | None" = None
+_read_only = False
 
 
-_R = TypeVar("_R")
+def get_settings() -> "SettingsStore | IniSettings":
+    global _store
+    if _store is None:
+        if _read_only:
+            from modules.ini_settings import IniSettings
+
+            _store = IniSettings(get_config_file())
+        else:
+            from modules.settings_store import SettingsStore
+
+            _store = SettingsStore(get_config_file())
+    return _store
+
+
+def use_ini_settings():
+    """Read the settings without Qt from now on, for commands that don't open a window and don't change them."""
+    global _store, _read_only
+    _read_only = True
+    _store = None
 
 
 def dropdown_setting(
@@ -158,6 +177,11 @@ def get_actual_library_folder() -> Path:
 
 
 def get_library_folder() -> Path:
+    # Validating and resolving the folder touches the disk, so it is done once per change of the setting
+    return get_settings().derived("library_folder", _resolve_library_folder)
+
+
+def _resolve_library_folder() -> Path:
     library_folder = get_actual_library_folder()
 
     if not library_folder.is_absolute():
@@ -562,11 +586,47 @@ def set_github_token(token: str) -> bool:
     return _set_keyring_value(KEYRING_TOKEN_USERNAME, token.strip())
 
 
+KEYRING_KEYS = (
+    KEYRING_TOKEN_USERNAME,
+    KEYRING_PROXY_HOST,
+    KEYRING_PROXY_PORT,
+    KEYRING_PROXY_USER,
+    KEYRING_PROXY_PASSWORD,
+)
+
+# Reading the keyring can be a D-Bus round trip on Linux, so every value is read once and kept here.
+# The lock makes a request wait for a read in progress instead of starting another one.
+_credentials: dict[str, str] = {}
+_credentials_lock = threading.Lock()
+
+
+def preload_credentials() -> threading.Thread:
+    """Read all keyring values on a background thread, so requests don't have to wait for the keyring."""
+
+    def load():
+        for key in KEYRING_KEYS:
+            _get_keyring_value(key)
+
+    thread = threading.Thread(target=load, name="Credentials", daemon=True)
+    thread.start()
+    return thread
+
+
 def _get_keyring_value(key: str, default="") -> str:
+    with _credentials_lock:
+        if key not in _credentials:
+            _credentials[key] = _read_keyring_value(key)
+        return _credentials[key] or default
+
+
+def _read_keyring_value(key: str) -> str:
     """
     Get a value from secure system keyring.
     Falls back to legacy QSettings storage if keyring fails.
     """
+    import keyring
+    from keyring.errors import KeyringError
+
     try:
         token = keyring.get_password(KEYRING_SERVICE_NAME, key)
         if token:
@@ -588,7 +648,7 @@ def _get_keyring_value(key: str, default="") -> str:
             logger.warning(f"Failed to migrate {key} to keyring: {e}")
         return legacy_value
 
-    return default
+    return ""
 
 
 def _set_keyring_value(key: str, val: str) -> bool:
@@ -600,6 +660,12 @@ def _set_keyring_value(key: str, val: str) -> bool:
     Returns:
         bool: True if stored in keyring successfully, False if fell back to QSettings use to trigger user warning.
     """
+    import keyring
+    from keyring.errors import KeyringError, PasswordDeleteError
+
+    with _credentials_lock:
+        _credentials[key] = val
+
     settings = get_settings()
     try:
         if val:
@@ -940,6 +1006,10 @@ def migrate_config(force=False):
             config_path.mkdir()
         shutil.move(old_config.resolve(), new_config.resolve())
 
+    # Read the settings from their new place
+    global _store
+    _store = None
+
 
 def get_column_widths() -> list[int]:
     """Get saved column widths (global, shared across all lists)."""
@@ -970,6 +1040,57 @@ def set_purge_temp_on_startup(is_checked: bool):
     get_settings().setValue("purge_temp_on_startup", is_checked)
 
 
+def get_use_system_decompressors() -> bool:
+    return get_settings().value("use_system_decompressors", defaultValue=True, type=bool)  # type: ignore
+
+
+def set_use_system_decompressors(is_checked: bool):
+    get_settings().setValue("use_system_decompressors", is_checked)
+
+
+def get_deduplicate_builds() -> bool:
+    return get_settings().value("deduplicate_builds", defaultValue=False, type=bool)  # type: ignore
+
+
+def set_deduplicate_builds(is_checked: bool):
+    get_settings().setValue("deduplicate_builds", is_checked)
+
+
+def get_retention_enabled() -> bool:
+    return get_settings().value("retention_enabled", defaultValue=False, type=bool)  # type: ignore
+
+
+def set_retention_enabled(is_checked: bool):
+    get_settings().setValue("retention_enabled", is_checked)
+
+
+def get_retention_keep_newest() -> int:
+    """Builds to keep per branch and minor version, 0 to keep all"""
+    return get_settings().value("retention_keep_newest", defaultValue=5, type=int)  # type: ignore
+
+
+def set_retention_keep_newest(count: int):
+    get_settings().setValue("retention_keep_newest", count)
+
+
+def get_retention_max_age() -> int:
+    """Maximum build age in days, 0 to keep all"""
+    return get_settings().value("retention_max_age", defaultValue=0, type=int)  # type: ignore
+
+
+def set_retention_max_age(days: int):
+    get_settings().setValue("retention_max_age", days)
+
+
+def get_retention_max_size() -> int:
+    """Maximum size of the builds covered by the retention policy in GB, 0 for no limit"""
+    return get_settings().value("retention_max_size", defaultValue=0, type=int)  # type: ignore
+
+
+def set_retention_max_size(size: int):
+    get_settings().setValue("retention_max_size", size)
+
+
 def get_auto_register_winget() -> bool:
     return get_settings().value("auto_register_winget", defaultValue=True, type=bool)  # type: ignore
 
@@ -0,0 +1,83 @@
+"""
+The settings store of the launcher, see `modules.settings.get_settings`.
+
+Kept apart from `modules.settings` so reading settings doesn't import PySide6 unless the store is created.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from PySide6.QtCore import QSettings
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+_R = TypeVar("_R")
+
+
+class SettingsStore:
+    """
+    The settings of the launcher, read from the INI file once and served from memory.
+
+    Getters run in loops over builds and downloads, and constructing a `QSettings` for each of them checked the
+    config folder on disk every time. The store wraps a single `QSettings` and remembers every value it returns by
+    key and requested type. Setters write through to the file and forget what was remembered for the key.
+    """
+
+    def __init__(self, file: Path):
+        file.parent.mkdir(parents=True, exist_ok=True)
+        self.file = file
+        self._settings = QSettings(file.as_posix(), QSettings.Format.IniFormat)
+        self._lock = threading.RLock()
+        self._values: dict[str, dict[tuple, Any]] = {}
+        self._derived: dict[str, Any] = {}
+
+    def value(self, key: str, defaultValue: Any = None, type: type | None = None) -> Any:  # noqa: A002
+        try:
+            return self._values[key][(defaultValue, type)]
+        except KeyError:
+            pass
+        except TypeError:
+            # An unhashable default can't be remembered
+            with self._lock:
+                return self._read(key, defaultValue, type)
+
+        with self._lock:
+            v = self._read(key, defaultValue, type)
+            self._values.setdefault(key, {})[(defaultValue, type)] = v
+        return v
+
+    def _read(self, key: str, defaultValue: Any, type: type | None) -> Any:  # noqa: A002
+        if type is None:
+            return self._settings.value(key, defaultValue)
+        return self._settings.value(key, defaultValue, type=type)
+
+    def contains(self, key: str) -> bool:
+        return self.value(key) is not None
+
+    def setValue(self, key: str, value: Any):
+        with self._lock:
+            self._settings.setValue(key, value)
+            self._forget(key)
+
+    def remove(self, key: str):
+        with self._lock:
+            self._settings.remove(key)
+            self._forget(key)
+
+    def derived(self, key: str, compute: Callable[[], _R]) -> _R:
+        """The result of ``compute``, remembered until the setting ``key`` changes."""
+        try:
+            return self._derived[key]
+        except KeyError:
+            pass
+        with self._lock:
+            v = self._derived[key] = compute()
+        return v
+
+    def _forget(self, key: str):
+        self._values.pop(key, None)
+        self._derived.pop(key, None)
@@ -2,12 +2,11 @@ import re
 from pathlib import Path
 from urllib.parse import parse_qs, urlparse
 
-from bs4 import BeautifulSoup
-from markdown import markdown
-
 
 def markdown_to_text(markdown_text: str) -> str:
     """Converts a markdown string to plaintext"""
+    from bs4 import BeautifulSoup
+    from markdown import markdown
 
     html = markdown(markdown_text)
 
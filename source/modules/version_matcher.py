@@ -3,13 +3,14 @@ from __future__ import annotations
 import contextlib
 import datetime
 import re
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, replace
-from functools import cache, lru_cache
-from operator import attrgetter
-from typing import TYPE_CHECKING, Self, TypedDict, Unpack
+from functools import cache, lru_cache, partial
+from operator import attrgetter, itemgetter
+from typing import TYPE_CHECKING, Any, Self, TypedDict, Unpack
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Callable, Iterable
 
     from modules.build_info import BuildInfo
     from semver import Version
@@ -17,7 +18,7 @@ if TYPE_CHECKING:
 utc = datetime.UTC
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BasicBuildInfo:
     version: Version
     branch: str
@@ -302,55 +303,344 @@ def _relevant_places(vsq: VersionSearchQuery) -> tuple[str, ...]:
 
 
 def match_versions(s: VersionSearchQuery, versions: Iterable[BasicBuildInfo]) -> list[BasicBuildInfo]:
-    versions: list[BasicBuildInfo] = list(versions)
-    relevant_places = s.relevant_places()
-    for place in relevant_places:
+    return _run_stages(_compile(s, FuzzySearchIndex()), list(versions))[0]
+
+
+MAX_FUZZY_DISTANCE = 3
+
+
+def _trigrams(text: str) -> frozenset[str]:
+    return frozenset(text[i : i + 3] for i in range(len(text) - 2))
+
+
+class FuzzySearchIndex:
+    """
+    Fuzzy matching of search text against `BasicBuildInfo.fuzzy_text`.
+
+    The casefolded text and the trigrams of a build are computed once. A build is only handed to the edit distance
+    matcher if it shares enough trigrams with the search to be within the distance at all. Appending to the search
+    never makes a build match with fewer edits, so the distances found for one search are lower bounds for the
+    next one while the user keeps typing.
+    """
+
+    def __init__(self):
+        self._texts: dict[BasicBuildInfo, tuple[str, frozenset[str]]] = {}
+        self._search = ""
+        self._search_trigrams: frozenset[str] = frozenset()
+        self._lower_bounds: dict[BasicBuildInfo, int] = {}
+
+    def discard(self, build: BasicBuildInfo):
+        self._texts.pop(build, None)
+        self._lower_bounds.pop(build, None)
+
+    def _entry(self, build: BasicBuildInfo) -> tuple[str, frozenset[str]]:
+        if (entry := self._texts.get(build)) is None:
+            text = build.fuzzy_text.casefold()
+            entry = self._texts[build] = (text, _trigrams(text))
+        return entry
+
+    def _set_search(self, search: str):
+        search = search.casefold()
+        if search == self._search:
+            return
+        if not search.startswith(self._search):
+            self._lower_bounds = {}
+        self._search = search
+        self._search_trigrams = _trigrams(search)
+
+    def _matches(self, text: str, trigrams: frozenset[str], distance: int) -> bool:
+        if distance == 0:
+            return self._search in text
+        # Every edit breaks at most three trigrams of the search
+        if len(self._search_trigrams & trigrams) < len(self._search_trigrams) - 3 * distance:
+            return False
+
+        from fuzzysearch import find_near_matches
+
+        return bool(
+            find_near_matches(
+                self._search,
+                text,
+                max_l_dist=distance,
+                max_deletions=1,
+                max_substitutions=1,
+                max_insertions=1,
+            )
+        )
+
+    def distance(self, search: str, build: BasicBuildInfo, limit: int | None = None) -> int | None:
+        """The fewest edits it takes to find ``search`` in the text of ``build``, or None if it takes more than ``limit``"""
+        limit = MAX_FUZZY_DISTANCE if limit is None else min(limit, MAX_FUZZY_DISTANCE)
+        self._set_search(search)
+        text, trigrams = self._entry(build)
+
+        lower_bound = self._lower_bounds.get(build, 0)
+        for distance in range(lower_bound, limit + 1):
+            if self._matches(text, trigrams, distance):
+                self._lower_bounds[build] = distance
+                return distance
+        self._lower_bounds[build] = max(lower_bound, limit + 1)
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class _Stage:
+    """One place of a query: a test on a value of the build, then optionally keeping the extreme values only"""
+
+    key: Callable[..., Any]
+    test: Callable[[Any], bool] | None = None
+    newest: bool | None = None
+    "Keep the largest (True) or smallest (False) values of the builds that got this far"
+    bounded: bool = False
+    "The key takes the current extreme and returns None for anything worse, so it can stop early"
+
+    def value(self, build: BasicBuildInfo, extreme: tuple[Any, int] | None = None) -> Any:
+        if self.bounded:
+            return self.key(build, extreme[0] if extreme is not None else None)
+        return self.key(build)
+
+
+def _compile(vsq: VersionSearchQuery, fuzzy_index: FuzzySearchIndex) -> tuple[_Stage, ...]:
+    stages = []
+    for place in vsq.relevant_places():
         getter = attrgetter(place)
-        p: str | tuple[str, ...] | int | datetime.datetime | None = getter(s)
+        p = getter(vsq)
         match (place, p):
             case ("after", time):
-                versions = [v for v in versions if v.commit_time >= time]
+                stages.append(_Stage(attrgetter("commit_time"), test=lambda t, time=time: t >= time))
             case ("before", time):
-                versions = [v for v in versions if v.commit_time <= time]
+                stages.append(_Stage(attrgetter("commit_time"), test=lambda t, time=time: t <= time))
             case ("fuzzy_text", txt):
-                versions = fuzzy_search_by_str(versions, txt)
+                # Builds that match with the fewest edits
+                stages.append(
+                    _Stage(
+                        partial(fuzzy_index.distance, txt),
+                        test=lambda d: d is not None,
+                        newest=False,
+                        bounded=True,
+                    )
+                )
             case (_, "^"):
-                # get the max number for `place` in version
-                max_p = max(getter(v) for v in versions)
-                versions = [v for v in versions if getter(v) == max_p]
+                stages.append(_Stage(getter, newest=True))
             case (_, "-"):
-                # get the min number for `place` in version
-                min_p = min(getter(v) for v in versions)
-                versions = [v for v in versions if getter(v) == min_p]
+                stages.append(_Stage(getter, newest=False))
             case (_, p) if isinstance(p, tuple):
-                versions = [v for v, x in zip(versions, map(getter, versions), strict=True) if any(x == q for q in p)]
+                stages.append(_Stage(getter, test=lambda x, p=p: any(x == q for q in p)))
             case (_, p):
-                versions = [v for v in versions if getter(v) == p]
+                stages.append(_Stage(getter, test=lambda x, p=p: x == p))
+    return tuple(stages)
 
-        if not versions:
-            return versions
-    return list(versions)
-
-
-def fuzzy_search_by_str(lst: list[BasicBuildInfo], search: str) -> list[BasicBuildInfo]:
-    search = search.casefold()
-    from fuzzysearch import Match, find_near_matches
-
-    ret = []
-    l_dist = 0
-    while not ret and l_dist < 4:
-        for b in lst:
-            s = b.fuzzy_text.casefold()
-            matches: list[Match] = find_near_matches(
-                search,
-                s,
-                max_l_dist=l_dist,
-                max_deletions=1,
-                max_substitutions=1,
-                max_insertions=1,
-            )
-            if matches:
-                ret.append(b)
-        l_dist += 1
 
-    return ret
+def _run_stages(
+    stages: tuple[_Stage, ...], versions: list[BasicBuildInfo]
+) -> tuple[list[BasicBuildInfo], list[tuple[Any, int] | None]]:
+    """The matching builds and, per stage, the extreme value and how many builds have it"""
+    extremes: list[tuple[Any, int] | None] = [None] * len(stages)
+    for i, stage in enumerate(stages):
+        if not versions:
+            break
+        if stage.bounded:
+            kept: list[BasicBuildInfo] = []
+            for v in versions:
+                x = stage.value(v, extremes[i])
+                if stage.test is not None and not stage.test(x):
+                    continue
+                if extremes[i] is None or x != extremes[i][0]:
+                    # Anything worse than the extreme was rejected by the key, so this is a new extreme
+                    kept = []
+                kept.append(v)
+                extremes[i] = (x, len(kept))
+            versions = kept
+            continue
+        if stage.test is not None:
+            versions = [v for v in versions if stage.test(stage.value(v))]
+        if stage.newest is not None and versions:
+            values = [stage.value(v) for v in versions]
+            extreme = max(values) if stage.newest else min(values)
+            versions = [v for v, x in zip(versions, values, strict=True) if x == extreme]
+            extremes[i] = (extreme, len(versions))
+    return versions, extremes
+
+
+class QueryFilter:
+    """
+    A query evaluated over a set of builds that changes one build at a time.
+
+    Running the whole query again for every row added to a list is quadratic, and ``^`` and ``-`` have to look at
+    every build. Instead, the query is compiled once and the filter keeps the extreme value (and how many builds
+    share it) of every ``^`` and ``-`` place. Adding or removing a build only walks that build through the places;
+    everything is evaluated again only when the build changes one of the extremes.
+    """
+
+    def __init__(
+        self,
+        query: VersionSearchQuery,
+        builds: Iterable[BasicBuildInfo] = (),
+        fuzzy_index: FuzzySearchIndex | None = None,
+    ):
+        self.query = query
+        self._stages = _compile(query, fuzzy_index or FuzzySearchIndex())
+        self._builds: dict[BasicBuildInfo, None] = dict.fromkeys(builds)
+        self.matches: set[BasicBuildInfo] = set()
+        self._extremes: list[tuple[Any, int] | None] = []
+        self._evaluate()
+
+    def _evaluate(self) -> set[BasicBuildInfo]:
+        """Evaluate the query over all builds. Returns the builds that started or stopped matching."""
+        old = self.matches
+        matches, self._extremes = _run_stages(self._stages, list(self._builds))
+        self.matches = set(matches)
+        return old ^ self.matches
+
+    def add(self, build: BasicBuildInfo) -> set[BasicBuildInfo]:
+        """Add ``build``. Returns the builds that started or stopped matching."""
+        if build in self._builds:
+            return set()
+        self._builds[build] = None
+
+        for i, stage in enumerate(self._stages):
+            extreme = self._extremes[i]
+            value = stage.value(build, extreme)
+            if stage.test is not None and not stage.test(value):
+                return set()
+            if stage.newest is not None:
+                if extreme is None:
+                    # Nothing got this far; every later place is empty as well
+                    self._extremes[i] = (value, 1)
+                elif value == extreme[0]:
+                    self._extremes[i] = (value, extreme[1] + 1)
+                elif (value > extreme[0]) == stage.newest:
+                    return self._evaluate()
+                else:
+                    return set()
+
+        self.matches.add(build)
+        return {build}
+
+    def remove(self, build: BasicBuildInfo) -> set[BasicBuildInfo]:
+        """Remove ``build``. Returns the builds that started or stopped matching."""
+        if build not in self._builds:
+            return set()
+        del self._builds[build]
+
+        for i, stage in enumerate(self._stages):
+            extreme = self._extremes[i]
+            value = stage.value(build, extreme)
+            if stage.test is not None and not stage.test(value):
+                return set()
+            if stage.newest is not None:
+                if extreme is None or value != extreme[0]:
+                    return set()
+                if extreme[1] == 1:
+                    return self._evaluate()
+                self._extremes[i] = (value, extreme[1] - 1)
+
+        self.matches.discard(build)
+        return {build}
+
+
+def _sort_key(build: BasicBuildInfo) -> tuple:
+    return (build.version.major, build.version.minor, build.version.patch, build.commit_time)
+
+
+# Places of a query in the order of the sort key of `BuildIndex`, and places it keeps a hash map of
+_SORTED_PLACES = ("major", "minor", "patch", "commit_time")
+_HASHED_PLACES = ("folder", "build_hash", "branch")
+
+
+class BuildIndex:
+    """
+    A set of builds kept sorted by major, minor, patch and commit time, with hash maps by branch, folder and build hash.
+
+    `match_versions` walks every build once per place of a query. Most queries pin or take the newest or oldest of
+    the leading places of the sort key, each of which narrows a range of the sorted builds with two binary searches:
+    ``4.^.^`` costs O(log n). The first place that can't narrow the range, such as a branch after the version, is
+    evaluated like `match_versions` over the builds left in the range only. A query that starts with a branch,
+    folder or build hash takes its builds from the hash map instead of the range.
+    """
+
+    def __init__(self, builds: Iterable[BasicBuildInfo] = (), fuzzy_index: FuzzySearchIndex | None = None):
+        self._fuzzy_index = fuzzy_index or FuzzySearchIndex()
+        self._members = set(builds)
+        self._builds = sorted(self._members, key=_sort_key)
+        self._keys = [_sort_key(build) for build in self._builds]
+        self._by_place: dict[str, dict[Any, set[BasicBuildInfo]]] = {place: {} for place in _HASHED_PLACES}
+        for build in self._builds:
+            self._hash(build)
+
+    def __len__(self) -> int:
+        return len(self._builds)
+
+    def __contains__(self, build: object) -> bool:
+        return build in self._members
+
+    def _hash(self, build: BasicBuildInfo):
+        for place, index in self._by_place.items():
+            index.setdefault(getattr(build, place), set()).add(build)
+
+    def add(self, build: BasicBuildInfo):
+        if build in self._members:
+            return
+        self._members.add(build)
+        key = _sort_key(build)
+        i = bisect_right(self._keys, key)
+        self._keys.insert(i, key)
+        self._builds.insert(i, build)
+        self._hash(build)
+
+    def discard(self, build: BasicBuildInfo):
+        if build not in self._members:
+            return
+        self._members.remove(build)
+        key = _sort_key(build)
+        lo = bisect_left(self._keys, key)
+        i = self._builds.index(build, lo, bisect_right(self._keys, key, lo))
+        del self._keys[i]
+        del self._builds[i]
+        for place, index in self._by_place.items():
+            value = getattr(build, place)
+            index[value].discard(build)
+            if not index[value]:
+                del index[value]
+
+    def _hashed(self, place: str, value: Any) -> list[BasicBuildInfo]:
+        index = self._by_place[place]
+        values = value if place == "branch" else (value,)
+        builds = set().union(*(index.get(v, ()) for v in values))
+        return sorted(builds, key=_sort_key)
+
+    def match(self, query: VersionSearchQuery) -> list[BasicBuildInfo]:
+        """The builds matching ``query``, newest first. These are the builds `match_versions` finds."""
+        stages = _compile(query, self._fuzzy_index)
+        lo, hi = 0, len(self._builds)
+        depth = 0
+        for i, place in enumerate(query.relevant_places()):
+            if lo == hi:
+                return []
+            value = getattr(query, place)
+            # An exact commit time may be naive, which can't be ordered against the commit times of the builds
+            if (
+                depth < len(_SORTED_PLACES)
+                and place == _SORTED_PLACES[depth]
+                and not isinstance(value, datetime.datetime)
+            ):
+                if value == "^":
+                    value = self._keys[hi - 1][depth]
+                elif value == "-":
+                    value = self._keys[lo][depth]
+                # Every build in the range shares the places before this one
+                prefix = (*self._keys[lo][:depth], value)
+                key = itemgetter(slice(depth + 1))
+                lo = bisect_left(self._keys, prefix, lo, hi, key=key)
+                hi = bisect_right(self._keys, prefix, lo, hi, key=key)
+                depth += 1
+                continue
+
+            if lo == 0 and hi == len(self._builds) and place in _HASHED_PLACES:
+                builds = self._hashed(place, value)
+                i += 1
+            else:
+                builds = self._builds[lo:hi]
+            matches, _ = _run_stages(stages[i:], builds)
+            return matches[::-1]
+        return self._builds[lo:hi][::-1]
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from modules.build_info import BuildInfo, fill_build_info
+from modules.task import Task
+from PySide6.QtCore import Signal
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@dataclass
+class WriteBuildTask(Task):
+    written = Signal()
+    error = Signal()
+
+    path: Path
+    build_info: BuildInfo
+
+    def run(self):
+        try:
+            self.build_info.write_to(self.path)
+            self.written.emit()
+        except Exception:
+            self.error.emit()
+            raise
+
+
+@dataclass
+class BulkWriteBuildTask(Task):
+    """Write the build info of several builds at once, e.g. after favoriting or freezing a selection."""
+
+    written = Signal(int)
+
+    builds: list[tuple[Path, BuildInfo]]
+
+    def run(self):
+        # write_to logs and swallows OSErrors, so there is nothing to collect
+        with ThreadPoolExecutor(max_workers=min(len(self.builds), 4) or 1) as pool:
+            for _ in pool.map(lambda build: build[1].write_to(build[0]), self.builds):
+                pass
+        self.written.emit(len(self.builds))
+
+    def __str__(self):
+        return f"Write build info of {len(self.builds)} builds"
+
+
+@dataclass
+class ReadBuildTask(Task):
+    path: Path
+    info: BuildInfo | None = None
+    archive_name: str | None = None
+    auto_write: bool = True
+
+    finished = Signal(BuildInfo)
+    failure = Signal(Exception)
+
+    def run(self):
+        try:
+            build_info = fill_build_info(self.path, self.archive_name, self.info, self.auto_write)
+            self.finished.emit(build_info)
+
+        except Exception as e:
+            self.failure.emit(e)
+            raise
+
+    def __str__(self):
+        return f"Read build at {self.path}"
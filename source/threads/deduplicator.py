@@ -0,0 +1,244 @@
+"""
+Library-wide file deduplication.
+
+Builds installed side by side are mostly byte-identical (``datafiles``, ``python/lib``, ``scripts``, shared
+libraries). Identical files are replaced with reflinks where the filesystem supports them, or hardlinks
+otherwise. Candidates are bucketed by size first and only files sharing a size with another file get hashed.
+Hashes are kept in a persistent index in the library folder, so later installs are deduplicated incrementally.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from modules.file_utils import reflink
+from modules.library_index import get_blender_builds
+from modules.settings import build_library_folders, get_library_folder
+from modules.task import Task
+from PySide6.QtCore import Signal
+
+logger = logging.getLogger()
+
+INDEX_NAME = ".dedup-index.json"
+INDEX_VERSION = 1
+# Linking small files saves little and costs an inode operation each
+MIN_FILE_SIZE = 64 * 1024
+
+_lock = threading.Lock()
+
+
+@dataclass
+class IndexEntry:
+    size: int
+    mtime_ns: int
+    digest: str | None = None
+
+
+@dataclass
+class DedupIndex:
+    """Known files of the library, keyed by their path relative to the library folder."""
+
+    path: Path
+    files: dict[str, IndexEntry] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, library_folder: Path) -> DedupIndex:
+        path = library_folder / INDEX_NAME
+        index = cls(path)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if data.get("version") == INDEX_VERSION:
+                index.files = {k: IndexEntry(*v) for k, v in data["files"].items()}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable dedup index {path}: {e}")
+        return index
+
+    def save(self):
+        data = {
+            "version": INDEX_VERSION,
+            "files": {k: [e.size, e.mtime_ns, e.digest] for k, e in self.files.items()},
+        }
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+@dataclass
+class DedupResult:
+    linked_files: int = 0
+    saved_bytes: int = 0
+    hashed_bytes: int = 0
+
+
+def _walk_files(root: Path):
+    """Yield ``os.DirEntry`` objects for all regular files below ``root``, without following symlinks."""
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(Path(entry.path))
+                    elif entry.is_file(follow_symlinks=False):
+                        yield entry
+        except OSError as e:
+            logger.debug(f"Skipping unreadable folder: {e}")
+
+
+def _digest(path: Path) -> str:
+    with path.open("rb") as f:
+        return hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=16)).hexdigest()
+
+
+def link_duplicate(original: Path, duplicate: Path) -> bool:
+    """
+    Replace ``duplicate`` with a reflink (or hardlink) of ``original``.
+
+    The new link is created next to ``duplicate`` and renamed over it, so the file is never missing.
+    Returns True if a reflink was made, False for a hardlink.
+    """
+    tmp = duplicate.with_name(f".{duplicate.name}.dedup")
+    tmp.unlink(missing_ok=True)
+    reflinked = reflink(original, tmp)
+    if reflinked:
+        stat = duplicate.stat()
+        os.chmod(tmp, stat.st_mode)
+        os.utime(tmp, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    else:
+        os.link(original, tmp)
+    os.replace(tmp, duplicate)
+    return reflinked
+
+
+def deduplicate(
+    library_folder: Path,
+    builds: list[Path],
+    all_builds: list[Path],
+    progress_callback=None,
+) -> DedupResult:
+    """
+    Link files of ``builds`` that are identical to files elsewhere in ``all_builds``.
+
+    Only files of ``builds`` (and of builds missing from the index) are scanned from disk; the rest of the
+    library is taken from the index, which is refreshed for the scanned builds and pruned of builds that no
+    longer exist.
+    """
+    index = DedupIndex.load(library_folder)
+    result = DedupResult()
+
+    def rel(path: Path | str) -> str:
+        return Path(path).relative_to(library_folder).as_posix()
+
+    # Builds the index knows nothing about (e.g. installed before dedup was enabled) are scanned as well
+    indexed_roots = {"/".join(k.split("/", 2)[:2]) for k in index.files}
+    builds = list(dict.fromkeys([*builds, *(b for b in all_builds if rel(b) not in indexed_roots)]))
+
+    scanned_roots = tuple(f"{rel(b)}/" for b in builds)
+    existing_roots = tuple(f"{rel(b)}/" for b in all_builds)
+    index.files = {
+        k: e for k, e in index.files.items() if k.startswith(existing_roots) and not k.startswith(scanned_roots)
+    }
+
+    # (st_dev, st_ino, st_mode) of every file looked at
+    devices: dict[str, tuple[int, int, int]] = {}
+    for build in builds:
+        for entry in _walk_files(build):
+            stat = entry.stat(follow_symlinks=False)
+            if stat.st_size < MIN_FILE_SIZE:
+                continue
+            key = rel(entry.path)
+            index.files[key] = IndexEntry(stat.st_size, stat.st_mtime_ns)
+            devices[key] = (stat.st_dev, stat.st_ino, stat.st_mode)
+
+    scanned = set(devices)
+    by_size: dict[int, list[str]] = defaultdict(list)
+    for key, entry in index.files.items():
+        by_size[entry.size].append(key)
+    buckets = [keys for keys in by_size.values() if len(keys) > 1 and not scanned.isdisjoint(keys)]
+
+    total = sum(len(keys) for keys in buckets)
+    done = 0
+    for keys in buckets:
+        by_digest: dict[str, list[str]] = defaultdict(list)
+        for key in keys:
+            entry = index.files[key]
+            path = library_folder / key
+            try:
+                stat = path.stat()
+                if entry.digest is None or stat.st_mtime_ns != entry.mtime_ns or stat.st_size != entry.size:
+                    entry.digest = _digest(path)
+                    entry.size, entry.mtime_ns = stat.st_size, stat.st_mtime_ns
+                    result.hashed_bytes += entry.size
+                devices[key] = (stat.st_dev, stat.st_ino, stat.st_mode)
+                by_digest[entry.digest].append(key)
+            except OSError as e:
+                logger.debug(f"Skipping {path}: {e}")
+            done += 1
+            if progress_callback is not None:
+                progress_callback(done, total)
+
+        for group in by_digest.values():
+            # Prefer an original outside the scanned builds so existing links are reused
+            group.sort(key=lambda k: k in scanned)
+            original = group[0]
+            for key in group[1:]:
+                if key not in scanned or devices[key] == devices[original]:
+                    continue
+                # Links can't cross filesystems, and a hardlink would share the permissions
+                if devices[key][0] != devices[original][0] or devices[key][2] != devices[original][2]:
+                    continue
+                path = library_folder / key
+                try:
+                    link_duplicate(library_folder / original, path)
+                except OSError as e:
+                    logger.debug(f"Failed to link {path}: {e}")
+                    continue
+                stat = path.stat()
+                index.files[key].mtime_ns = stat.st_mtime_ns
+                devices[key] = (stat.st_dev, stat.st_ino, stat.st_mode)
+                result.linked_files += 1
+                result.saved_bytes += index.files[key].size
+
+    index.save()
+    return result
+
+
+@dataclass
+class DedupTask(Task):
+    builds: list[Path] | None = None
+    """Builds to deduplicate against the rest of the library. None scans the whole library."""
+
+    progress = Signal(int, int)
+    finished = Signal(int, int)
+    """Number of files linked and bytes saved"""
+
+    def run(self):
+        library_folder = get_library_folder()
+        all_builds = [p for p, recognized in get_blender_builds(build_library_folders) if recognized]
+        builds = all_builds if self.builds is None else [b for b in self.builds if b.is_dir()]
+
+        with _lock:
+            try:
+                result = deduplicate(library_folder, builds, all_builds, self.progress.emit)
+            except Exception as e:
+                logger.exception(f"Deduplication failed: {e}")
+                self.finished.emit(0, 0)
+                return
+
+        logger.info(
+            f"Deduplicated {result.linked_files} files, saved {result.saved_bytes / 1024**2:.1f} MB "
+            f"(hashed {result.hashed_bytes / 1024**2:.1f} MB)"
+        )
+        self.finished.emit(result.linked_files, result.saved_bytes)
+
+    def __str__(self):
+        return "Deduplicate library" if self.builds is None else f"Deduplicate {', '.join(map(str, self.builds))}"
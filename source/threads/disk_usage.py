@@ -0,0 +1,181 @@
+"""
+Disk usage of library builds.
+
+Walking a build to add up its file sizes takes long enough that doing it on demand for every build is not an
+option. Sizes are recorded when a build is extracted and cached in an index in the library folder, keyed by the
+build's path relative to the library. An entry is stale once the modification time of the build folder changes
+(e.g. a portable config folder was added); stale and missing entries are measured on a background thread.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from modules.library_index import get_blender_builds
+from modules.settings import build_library_folders, get_library_folder
+from modules.task import Task
+from PySide6.QtCore import Signal
+
+logger = logging.getLogger()
+
+INDEX_NAME = ".disk-usage.json"
+INDEX_VERSION = 1
+
+
+def folder_size(path: Path) -> int:
+    """Apparent size of all files below ``path``, without following symlinks."""
+    total = 0
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(Path(entry.path))
+                    else:
+                        total += entry.stat(follow_symlinks=False).st_size
+        except OSError as e:
+            logger.debug(f"Skipping unreadable folder: {e}")
+    return total
+
+
+def _mtime_ns(path: Path) -> int | None:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+@dataclass
+class DiskUsageIndex:
+    """Cached sizes of the builds of one library folder. Safe to use from several threads."""
+
+    library_folder: Path
+    entries: dict[str, tuple[int, int]] = field(default_factory=dict)
+    """Size and folder modification time, keyed by the path relative to the library folder"""
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+        self._dirty = False
+
+    @property
+    def path(self) -> Path:
+        return self.library_folder / INDEX_NAME
+
+    @classmethod
+    def load(cls, library_folder: Path) -> DiskUsageIndex:
+        index = cls(library_folder)
+        try:
+            data = json.loads(index.path.read_text(encoding="utf-8"))
+            if data.get("version") == INDEX_VERSION:
+                index.entries = {k: (int(v[0]), int(v[1])) for k, v in data["builds"].items()}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError, KeyError, IndexError) as e:
+            logger.warning(f"Ignoring unreadable disk usage index {index.path}: {e}")
+        return index
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {"version": INDEX_VERSION, "builds": {k: list(v) for k, v in self.entries.items()}}
+            self._dirty = False
+        tmp = self.path.with_suffix(".tmp")
+        try:
+            tmp.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to save disk usage index {self.path}: {e}")
+
+    def _key(self, build: Path) -> str:
+        """Raises ValueError for paths outside of the library folder."""
+        return Path(build).relative_to(self.library_folder).as_posix()
+
+    def cached(self, build: Path) -> int | None:
+        """The last known size of ``build``, even if it is stale."""
+        try:
+            entry = self.entries.get(self._key(build))
+        except ValueError:
+            return None
+        return entry[0] if entry is not None else None
+
+    def is_stale(self, build: Path) -> bool:
+        entry = self.entries.get(self._key(build))
+        return entry is None or entry[1] != _mtime_ns(build)
+
+    def record(self, build: Path, size: int | None = None) -> int:
+        """Store the size of ``build``, measuring it unless given."""
+        mtime = _mtime_ns(build)
+        if size is None:
+            size = folder_size(build)
+        with self._lock:
+            if mtime is None:
+                self.entries.pop(self._key(build), None)
+            else:
+                self.entries[self._key(build)] = (size, mtime)
+            self._dirty = True
+        return size
+
+    def size(self, build: Path) -> int:
+        """The size of ``build``, measuring it if the cached size is stale."""
+        if self.is_stale(build):
+            return self.record(build)
+        return self.entries[self._key(build)][0]
+
+    def prune(self, builds: list[Path]):
+        """Forget builds that are not in ``builds``."""
+        keep = {self._key(b) for b in builds}
+        with self._lock:
+            removed = self.entries.keys() - keep
+            for key in removed:
+                del self.entries[key]
+            self._dirty |= bool(removed)
+
+
+_index: DiskUsageIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_disk_usage() -> DiskUsageIndex:
+    """The disk usage index of the current library folder."""
+    global _index
+    library_folder = Path(get_library_folder())
+    with _index_lock:
+        if _index is None or _index.library_folder != library_folder:
+            _index = DiskUsageIndex.load(library_folder)
+        return _index
+
+
+@dataclass
+class DiskUsageTask(Task):
+    """Measure builds whose cached size is missing or stale."""
+
+    builds: list[Path] | None = None
+    """Builds to refresh. None refreshes the whole library and drops builds that no longer exist."""
+
+    measured = Signal(Path, int)
+    finished = Signal()
+
+    def run(self):
+        index = get_disk_usage()
+        if self.builds is None:
+            builds = [p for p, recognized in get_blender_builds(build_library_folders) if recognized]
+            index.prune(builds)
+        else:
+            builds = self.builds
+
+        for build in builds:
+            if index.is_stale(build):
+                self.measured.emit(build, index.record(build))
+
+        index.save()
+        self.finished.emit()
+
+    def __str__(self):
+        return "Measure library disk usage"
@@ -1,24 +1,69 @@
+from __future__ import annotations
+
+import contextlib
 import logging
+import os
 import re
 import shutil
+import stat
+import sys
 import tarfile
+import threading
+import uuid
 import zipfile
-from collections.abc import Callable
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-
-import py7zr
+from typing import TYPE_CHECKING
+
+from modules.decompression import (
+    CHUNK_SIZE,
+    DecompressionError,
+    DecompressionStream,
+    ZipPlan,
+    extract_zip_parallel,
+    extract_zip_serial,
+    get_stream_backend,
+    plan_zip_extraction,
+    should_extract_in_parallel,
+)
 from modules.enums import MessageType
-from modules.file_utils import retry_on_permission_error
+from modules.file_utils import reflink, retry_on_permission_error
 from modules.platform_utils import _check_call, _check_output
+from modules.settings import get_deduplicate_builds, get_use_system_decompressors
 from modules.task import Task
 from PySide6.QtCore import Signal
 from send2trash import send2trash
+from threads.disk_usage import get_disk_usage
+from threads.remover import tombstone
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
 
 logger = logging.getLogger()
 
 
-def extract(source: Path, destination: Path, progress_callback: Callable[[int, int], None]) -> Path | None:
+def extract(
+    source: Path,
+    destination: Path,
+    progress_callback: Callable[[int, int], None],
+    is_upbge: bool = False,
+    delta: DeltaSource | None = None,
+) -> Path | None:
+    """
+    Extract a build archive into ``destination``.
+
+    Args:
+        source: The archive.
+        destination: Folder the build folder is created in.
+        progress_callback: Called with (done, total).
+        is_upbge: Fix up UPBGE build layouts.
+        delta: A previously installed build; unchanged files are copied from it instead of decompressed.
+
+    Returns:
+        The extracted build folder, or None for unsupported formats.
+    """
     progress_callback(0, 0)
     suffixes = source.suffixes
     if suffixes[-1] == ".zip":
@@ -35,47 +80,60 @@ def extract(source: Path, destination: Path, progress_callback: Callable[[int, i
                 folder = _get_build_folder(names)
 
                 # Check if this is a UPBGE archive (folder is "bin" with bin/Release structure)
-                is_upbge = folder == "bin" and any(n.startswith("bin/Release/") for n in names)
+                is_bin_release = folder == "bin" and any(n.startswith("bin/Release/") for n in names)
 
-                if is_upbge:
+                if is_bin_release:
                     folder = source.stem
                     logger.info(f"Detected UPBGE archive with bin/Release structure, using: {folder}")
                 elif folder is None:
                     folder = members[0].filename.split("/")[0]
 
-                uncompress_size = sum(member.file_size for member in members)
-                progress_callback(0, uncompress_size)
-                extracted_size = 0
-
                 # For UPBGE flat archives, extract into a subfolder
-                extract_dest = destination / folder if is_upbge else destination
-
-                for member in members:
-                    zf.extract(member, extract_dest)
-                    extracted_size += member.file_size
-                    progress_callback(extracted_size, uncompress_size)
+                extract_dest = destination / folder if is_bin_release else destination
+                rewrite = _plan_upbge_rewrite(names, "" if is_bin_release else f"{folder}/") if is_upbge else None
+                plan = plan_zip_extraction(members, extract_dest, rewrite.apply if rewrite else None)
+
+                if delta is not None:
+                    reused_size = _reuse_zip_members(plan, destination / folder, delta)
+                    total_size = plan.total_size + reused_size
+                    progress_callback(reused_size, total_size)
+
+                    def progress(done: int, _total: int, offset=reused_size, total=total_size):
+                        progress_callback(offset + done, total)
+
+                else:
+                    progress = progress_callback
+
+                # Only what is left after reusing unchanged files is worth a process pool
+                if should_extract_in_parallel([info for info, _ in plan.files]):
+                    logger.info(f"Extracting {source.name} in parallel")
+                    extract_zip_parallel(source, plan, progress)
+                else:
+                    extract_zip_serial(zf, plan, progress)
             return destination / folder
         except zipfile.BadZipFile as e:
             logger.error(f"Bad zip file: {source} - {e}")
             raise
 
     if suffixes[-1] == ".7z":
+        import py7zr
+
         try:
             with py7zr.SevenZipFile(source, mode="r") as szf:
                 allfiles = szf.getnames()
                 folder = _get_build_folder(allfiles)
 
                 # Check if this is a UPBGE archive with bin/Release structure
-                is_upbge = folder == "bin" and any(n.startswith("bin/Release/") for n in allfiles)
+                is_bin_release = folder == "bin" and any(n.startswith("bin/Release/") for n in allfiles)
 
-                if is_upbge:
+                if is_bin_release:
                     folder = source.stem
                     logger.info(f"Detected UPBGE 7z archive with bin/Release structure, using: {folder}")
                 elif folder is None:
                     folder = allfiles[0].split("/")[0]
 
                 # For UPBGE flat archives, extract into a subfolder
-                extract_dest = destination / folder if is_upbge else destination
+                extract_dest = destination / folder if is_bin_release else destination
                 extract_dest.mkdir(parents=True, exist_ok=True)
 
                 # Get file info for progress tracking
@@ -89,6 +147,9 @@ def extract(source: Path, destination: Path, progress_callback: Callable[[int, i
                 # Report completion
                 progress_callback(total_size, total_size)
 
+            # py7zr can only extract whole archives, so the layout is fixed afterwards
+            if is_upbge:
+                return _fix_upbge_structure(destination / folder)
             return destination / folder
         except py7zr.Bad7zFile as e:
             logger.error(f"Bad 7z file: {source} - {e}")
@@ -98,23 +159,7 @@ def extract(source: Path, destination: Path, progress_callback: Callable[[int, i
             raise
 
     if suffixes[-2] == ".tar":
-        with tarfile.open(source) as tar:
-            members = tar.getmembers()
-            names = [m.name for m in members]
-            folder = _get_build_folder(names)
-
-            if folder is None:
-                folder = tar.getnames()[0].split("/")[0]
-
-            uncompress_size = sum(member.size for member in members)
-            progress_callback(0, uncompress_size)
-            extracted_size = 0
-
-            for member in members:
-                tar.extract(member, path=destination)
-                extracted_size += member.size
-                progress_callback(extracted_size, uncompress_size)
-        return destination / folder
+        return _extract_tar(source, destination, progress_callback, is_upbge, delta)
 
     if suffixes[-1] == ".dmg":
         # Mount the DMG and get the mount point
@@ -211,6 +256,306 @@ def extract(source: Path, destination: Path, progress_callback: Callable[[int, i
     return None
 
 
+def _extract_tar(
+    source: Path,
+    destination: Path,
+    progress_callback: Callable[[int, int], None],
+    is_upbge: bool = False,
+    delta: DeltaSource | None = None,
+) -> Path:
+    backend = get_stream_backend(source, None if get_use_system_decompressors() else "python")
+    if backend is not None:
+        try:
+            stream = DecompressionStream(source, backend)
+        except OSError as e:
+            logger.warning(f"Failed to start {backend.name}, falling back to Python decompression: {e}")
+        else:
+            logger.info(f"Decompressing {source.name} with {backend.name}")
+            reused = (delta.reused_files, delta.reused_size) if delta is not None else None
+            try:
+                result = extract_tar_stream(stream, destination, progress_callback, delta)
+            except DecompressionError as e:
+                # What was extracted so far is overwritten by extracting the whole archive again
+                logger.warning(f"{e}, extracting {source.name} again with Python decompression")
+                if delta is not None and reused is not None:
+                    delta.reused_files, delta.reused_size = reused
+            else:
+                # Member names are only known once the stream has been read, so the layout is fixed afterwards
+                return _fix_upbge_structure(result) if is_upbge else result
+
+    with tarfile.open(source) as tar:
+        members = tar.getmembers()
+        names = [m.name for m in members]
+        folder = _get_build_folder(names)
+
+        if folder is None:
+            folder = tar.getnames()[0].split("/")[0]
+
+        rewrite = _plan_upbge_rewrite(names, f"{folder}/") if is_upbge else None
+
+        uncompress_size = sum(member.size for member in members)
+        progress_callback(0, uncompress_size)
+        extracted_size = 0
+
+        for member in members:
+            if rewrite is None or _rewrite_tar_member(member, rewrite):
+                relative = member.name[len(folder) + 1 :] if member.name.startswith(f"{folder}/") else None
+                if (
+                    delta is None
+                    or relative is None
+                    or not _extract_tar_member_delta(tar, member, destination, delta, relative)
+                ):
+                    tar.extract(member, path=destination)
+            extracted_size += member.size
+            progress_callback(extracted_size, uncompress_size)
+    return destination / folder
+
+
+def extract_tar_stream(
+    stream: DecompressionStream,
+    destination: Path,
+    progress_callback: Callable[[int, int], None],
+    delta: DeltaSource | None = None,
+) -> Path:
+    # The member list is unknown until the stream has been read, so progress
+    # is reported in compressed bytes consumed instead of uncompressed size
+    total_size = stream.source.stat().st_size
+    progress_callback(0, total_size)
+    names = []
+
+    with stream as fileobj, tarfile.open(fileobj=fileobj, mode="r|") as tar:
+        for member in tar:
+            # The build folder is not known yet, assume everything lives in a single top level folder
+            relative = member.name.split("/", 1)[1] if "/" in member.name else None
+            if (
+                delta is None
+                or relative is None
+                or not _extract_tar_member_delta(tar, member, destination, delta, relative)
+            ):
+                tar.extract(member, path=destination)
+            names.append(member.name)
+            progress_callback(stream.bytes_read, total_size)
+
+    progress_callback(total_size, total_size)
+    if not names:
+        raise tarfile.ReadError(f"Empty archive: {stream.source}")
+
+    folder = _get_build_folder(names) or names[0].split("/")[0]
+    return destination / folder
+
+
+@dataclass
+class DeltaSource:
+    """
+    An installed build that an update is extracted against.
+
+    Files whose content did not change are copied (or linked) from it instead of being decompressed and written.
+    """
+
+    root: Path
+    hardlink: bool = False
+    """Hardlink reused files instead of copying them. The builds then share those files."""
+    reused_files: int = 0
+    reused_size: int = 0
+
+    def find(self, relative: str | Path, size: int) -> Path | None:
+        """The old copy of ``relative`` if it is a regular file of ``size`` bytes."""
+        old = self.root / relative
+        try:
+            st = old.stat()
+        except (OSError, ValueError):
+            return None
+        return old if stat.S_ISREG(st.st_mode) and st.st_size == size else None
+
+    def reuse(self, old: Path, target: Path, mode: int | None = None) -> bool:
+        """
+        Put a copy of ``old`` at ``target``.
+
+        Args:
+            mode: The permissions ``target`` gets. The file is only linked if ``old`` already has them, because
+                linked files share their metadata.
+
+        Returns:
+            True if ``target`` was linked to ``old`` and must not be chmodded or touched.
+        """
+        target.unlink(missing_ok=True)
+        if self.hardlink and (mode is None or stat.S_IMODE(old.stat().st_mode) == mode):
+            os.link(old, target)
+            return True
+        if not reflink(old, target):
+            shutil.copyfile(old, target)
+        return False
+
+
+def _crc32(path: Path) -> int:
+    crc = 0
+    with path.open("rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+def _reuse_zip_members(plan: ZipPlan, build_root: Path, delta: DeltaSource) -> int:
+    """
+    Copy members whose size and CRC match the old build, and drop them from ``plan``.
+
+    Returns the uncompressed size of the reused members.
+    """
+    plan.make_directories()
+
+    def try_reuse(job: tuple[zipfile.ZipInfo, Path]) -> bool:
+        info, target = job
+        try:
+            old = delta.find(target.relative_to(build_root), info.file_size)
+            if old is None or _crc32(old) != info.CRC:
+                return False
+            delta.reuse(old, target)
+        except (OSError, ValueError):
+            return False
+        return True
+
+    # Reading and copying is I/O bound, zlib releases the GIL while hashing
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) + 4)) as pool:
+        reused = list(pool.map(try_reuse, plan.files))
+
+    reused_jobs = [job for job, ok in zip(plan.files, reused, strict=True) if ok]
+    plan.files = [job for job, ok in zip(plan.files, reused, strict=True) if not ok]
+
+    delta.reused_files += len(reused_jobs)
+    delta.reused_size += sum(info.file_size for info, _ in reused_jobs)
+    return sum(info.file_size for info, _ in reused_jobs)
+
+
+def _extract_tar_member_delta(
+    tar: tarfile.TarFile,
+    member: tarfile.TarInfo,
+    destination: Path,
+    delta: DeltaSource,
+    relative: str,
+) -> bool:
+    """
+    Extract a regular file ``member`` by comparing it with the old build.
+
+    Tar headers carry no checksum of the content, so the member is compared with the old file while it is
+    read. An identical file is copied from the old build; otherwise the matching prefix is copied and only
+    the rest is written from the archive.
+
+    Returns:
+        False if the member was not handled and has to be extracted normally.
+    """
+    if not member.isreg():
+        return False
+    # The file is written without tar.extract, so the checks it would do are made here. Raises FilterError for
+    # members that would end up outside of the destination.
+    data_filter = getattr(tarfile, "data_filter", None)
+    if data_filter is None:
+        # Only there from Python 3.11.4, before that the member is extracted normally
+        return False
+    filtered = data_filter(member, str(destination))
+    old = delta.find(relative, member.size)
+    src = tar.extractfile(member) if old is not None else None
+    if old is None or src is None:
+        return False
+
+    target = destination / filtered.name
+    target.parent.mkdir(parents=True, exist_ok=True)
+    linked = False
+    with src, old.open("rb") as old_file:
+        matched = 0
+        while chunk := src.read(CHUNK_SIZE):
+            if old_file.read(len(chunk)) != chunk:
+                break
+            matched += len(chunk)
+        else:
+            linked = delta.reuse(old, target, filtered.mode)
+            delta.reused_files += 1
+            delta.reused_size += member.size
+            chunk = b""
+
+        if chunk:
+            old_file.seek(0)
+            with target.open("wb") as dst:
+                while matched > 0:
+                    data = old_file.read(min(CHUNK_SIZE, matched))
+                    dst.write(data)
+                    matched -= len(data)
+                dst.write(chunk)
+                shutil.copyfileobj(src, dst, CHUNK_SIZE)
+
+    if not linked:
+        tar.chmod(filtered, str(target))
+        tar.utime(filtered, str(target))
+    return True
+
+
+@dataclass(frozen=True)
+class PathRewrite:
+    """
+    Maps archive member names to the place they are extracted to.
+
+    Names under ``strip`` are moved under ``replace``; other names under ``drop`` are skipped.
+    This lets build layouts be fixed while extracting instead of moving trees around afterwards.
+    """
+
+    strip: str
+    replace: str = ""
+    drop: str | None = None
+
+    def apply(self, name: str) -> str | None:
+        slashed = name.rstrip("/") + "/"
+        if slashed.startswith(self.strip):
+            return self.replace + name[len(self.strip) :]
+        if self.drop is not None and slashed.startswith(self.drop):
+            return None
+        return name
+
+
+def _plan_upbge_rewrite(names: list[str], prefix: str) -> PathRewrite | None:
+    """
+    Plan the same fixes as `_fix_upbge_structure` from the member names alone.
+
+    Args:
+        names: Member names of the archive.
+        prefix: The build folder inside the archive (with a trailing slash), or "" for flat archives.
+    """
+    # bin/Release subfolder (daily builds): flatten
+    bin_release = f"{prefix}bin/Release/"
+    if any(n.startswith(bin_release) for n in names):
+        logger.info(f"Flattening UPBGE bin/Release structure under '{prefix}'")
+        return PathRewrite(strip=bin_release, replace=prefix, drop=f"{prefix}bin/")
+
+    # Nested folder (stable builds): unwrap when the executable only exists one level down
+    paths = {n.rstrip("/") for n in names}
+    if f"{prefix}blender.exe" in paths or f"{prefix}blender" in paths:
+        return None
+
+    subdirs = set()
+    for n in names:
+        rest = n[len(prefix) :] if n.startswith(prefix) else ""
+        # A directory either has entries below it or is listed with a trailing slash
+        if "/" in rest.rstrip("/") or rest.endswith("/"):
+            subdirs.add(rest.split("/")[0])
+    if len(subdirs) != 1:
+        return None
+
+    nested = f"{prefix}{next(iter(subdirs))}/"
+    if f"{nested}blender.exe" in paths or f"{nested}blender" in paths:
+        logger.info(f"Unwrapping UPBGE nested folder '{nested}'")
+        return PathRewrite(strip=nested, replace=prefix, drop=prefix)
+    return None
+
+
+def _rewrite_tar_member(member: tarfile.TarInfo, rewrite: PathRewrite) -> bool:
+    """Apply ``rewrite`` to ``member`` in place. Returns False if the member should be skipped."""
+    name = rewrite.apply(member.name)
+    if not name:
+        return False
+    member.name = name
+    if member.islnk():
+        member.linkname = rewrite.apply(member.linkname) or member.linkname
+    return True
+
+
 def _get_build_folder(names: list[str]):
     tops = {n.split("/")[0] for n in names if n and "/" in n}
     folders = {t for t in tops if any(n.startswith(f"{t}/") for n in names)}
@@ -301,11 +646,96 @@ def _fix_upbge_structure(build_path: Path) -> Path:
     return build_path
 
 
+# Extraction happens next to the final location so it can be moved into place with a single rename
+STAGING_PREFIX = ".staging-"
+REPLACED_PREFIX = ".replaced-"
+
+
+def _swap_into_place(staged: Path, final: Path) -> Path | None:
+    """
+    Move ``staged`` to ``final`` with a single rename.
+
+    An existing build at ``final`` is moved aside first and put back if the swap fails.
+
+    Returns:
+        The path the previous build was moved to, or None if there was none.
+    """
+    old = None
+    if final.exists():
+        holder = final.parent / f"{REPLACED_PREFIX}{uuid.uuid4().hex[:8]}"
+        holder.mkdir()
+        old = holder / final.name
+        retry_on_permission_error(final.rename, old)
+
+    try:
+        retry_on_permission_error(staged.rename, final)
+    except Exception:
+        if old is not None:
+            old.rename(final)
+            old.parent.rmdir()
+        raise
+    return old
+
+
+def _remove_later(path: Path):
+    """Hand ``path`` to the reaper."""
+    try:
+        tombstone(path)
+    except OSError as e:
+        logger.warning(f"Failed to remove {path}: {e}")
+
+
+def _trash_replaced(old: Path):
+    """
+    Trash a build that `_swap_into_place` moved aside.
+
+    It's moved out of its hidden folder first, so that restoring it from the trash puts it back into the library
+    under a name of its own, instead of into a folder that is cleaned up at the next start.
+    """
+    holder = old.parent
+    visible = holder.parent / f"{old.name}-replaced"
+    if visible.exists():
+        visible = holder.parent / f"{old.name}-replaced-{holder.name.removeprefix(REPLACED_PREFIX)}"
+    try:
+        retry_on_permission_error(old.rename, visible)
+        holder.rmdir()
+        retry_on_permission_error(send2trash, visible)
+    except OSError as e:
+        logger.warning(f"Failed to trash {old}: {e}")
+
+
+def clean_up_interrupted_extractions(folders: Iterable[Path]):
+    """Remove staging folders and replaced builds left behind by extractions that were interrupted."""
+    for folder in folders:
+        if not folder.is_dir():
+            continue
+        for item in folder.iterdir():
+            if item.name.startswith(STAGING_PREFIX):
+                _remove_later(item)
+            elif item.name.startswith(REPLACED_PREFIX) and item.is_dir():
+                for build in item.iterdir():
+                    _trash_replaced(build)
+                with contextlib.suppress(OSError):
+                    item.rmdir()
+
+
+def _record_disk_usage(build: Path):
+    """Cache the size of a freshly extracted build. Its files were just written, so the walk is quick."""
+    index = get_disk_usage()
+    if build.is_relative_to(index.library_folder):
+        index.record(build)
+        index.save()
+
+
 @dataclass
 class ExtractTask(Task):
     file: Path
     destination: Path
     is_upbge: bool = False
+    staged: bool = True
+    """Extract next to the destination and swap the result into place. Otherwise extract directly over it."""
+    reuse_from: Path | None = None
+    """An installed build to copy unchanged files from, when updating it"""
 
     progress = Signal(int, int)
     finished = Signal(Path, bool)
@@ -325,25 +755,65 @@ class ExtractTask(Task):
             retry_on_permission_error(self.file.unlink)
 
     def run(self):
-        is_removed = False
         try:
-            if (self.destination / self.file.stem).exists():
-                is_removed = True
-                retry_on_permission_error(send2trash, self.destination / self.file.stem)
-                logger.debug(f"Removed existing file: {self.destination / self.file.stem}")
+            if self.staged:
+                self._run_staged()
+            else:
+                self._run_in_place()
+        except (zipfile.BadZipFile, tarfile.TarError, DecompressionError) as e:
+            self._handle_extraction_error(e)
+        except Exception as e:
+            # py7zr is only imported once a 7z archive is extracted
+            py7zr = sys.modules.get("py7zr")
+            self._handle_extraction_error(e, use_exception_log=py7zr is None or not isinstance(e, py7zr.Bad7zFile))
 
-            result = extract(self.file, self.destination, self.progress.emit)
+    def _run_staged(self):
+        staging = self.destination / f"{STAGING_PREFIX}{uuid.uuid4().hex[:8]}"
+        try:
+            delta = None
+            if self.reuse_from is not None and self.reuse_from.is_dir():
+                # Dedup users already accept builds sharing files, so linking is fine for them
+                delta = DeltaSource(self.reuse_from, hardlink=get_deduplicate_builds())
+
+            result = extract(self.file, staging, self.progress.emit, self.is_upbge, delta)
             if result is None:
                 raise ValueError(f"Unsupported archive format: {self.file.suffix}")
+            if delta is not None:
+                logger.info(
+                    f"Reused {delta.reused_files} unchanged files ({delta.reused_size / 1024**2:.1f} MB) "
+                    f"from {self.reuse_from}"
+                )
+
+            final = self.destination / result.relative_to(staging)
+            old = _swap_into_place(result, final)
+            _record_disk_usage(final)
+            if old is not None:
+                logger.debug(f"Replaced existing build: {final}")
+        finally:
+            if staging.exists():
+                try:
+                    staging.rmdir()
+                except OSError:
+                    # Left over from a failed extraction or stray files next to the build folder
+                    _remove_later(staging)
 
-            # Fix UPBGE structure if needed
-            if self.is_upbge:
-                result = _fix_upbge_structure(result)
-            self.finished.emit(result, is_removed)
-        except (zipfile.BadZipFile, tarfile.TarError, py7zr.Bad7zFile) as e:
-            self._handle_extraction_error(e)
-        except Exception as e:
-            self._handle_extraction_error(e, use_exception_log=True)
+        self.finished.emit(final, old is not None)
+        if old is not None:
+            # Trashing a whole build takes a while, and the new one can be used meanwhile
+            threading.Thread(target=_trash_replaced, args=(old,), name="Trash replaced build", daemon=True).start()
+
+    def _run_in_place(self):
+        is_removed = False
+        if (self.destination / self.file.stem).exists():
+            is_removed = True
+            retry_on_permission_error(send2trash, self.destination / self.file.stem)
+            logger.debug(f"Removed existing file: {self.destination / self.file.stem}")
+
+        result = extract(self.file, self.destination, self.progress.emit, self.is_upbge)
+        if result is None:
+            raise ValueError(f"Unsupported archive format: {self.file.suffix}")
+        _record_disk_usage(result)
+        self.finished.emit(result, is_removed)
 
     def __str__(self):
         return f"Extract {self.file} to {self.destination}"
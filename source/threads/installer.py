@@ -0,0 +1,180 @@
+"""
+Installing builds without the main window.
+
+The download widget installs a build by chaining tasks through the task queue: download, extract, copy the
+template, read the build info and rename the folder. `install_build` runs the same tasks one after the other on the
+calling thread, for the command line. Builds don't share anything while they are installed, so several of them can
+be installed side by side from a thread pool.
+"""
+
+from __future__ import annotations
+
+import logging
+import shutil
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from modules.build_info import BuildInfo, parse_blender_ver
+from modules.enums import MessageType
+from modules.platform_utils import get_platform
+from modules.settings import get_deduplicate_builds, get_install_template, get_library_folder
+from PySide6.QtCore import Qt
+from semver import Version
+from threads.build_info_tasks import ReadBuildTask
+from threads.deduplicator import DedupTask
+from threads.downloader import DownloadTask
+from threads.extractor import ExtractTask
+from threads.renamer import RenameTask
+from threads.template_installer import TemplateTask
+
+if TYPE_CHECKING:
+    from modules.connection_manager import ConnectionManager
+    from modules.task import Task
+    from PySide6.QtCore import SignalInstance
+
+logger = logging.getLogger()
+
+
+class TaskFailed(Exception):
+    """A task returned without its result. The message is the last error the task reported."""
+
+
+def run_task(task: Task, result: SignalInstance) -> tuple:
+    """
+    Run ``task`` on the calling thread.
+
+    Returns:
+        The arguments ``result`` was emitted with.
+
+    Raises:
+        TaskFailed: If ``task`` raised or returned without emitting ``result``.
+    """
+    emitted: list[tuple] = []
+    errors: list[str] = []
+    # A queued connection would wait for an event loop, which the command line doesn't run
+    result.connect(lambda *args: emitted.append(args), Qt.ConnectionType.DirectConnection)
+    task.message.connect(
+        lambda message, message_type: errors.append(message) if message_type == MessageType.ERROR else None,
+        Qt.ConnectionType.DirectConnection,
+    )
+    try:
+        task.run()
+    except Exception as e:
+        raise TaskFailed(f"{task} failed: {e}") from e
+    if not emitted:
+        raise TaskFailed(errors[-1] if errors else f"{task} failed")
+    return emitted[0]
+
+
+def library_destination(branch: str) -> Path:
+    """The library folder builds of ``branch`` are extracted to."""
+    library_folder = Path(get_library_folder())
+    if branch in ("stable", "lts"):
+        return library_folder / "stable"
+    if branch in ("daily", "bforartists", "upbge-stable", "upbge-weekly"):
+        return library_folder / branch
+    return library_folder / "experimental"
+
+
+def archive_name(link: str) -> str:
+    """The name of the archive ``link`` points to, without its extensions."""
+    if get_platform() == "Linux":
+        # .tar.xz
+        return Path(link).with_suffix("").stem
+    return Path(link).stem
+
+
+def installed_build_info(build: BuildInfo, build_dir: Path) -> BuildInfo:
+    """The build info to complete from the executable of ``build``, extracted to ``build_dir``."""
+    if build.branch == "upbge-weekly":
+        ver = parse_blender_ver(build.subversion)
+    else:
+        # If the returned version from the executable is invalid it might break loading.
+        ver_ = parse_blender_ver(build_dir.name, search=True)
+        ver = Version(
+            ver_.major,
+            ver_.minor,
+            ver_.patch,
+            prerelease=ver_.prerelease,
+        )
+
+    return BuildInfo(
+        str(build_dir),
+        subversion=str(ver),
+        build_hash=None,
+        commit_time=build.commit_time,
+        branch=build.branch,
+        custom_name=build.custom_name,
+        custom_executable=build.custom_executable,
+    )
+
+
+def move_bforartists_patch_note(build_dir: Path):
+    """Move the patch notes Bforartists archives extract next to the build into the build folder."""
+    bforartist_lib = build_dir.parent
+    txt_files = [f for f in bforartist_lib.glob("*.txt") if f.is_file()]
+    folders = [folder for folder in bforartist_lib.iterdir() if folder.is_dir()]
+
+    for file in txt_files:
+        file_version = ".".join(file.stem[-3:])
+        for folder in folders:
+            if file_version in folder.name:
+                try:
+                    shutil.move(file, folder / file.name)
+                    break
+                except shutil.Error as e:
+                    logger.exception(f"Failed to move {file.name} to {folder.name}: {e}")
+
+
+def download_build(manager: ConnectionManager, build: BuildInfo) -> Path:
+    """
+    Download the archive of ``build`` to the temp folder of the library.
+
+    Raises:
+        TaskFailed: If the download fails.
+    """
+    task = DownloadTask(manager=manager, link=build.link)
+    (archive,) = run_task(task, task.finished)
+    return archive
+
+
+def install_build(manager: ConnectionManager, build: BuildInfo) -> tuple[Path, BuildInfo]:
+    """
+    Download ``build`` and install it into the library, like the download widget does.
+
+    Returns:
+        The folder of the installed build and its build info.
+
+    Raises:
+        TaskFailed: If any of the steps fails. The archive is removed either way.
+    """
+    archive = download_build(manager, build)
+    try:
+        extract = ExtractTask(
+            file=archive,
+            destination=library_destination(build.branch),
+            is_upbge=build.branch.startswith("upbge"),
+        )
+        build_dir, _ = run_task(extract, extract.finished)
+    finally:
+        archive.unlink(missing_ok=True)
+
+    if build.branch == "bforartists":
+        move_bforartists_patch_note(build_dir)
+
+    if get_install_template():
+        template = TemplateTask(destination=build_dir)
+        run_task(template, template.finished)
+
+    read = ReadBuildTask(build_dir, info=installed_build_info(build, build_dir), archive_name=archive_name(build.link))
+    (info,) = run_task(read, read.finished)
+
+    rename = RenameTask(src=build_dir, dst_name=f"blender-{info.full_semversion}")
+    path, _ = run_task(rename, rename.finished)
+
+    if get_deduplicate_builds():
+        dedup = DedupTask(builds=[path])
+        run_task(dedup, dedup.finished)
+
+    logger.info(f"Installed {build.link} to {path}")
+    return path, info
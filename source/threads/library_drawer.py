@@ -4,8 +4,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from modules.platform_utils import get_platform
-from modules.settings import build_library_folders, get_library_folder
+from modules.library_index import get_blender_builds, read_library_index
+from modules.settings import build_library_folders
 from modules.task import Task
 from PySide6.QtCore import Signal
 
@@ -13,61 +13,6 @@ if TYPE_CHECKING:
     from collections.abc import Iterable
 
 
-def get_blender_builds(folders: Iterable[str | Path]) -> Iterable[tuple[Path, bool]]:
-    """Finds blender builds in the library folder, given the subfolders to search in
-
-    Parameters
-    ----------
-    folders : Iterable[str  |  Path]
-        subfolders to search
-
-    Returns
-    -------
-    Iterable[tuple[Path, bool]]
-        an iterable of found builds and whether they're recognized as valid Blender builds
-    """
-
-    library_folder = get_library_folder()
-    platform = get_platform()
-
-    blender_exe = {
-        "Windows": "blender.exe",
-        "Linux": "blender",
-        "macOS": "Blender/Blender.app/Contents/MacOS/Blender",
-    }.get(platform, "blender")
-
-    # Standard executable paths for different platforms
-    bforartists_exe = {
-        "Windows": "bforartists.exe",
-        "Linux": "bforartists",
-        "macOS": "Bforartists/Bforartists.app/Contents/MacOS/Bforartists",
-    }.get(platform, "bforartists")
-
-    for folder in folders:
-        path = library_folder / folder
-        if path.is_dir():
-            for build in path.iterdir():
-                if build.is_dir():
-                    # Check for .blinfo file or executables
-                    has_blinfo = (folder / build / ".blinfo").is_file()
-                    has_blender_exe = (path / build / blender_exe).is_file()
-                    has_bforartists_exe = (path / build / bforartists_exe).is_file()
-                    # UPBGE uses the same executable name as Blender
-                    has_upbge_exe = (path / build / blender_exe).is_file()
-
-                    # Also check for macOS DMG extraction format (.app directly at root)
-                    if platform == "macOS":
-                        if not has_bforartists_exe:
-                            has_bforartists_exe = (path / build / "Bforartists.app").is_dir()
-                        if not has_blender_exe:
-                            has_blender_exe = (path / build / "Blender.app").is_dir()
-
-                    yield (
-                        folder / build,
-                        has_blinfo or has_blender_exe or has_bforartists_exe or has_upbge_exe,
-                    )
-
-
 @dataclass
 class DrawLibraryTask(Task):
     folders: Iterable[str | Path] = tuple(build_library_folders)
@@ -86,3 +31,19 @@ class DrawLibraryTask(Task):
 
     def __str__(self):
         return f"Draw libraries {self.folders}"
+
+
+@dataclass
+class LibraryIndexTask(Task):
+    """Read the builds of the library through the library index, bringing it up to date."""
+
+    verify: bool = False
+    """Check every ``.blinfo``, to catch ones changed outside of the launcher"""
+    finished = Signal(list)
+    """The builds with their build info"""
+
+    def run(self):
+        self.finished.emit(read_library_index(verify=self.verify))
+
+    def __str__(self):
+        return "Refresh library index"
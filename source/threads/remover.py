@@ -1,8 +1,28 @@
+"""
+Removal of builds and temporary files.
+
+Removing a Blender build means unlinking tens of thousands of files, which is far too slow to do while the UI
+waits. Instead, whatever is removed is first renamed into a tombstone in the ``.trash-pending`` folder of the
+library, which is instant. The `Reaper` then deletes tombstones on a low priority background thread, and picks
+up anything left over from a previous session when the launcher starts.
+
+Builds sent to the system trash skip the tombstone, so that restoring them puts them back into the library.
+"""
+
+from __future__ import annotations
+
 import logging
+import os
+import stat
+import sys
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from shutil import rmtree
 
+from modules.file_utils import retry_on_permission_error
 from modules.settings import get_library_folder
 from modules.task import Task
 from PySide6.QtCore import Signal
@@ -10,6 +30,166 @@ from send2trash import send2trash
 
 logger = logging.getLogger()
 
+TOMBSTONE_FOLDER = ".trash-pending"
+# Tombstones are only reaped while they contain this marker, so a folder that
+# merely ends up in the tombstone folder is never deleted by accident
+TOMBSTONE_MARKER = ".reap"
+
+_UNLINK_WORKERS = 8
+
+
+def tombstone_folder() -> Path:
+    return Path(get_library_folder()) / TOMBSTONE_FOLDER
+
+
+def tombstone(path: Path) -> Path:
+    """
+    Move ``path`` into a new tombstone and wake up the reaper, which deletes it.
+
+    Args:
+        path: File or folder to remove. It must be on the same filesystem as the library.
+
+    Returns:
+        The new location of ``path``.
+
+    Raises:
+        OSError: If ``path`` cannot be renamed, e.g. because it is on another filesystem.
+    """
+    tomb = tombstone_folder() / uuid.uuid4().hex
+    tomb.mkdir(parents=True)
+    (tomb / TOMBSTONE_MARKER).touch()
+
+    target = tomb / path.name
+    try:
+        retry_on_permission_error(path.rename, target)
+    except OSError:
+        rmtree(tomb, ignore_errors=True)
+        raise
+
+    logger.debug(f"Moved {path} to {target}")
+    get_reaper().wake()
+    return target
+
+
+def _unlink(path: str):
+    try:
+        os.unlink(path)
+    except PermissionError:
+        # Read-only files can't be deleted on Windows
+        os.chmod(path, stat.S_IWRITE)
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def parallel_rmtree(root: Path, workers: int = _UNLINK_WORKERS):
+    """
+    Delete ``root`` with a bottom-up walk, unlinking files on a thread pool.
+
+    Unlinking is syscall bound and releases the GIL, so several threads keep the filesystem busy.
+    Directories are removed deepest first once all files are gone.
+    """
+    if root.is_symlink() or not root.is_dir():
+        _unlink(str(root))
+        return
+
+    directories: list[str] = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = []
+        for dirpath, dirnames, filenames in os.walk(root, topdown=False):
+            paths = [os.path.join(dirpath, f) for f in filenames]
+            # os.walk lists symlinks to directories as directories without descending into them
+            paths += [p for d in dirnames if os.path.islink(p := os.path.join(dirpath, d))]
+            if paths:
+                futures.append(pool.submit(lambda paths: [_unlink(p) for p in paths], paths))
+            directories.append(dirpath)
+        for future in futures:
+            future.result()
+
+    for directory in directories:
+        os.rmdir(directory)
+
+
+def _lower_thread_priority():
+    try:
+        if sys.platform == "win32":
+            import ctypes
+
+            THREAD_MODE_BACKGROUND_BEGIN = 0x00010000
+            kernel32 = ctypes.windll.kernel32  # type: ignore[attr-defined]
+            kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_MODE_BACKGROUND_BEGIN)
+        elif sys.platform == "linux":
+            # On Linux, niceness is per thread
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 10)
+    except (OSError, AttributeError) as e:
+        logger.debug(f"Could not lower reaper priority: {e}")
+
+
+class Reaper:
+    """Deletes tombstones on a background thread that exits once there is nothing left to do."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.idle = threading.Event()
+        self.idle.set()
+
+    def wake(self):
+        with self._lock:
+            self._wake.set()
+            self.idle.clear()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="Reaper", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        _lower_thread_priority()
+        try:
+            while True:
+                self._wake.clear()
+                self.reap_all()
+                with self._lock:
+                    if not self._wake.is_set():
+                        self._stop()
+                        return
+        except Exception:
+            # Whatever is left is retried on the next wake or startup
+            logger.exception("Reaper failed")
+        finally:
+            # Also when reaping failed, so that the next wake starts a new thread and nobody waits for idle forever
+            with self._lock:
+                if self._thread is threading.current_thread():
+                    self._stop()
+
+    def _stop(self):
+        self._thread = None
+        self.idle.set()
+
+    def reap_all(self):
+        folder = tombstone_folder()
+        if not folder.is_dir():
+            return
+
+        for tomb in sorted(folder.iterdir()):
+            if (tomb / TOMBSTONE_MARKER).is_file():
+                self.reap(tomb)
+
+    def reap(self, tomb: Path):
+        try:
+            parallel_rmtree(tomb)
+            logger.debug(f"Reaped {tomb}")
+        except OSError as e:
+            # Something still holds a file open; retried on the next wake or startup
+            logger.warning(f"Failed to reap {tomb}: {e}")
+
+
+_reaper = Reaper()
+
+
+def get_reaper() -> Reaper:
+    return _reaper
+
 
 def purge_temp_folder():
     """Purge all files in the temp folder."""
@@ -17,10 +197,7 @@ def purge_temp_folder():
     if temp_folder.exists() and temp_folder.is_dir():
         try:
             for item in temp_folder.iterdir():
-                if item.is_file():
-                    item.unlink()
-                elif item.is_dir():
-                    rmtree(item)
+                tombstone(item)
             return True
         except Exception:
             return False
@@ -39,18 +216,87 @@ class RemovalTask(Task):
                 self.finished.emit(0)
                 logger.info(f"Path {self.path} does not exist, nothing to remove.")
                 return
+
             if self.trash:
+                # Restoring it from the trash puts it back into the library
                 send2trash(self.path)
-            else:
-                if self.path.is_dir():
-                    rmtree(self.path)
-                else:
-                    self.path.unlink()
+                self.finished.emit(0)
+                return
+
+            try:
+                tombstone(self.path)
+            except OSError as e:
+                logger.warning(f"Could not move {self.path} to {TOMBSTONE_FOLDER}, removing in place: {e}")
+                self._remove_in_place()
 
             self.finished.emit(0)
         except OSError:
             self.finished.emit(1)
             raise
 
+    def _remove_in_place(self):
+        if self.path.is_dir():
+            rmtree(self.path)
+        else:
+            self.path.unlink()
+
     def __str__(self):
         return f"Remove {self.path}"
+
+
+@dataclass
+class BulkRemovalTask(Task):
+    """Remove several builds at once, reporting aggregate progress and a single result."""
+
+    paths: list[Path]
+    trash: bool = True
+    progress = Signal(int, int)
+    finished = Signal(list, list)
+    """Paths that were removed and paths that could not be removed"""
+
+    def run(self):
+        removed: list[Path] = []
+        failed: list[Path] = []
+        in_place: list[Path] = []
+        total = len(self.paths)
+
+        # Renaming into a tombstone is instant and the reaper deletes in the background. Builds sent to the
+        # trash aren't tombstoned, so that restoring them puts them back into the library.
+        for path in self.paths:
+            if self.trash and path.exists():
+                in_place.append(path)
+                continue
+            try:
+                if path.exists():
+                    tombstone(path)
+                removed.append(path)
+            except OSError as e:
+                logger.warning(f"Could not move {path} to {TOMBSTONE_FOLDER}, removing in place: {e}")
+                in_place.append(path)
+            self.progress.emit(len(removed), total)
+
+        # The rest is removed in place; unlinking and trashing are syscall bound, so builds are removed side by side
+        if in_place:
+            with ThreadPoolExecutor(max_workers=min(len(in_place), 4)) as pool:
+                futures = {pool.submit(self._remove_in_place, path): path for path in in_place}
+                for future, path in futures.items():
+                    try:
+                        future.result()
+                        removed.append(path)
+                    except OSError as e:
+                        logger.error(f"Failed to remove {path}: {e}")
+                        failed.append(path)
+                    self.progress.emit(len(removed) + len(failed), total)
+
+        self.finished.emit(removed, failed)
+
+    def _remove_in_place(self, path: Path):
+        if self.trash:
+            send2trash(path)
+        elif path.is_dir():
+            parallel_rmtree(path)
+        else:
+            path.unlink()
+
+    def __str__(self):
+        return f"Remove {len(self.paths)} builds"
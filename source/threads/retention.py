@@ -0,0 +1,245 @@
+"""
+Retention policy for the build library.
+
+Automatically downloaded builds (daily, experimental and patch builds, UPBGE weekly) stay in the library until
+they are removed by hand. The retention policy picks builds to remove by count per branch and minor version,
+by age and by total size. Favorites, frozen builds, the quick launch build and running builds are never removed,
+and neither is anything in the stable, Bforartists, UPBGE or custom folders.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sys
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from enum import Enum
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from modules.build_info import BuildInfo
+from modules.library_index import get_blender_builds
+from modules.settings import (
+    get_favorite_path,
+    get_retention_keep_newest,
+    get_retention_max_age,
+    get_retention_max_size,
+)
+from modules.task import Task
+from PySide6.QtCore import Signal
+from threads.disk_usage import folder_size, get_disk_usage
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+logger = logging.getLogger()
+
+RETENTION_FOLDERS = ("daily", "experimental", "upbge-weekly")
+# Removals are queued in batches so the library list updates as the cleanup goes
+RETENTION_BATCH_SIZE = 10
+
+_lock = threading.Lock()
+
+
+class RetentionReason(Enum):
+    """Why a build is removed. Values are the keys of the reasons in ``msg.popup.retention``."""
+
+    NEWEST = "newest"
+    AGE = "age"
+    SIZE = "size_limit"
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    keep_newest: int = 0
+    """Builds to keep per folder, branch and minor version. 0 disables the rule."""
+    max_age_days: int = 0
+    """Remove builds that were committed and installed longer ago. 0 disables the rule."""
+    max_total_size: int = 0
+    """Size in bytes the builds covered by the policy may take up. 0 disables the rule."""
+
+    @classmethod
+    def from_settings(cls) -> RetentionPolicy:
+        return cls(
+            keep_newest=get_retention_keep_newest(),
+            max_age_days=get_retention_max_age(),
+            max_total_size=get_retention_max_size() * 1024**3,
+        )
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.keep_newest or self.max_age_days or self.max_total_size)
+
+
+@dataclass
+class RetentionPlan:
+    remove: list[tuple[Path, RetentionReason]] = field(default_factory=list)
+    kept: int = 0
+    freed_bytes: int | None = None
+    """Known only when the size rule is active"""
+
+    @property
+    def paths(self) -> list[Path]:
+        return [path for path, _ in self.remove]
+
+    def batches(self, size: int = RETENTION_BATCH_SIZE) -> list[list[Path]]:
+        paths = self.paths
+        return [paths[i : i + size] for i in range(0, len(paths), size)]
+
+
+def _aware(dt: datetime) -> datetime:
+    # Older .blinfo files may hold naive local times
+    return dt if dt.tzinfo is not None else dt.astimezone()
+
+
+def installed_at(path: Path) -> datetime | None:
+    """When the build at ``path`` was installed, which is when its build info was last written."""
+    try:
+        return datetime.fromtimestamp((path / ".blinfo").stat().st_mtime, tz=UTC)
+    except OSError:
+        return None
+
+
+def running_builds(paths: Iterable[Path]) -> set[Path]:
+    """
+    The builds of ``paths`` that have a running process, wherever it was started from.
+
+    Only known on Linux. Elsewhere, the main window passes the builds it launched itself to `RetentionTask`, and
+    Windows refuses to remove the executable of a running build anyway.
+    """
+    if sys.platform != "linux":
+        return set()
+
+    builds = {path.resolve(): path for path in paths}
+    running = set()
+    for process in Path("/proc").iterdir():
+        try:
+            exe = Path(os.readlink(process / "exe"))
+        except OSError:
+            # Not a process, gone already or owned by someone else
+            continue
+        running.update(builds[parent] for parent in exe.parents if parent in builds)
+    return running
+
+
+def plan_retention(
+    builds: Iterable[tuple[Path, BuildInfo]],
+    policy: RetentionPolicy,
+    protected: set[Path] | None = None,
+    now: datetime | None = None,
+    size_of: Callable[[Path], int] = folder_size,
+    installed: Callable[[Path], datetime | None] = installed_at,
+) -> RetentionPlan:
+    """
+    Pick the builds ``policy`` removes.
+
+    Rules are applied in order: count per folder, branch and minor version, then age, then total size, which
+    removes the oldest remaining builds first. Protected, favorite and frozen builds count towards the limits
+    but are never removed. Builds whose version can't be parsed are left alone.
+
+    A build is as old as the later of its commit and its installation, so an old build that was just installed
+    isn't removed by the age rule right away.
+    """
+    protected = protected or set()
+    now = now or datetime.now(tz=UTC)
+    plan = RetentionPlan()
+    removed: set[Path] = set()
+
+    def remove(path: Path, reason: RetentionReason):
+        removed.add(path)
+        plan.remove.append((path, reason))
+
+    groups: dict[tuple, list[tuple[Path, BuildInfo]]] = defaultdict(list)
+    for path, info in builds:
+        try:
+            version = info.semversion
+        except ValueError:
+            continue
+        groups[(path.parent.name, info.branch, version.major, version.minor)].append((path, info))
+
+    def removable(path: Path, info: BuildInfo) -> bool:
+        return path not in protected and not info.is_favorite and not info.is_frozen and path not in removed
+
+    candidates: list[tuple[Path, BuildInfo]] = []
+    for group in groups.values():
+        group.sort(key=lambda build: _aware(build[1].commit_time), reverse=True)
+        candidates.extend(group)
+        if policy.keep_newest:
+            for path, info in group[policy.keep_newest :]:
+                if removable(path, info):
+                    remove(path, RetentionReason.NEWEST)
+
+    if policy.max_age_days:
+        cutoff = now - timedelta(days=policy.max_age_days)
+        for path, info in candidates:
+            if not removable(path, info) or _aware(info.commit_time) >= cutoff:
+                continue
+            installed_time = installed(path)
+            if installed_time is None or installed_time < cutoff:
+                remove(path, RetentionReason.AGE)
+
+    if policy.max_total_size:
+        sizes = {path: size_of(path) for path, _ in candidates}
+        plan.freed_bytes = sum(sizes[path] for path in removed)
+        total = sum(sizes.values()) - plan.freed_bytes
+        for path, info in sorted(candidates, key=lambda build: _aware(build[1].commit_time)):
+            if total <= policy.max_total_size:
+                break
+            if removable(path, info):
+                remove(path, RetentionReason.SIZE)
+                total -= sizes[path]
+                plan.freed_bytes += sizes[path]
+
+    plan.kept = len(candidates) - len(removed)
+    return plan
+
+
+def read_library_builds(folders: Iterable[str] = RETENTION_FOLDERS) -> list[tuple[Path, BuildInfo]]:
+    """Builds of ``folders`` with their stored build info. Builds without a readable ``.blinfo`` are skipped."""
+    builds = []
+    for path, recognized in get_blender_builds(folders):
+        if not recognized:
+            continue
+        try:
+            with (path / ".blinfo").open(encoding="utf-8") as f:
+                data = json.load(f)
+            builds.append((path, BuildInfo.from_dict(path.as_posix(), data["blinfo"][0])))
+        except (OSError, ValueError, KeyError, IndexError) as e:
+            logger.debug(f"Skipping {path} for retention: {e}")
+    return builds
+
+
+@dataclass
+class RetentionTask(Task):
+    """Plan the removals of the retention policy. Removing the builds is up to the receiver of ``planned``."""
+
+    dry_run: bool = False
+    policy: RetentionPolicy | None = None
+    running: frozenset[Path] = frozenset()
+    """Builds the caller knows to be running. They are kept, like builds `running_builds` finds."""
+    planned = Signal(object, bool)
+    """The `RetentionPlan` and whether this was a dry run"""
+
+    def run(self):
+        policy = self.policy or RetentionPolicy.from_settings()
+        if policy.is_empty:
+            self.planned.emit(RetentionPlan(), self.dry_run)
+            return
+
+        disk_usage = get_disk_usage()
+        with _lock:
+            builds = read_library_builds()
+            protected = {Path(p) for p in [get_favorite_path()] if p}
+            protected |= self.running | running_builds(path for path, _ in builds)
+            plan = plan_retention(builds, policy, protected, size_of=disk_usage.size)
+        disk_usage.save()
+
+        logger.info(f"Retention policy {'would remove' if self.dry_run else 'removes'} {len(plan.remove)} builds")
+        self.planned.emit(plan, self.dry_run)
+
+    def __str__(self):
+        return "Plan library retention" + (" (dry run)" if self.dry_run else "")
@@ -29,6 +29,8 @@ from threads.scraping.stable import ScraperStable
 from threads.scraping.upbge import ScraperUpbgeStable, ScraperUpbgeWeekly
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
     from modules.connection_manager import ConnectionManager
     from threads.scraping.base import BuildScraper
 
@@ -46,7 +48,8 @@ class Scraper(QThread):
         self.parent = parent
         self.manager = man
         self.build_cache = build_cache
-        self.current_version = parent.version
+        # Without a parent, e.g. from the command line, only the builds are scraped
+        self.current_version = parent.version if parent is not None else None
 
         self.last_time_checked = get_last_time_checked_utc()
         self.finished.connect(self.update_last_time_checked)
@@ -98,14 +101,13 @@ class Scraper(QThread):
             scrapers.append(self.scraper_upbge_weekly)
         return scrapers
 
-    def get_download_links(self):
-        ss = self.scrapers()
-
-        for build in chain(*(s.scrape() for s in ss)):
+    def builds(self) -> Iterator[BuildInfo]:
+        """Builds of the enabled scrapers that run on this platform."""
+        for build in chain(*(s.scrape() for s in self.scrapers())):
             # Filter out builds that don't match the current platform for Windows
             if self.platform.lower() == "windows":
                 if self.architecture == "arm64" and "arm64" in build.link:
-                    self.links.emit(build)
+                    yield build
                     continue
                 if self.architecture == "amd64" and (
                     ("x64" in build.link or "windows64" in build.link)
@@ -113,14 +115,17 @@ class Scraper(QThread):
                     or "bforartists" in build.link.lower()
                     or "upbge" in build.link.lower()
                 ):
-                    self.links.emit(build)
+                    yield build
                     continue
 
                 logger.debug(f"Skipping {build.link} as it doesn't match the current platform")
 
             else:
-                self.links.emit(build)
-                continue
+                yield build
+
+    def get_download_links(self):
+        for build in self.builds():
+            self.links.emit(build)
 
     def scrape_daily_releases(self):
         b = "daily"
@@ -12,11 +12,12 @@ from modules.platform_utils import bfa_cache_path, get_platform
 from modules.scraper_cache import ScraperCache
 from semver import Version
 from threads.scraping.base import BuildScraper
-from webdav4.client import Client
 
 if TYPE_CHECKING:
     from collections.abc import Generator
 
+    from webdav4.client import Client
+
 logger = logging.getLogger()
 
 # NC: NextCloud
@@ -53,6 +54,8 @@ class ScraperBfa(BuildScraper):
         self.cache = ScraperCache.from_file_or_default(self.cache_path)
 
     def scrape(self) -> Generator[BuildInfo, None, None]:
+        from webdav4.client import Client
+
         client = Client(BFA_NC_WEBDAV_URL, auth=(BFA_NC_WEBDAV_SHARE_TOKEN, ""))
         cache_modified = False
         for entry in client.ls("", detail=True, allow_listing_resource=True):
@@ -6,7 +6,6 @@ import json
 import logging
 from typing import TYPE_CHECKING
 
-import distro
 from modules.bl_api_manager import (
     dropdown_blender_version,
     lts_blender_version,
@@ -57,6 +56,8 @@ def get_tag(
         platform = get_platform()
 
         if platform.lower() == "linux":
+            import distro
+
             for key in (
                 distro.id().title(),
                 distro.like().title(),
@@ -9,9 +9,6 @@ from pathlib import Path
 from typing import TYPE_CHECKING
 from urllib.parse import urljoin
 
-import dateparser
-from bs4 import BeautifulSoup
-from bs4.filter import SoupStrainer
 from modules.build_info import BuildInfo, parse_blender_ver
 from modules.platform_utils import get_architecture, get_platform, stable_cache_path
 from modules.scraper_cache import ScraperCache
@@ -56,6 +53,10 @@ class ScraperStable(BuildScraper):
             yield from self.scrape_stable_releases(platform)
 
     def scrape_stable_releases(self, platform=None):
+        # Both are slow to import and only needed once the scraper runs
+        import dateparser
+        from bs4 import BeautifulSoup
+
         # Use for cache building only
         if self.force_build_cache and platform is not None:
             self.platform = platform
@@ -191,6 +192,9 @@ class ScraperStable(BuildScraper):
 
         content = r.data
 
+        from bs4 import BeautifulSoup
+        from bs4.filter import SoupStrainer
+
         soup_stainer = SoupStrainer("a", href=True)
         soup = BeautifulSoup(content, "lxml", parse_only=soup_stainer)
 
@@ -204,6 +208,8 @@ class ScraperStable(BuildScraper):
         r.close()
 
     def new_blender_build(self, tag, url, content):
+        import dateparser
+
         link = urljoin(url, tag["href"]).rstrip("/")
 
         # Get commit time from content instead of creating a new request for each build
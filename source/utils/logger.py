@@ -3,6 +3,7 @@ import logging.handlers
 import re
 import sys
 from pathlib import Path
+from typing import TextIO
 
 # Color codes for terminal output
 LOG_COLORS = {
@@ -73,8 +74,9 @@ def setup_logging(
     max_bytes: int = 1 * 1024 * 1024,  # 1 MB
     backup_count: int = 2,
     format_string: str = "[%(asctime)s:%(levelname)s] %(message)s",
+    console: TextIO | None = None,
 ) -> None:
-    """Setup logging configuration for the application."""
+    """Setup logging configuration for the application. The console log goes to ``console``, stdout by default."""
 
     numeric_level = getattr(logging, level.upper(), logging.INFO)
     file_formatter = logging.Formatter(format_string)
@@ -92,7 +94,7 @@ def setup_logging(
         file_handler.setFormatter(file_formatter)
         file_handler.addFilter(sensitive_filter)
 
-    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler = logging.StreamHandler(console or sys.stdout)
     console_handler.setFormatter(console_formatter)
     console_handler.addFilter(sensitive_filter)
 
@@ -13,7 +13,6 @@ from PySide6.QtCore import Qt
 from PySide6.QtGui import QAction, QDesktopServices
 from PySide6.QtWidgets import QWidget
 from threads.scraping.bfa import BFA_NC_WEBDAV_SHARE_TOKEN, BFA_NC_WEBDAV_URL, get_bfa_nc_https_download_url
-from webdav4.client import Client
 from widgets.base_menu_widget import BaseMenuWidget
 
 if TYPE_CHECKING:
@@ -33,11 +32,29 @@ class BaseBuildWidget(QWidget):
         self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.customContextMenuRequested.connect(self.context_menu)
 
-        self.menu = BaseMenuWidget(parent=self)
-        self.menu.setFont(Fonts.get().font_10)
+        # Lists can hold thousands of rows and few of them ever open their menu, so it's created on first use
+        self._menu: BaseMenuWidget | None = None
+        self._show_release_notes_action: QAction | None = None
 
-        self.showReleaseNotesAction = QAction(t("act.a.release_notes"))
-        self.showReleaseNotesAction.triggered.connect(self.show_release_notes)
+        # Rows that create their child widgets on first show set this to False, see `create_ui`
+        self.ui_created = True
+
+    def create_ui(self) -> None:
+        """Create the child widgets of the row. Called by the list once the row is first scrolled into view."""
+
+    @property
+    def menu(self) -> BaseMenuWidget:
+        if self._menu is None:
+            self._menu = BaseMenuWidget(parent=self)
+            self._menu.setFont(Fonts.get().font_10)
+        return self._menu
+
+    @property
+    def showReleaseNotesAction(self) -> QAction:
+        if self._show_release_notes_action is None:
+            self._show_release_notes_action = QAction(t("act.a.release_notes"))
+            self._show_release_notes_action.triggered.connect(self.show_release_notes)
+        return self._show_release_notes_action
 
     @abc.abstractmethod
     def context_menu(self) -> None:
@@ -57,6 +74,8 @@ class BaseBuildWidget(QWidget):
             QDesktopServices.openUrl(f"https://www.blender.org/download/lts/#lts-release-{v}")
         elif self.build_info.branch == "bforartists":
             ver = self.build_info.semversion
+            from webdav4.client import Client
+
             client = Client(BFA_NC_WEBDAV_URL, auth=(BFA_NC_WEBDAV_SHARE_TOKEN, ""))
             try:
                 entries = client.ls(
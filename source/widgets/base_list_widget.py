@@ -1,23 +1,42 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import TYPE_CHECKING, Generic, TypeVar, cast
+from typing import TYPE_CHECKING, Generic, TypeVar
 
-from modules.version_matcher import BasicBuildInfo, VersionSearchQuery
-from PySide6.QtCore import Qt, Signal
-from PySide6.QtWidgets import QAbstractItemView, QFrame, QListWidget, QListWidgetItem
+from modules.build_info import parse_blender_ver
+from modules.version_matcher import BasicBuildInfo, BuildIndex, FuzzySearchIndex, QueryFilter, VersionSearchQuery
+from PySide6.QtCore import QItemSelectionModel, QPoint, Qt, QTimer, Signal
+from PySide6.QtWidgets import QAbstractItemView, QFrame, QListView, QWidget
 from widgets.base_build_widget import BaseBuildWidget
+from widgets.build_list_model import BuildItemDelegate, BuildListModel
 from widgets.library_widget import LibraryWidget
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from items.base_list_widget_item import BaseListWidgetItem
     from modules.build_info import BuildInfo
+    from semver import Version
     from widgets.base_page_widget import BasePageWidget
 
 
 _WT = TypeVar("_WT", bound=BaseBuildWidget)
 
+# Filter changes to more rows than this rebuild the rows at once instead of moving them one by one
+_RESET_THRESHOLD = 64
+# Widgets scrolled into view create their children this many at a time, so the list keeps up with input
+_CREATE_BATCH = 8
+
+
+class BaseListWidget(Generic[_WT], QListView):
+    """
+    The builds of a page, one row per build widget.
+
+    The rows are kept in a `BuildListModel` and painted by a `BuildItemDelegate`. Widgets are only shown over the
+    rows in view, and widgets that create their children lazily only do so once they're first scrolled into view,
+    so a page can hold thousands of builds.
+    """
 
-class BaseListWidget(Generic[_WT], QListWidget):
     visible_count_changed = Signal(int)
 
     def __init__(self, parent: BasePageWidget, extended_selection=False):
@@ -27,15 +46,43 @@ class BaseListWidget(Generic[_WT], QListWidget):
         self._old_sorting_order = None
         self.tab_filter = VersionSearchQuery.any()
         self.search_filter = None
+        # Kept across searches so typing into the search bar reuses the work done for the previous keystroke
+        self._fuzzy_index = FuzzySearchIndex()
+        self._filter = QueryFilter(self.tab_filter, fuzzy_index=self._fuzzy_index)
+        self._build_index = BuildIndex(fuzzy_index=self._fuzzy_index)
 
         self.widgets: set[_WT] = set()
         self._binfos_cache: dict[BasicBuildInfo | None, set[_WT]] = {None: set()}
+        self._widget_binfos: dict[_WT, BasicBuildInfo | None] = {}
+        # Indexes for the lookups done for every scraped build, see `_index_widget`
+        self._by_link: dict[Path, set[_WT]] = {}
+        self._by_semversion: dict[Version, set[_WT]] = {}
+        self._by_hash: dict[tuple[str, str], set[_WT]] = {}
+        self._by_version: dict[tuple, set[_WT]] = {}
+        self._index_keys: dict[_WT, tuple[list[Path], Version | None, tuple[str, str] | None, tuple]] = {}
+
+        self._model: BuildListModel[_WT] = BuildListModel(self)
+        self.setModel(self._model)
+        self._delegate = BuildItemDelegate(self)
+        self.setItemDelegate(self._delegate)
+        self.setUniformItemSizes(True)
+        # Widgets currently shown over their rows. The others are kept in `_parked`, so that scrolling the
+        # viewport, which moves all of its children, only moves the widgets in view.
+        self._shown: set[_WT] = set()
+        self._parked = QWidget(self)
+        self._parked.hide()
+
+        # Widgets scrolled into view are created once scrolling pauses, the delegate paints their rows until then
+        self._create_timer = QTimer(self)
+        self._create_timer.setSingleShot(True)
+        self._create_timer.timeout.connect(lambda: self._place_widgets(create=_CREATE_BATCH))
 
         self.setFrameShape(QFrame.Shape.NoFrame)
-        self.setSortingEnabled(True)
         self.setAlternatingRowColors(True)
         self.setProperty("HideBorder", True)
         self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
 
         if extended_selection is True:
             self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
@@ -51,72 +98,272 @@ class BaseListWidget(Generic[_WT], QListWidget):
         widget = [widget.build_info for widget in self.widgets]
         return f"BaseListWidget build info: {widget}"
 
-    def itemWidget(self, item) -> _WT | None:
-        return cast("_WT | None", super().itemWidget(item))
+    def _sort_key(self, widget: _WT) -> tuple:
+        return widget.item.sort_key(self.page.sorting_type.name)
 
-    def add_item(self, item, widget):
-        item.setSizeHint(widget.sizeHint())
-        self.addItem(item)
-        self.setItemWidget(item, widget)
-        self.widgets.add(widget)
-        self._cache_widget(widget)
-        self.update_visibility(item, widget)
-        self.visible_count_changed.emit(len(self.widgets))
+    def sortItems(self, order: Qt.SortOrder):
+        # In ascending order the newest builds and highest versions come first, but labels are alphabetical
+        descending = order == Qt.SortOrder.DescendingOrder
+        self._model.sort_rows(self._sort_key, reverse=descending == (self.page.sorting_type.name == "LABEL"))
+
+    def itemWidget(self, item: BaseListWidgetItem) -> _WT | None:
+        return item.widget()
+
+    def count(self) -> int:
+        return len(self.widgets)
 
-    def insert_item(self, item, widget, index=0):
-        item.setSizeHint(widget.sizeHint())
-        self.insertItem(index, item)
-        self.setItemWidget(item, widget)
+    def add_item(self, item: BaseListWidgetItem, widget: _WT):
+        item.attach(self, widget)
+        # Widgets are only shown over rows in view, see `_place_widgets`
+        widget.setParent(self._parked)
         self.widgets.add(widget)
         self._cache_widget(widget)
-        self.update_visibility(item, widget)
+        binfo = self._widget_binfos[widget]
+        self._model.add(widget, hidden=binfo is not None and binfo not in self._filter.matches)
         self.visible_count_changed.emit(len(self.widgets))
 
+    def insert_item(self, item: BaseListWidgetItem, widget: _WT, index=0):
+        # Rows go where they're sorted
+        self.add_item(item, widget)
+
     def _cache_widget(self, widget):
-        self._binfos_cache.setdefault(self.basic_from_widget(widget), set()).add(widget)
+        binfo = self.basic_from_widget(widget)
+        self._widget_binfos[widget] = binfo
+        widgets = self._binfos_cache.setdefault(binfo, set())
+        widgets.add(widget)
+        if binfo is not None and len(widgets) == 1:
+            self._build_index.add(binfo)
+            self._apply_filter_changes(self._filter.add(binfo))
+        self._index_widget(widget)
+
+    def _uncache_widget(self, widget):
+        # The build info may have been renamed in place since the widget was added
+        binfo = self._widget_binfos.pop(widget, None)
+        widgets = self._binfos_cache.get(binfo, set())
+        widgets.discard(widget)
+        if binfo is not None and not widgets:
+            # Builds that are gone must not count towards the newest/oldest of the filter
+            self._binfos_cache.pop(binfo, None)
+            self._build_index.discard(binfo)
+            self._apply_filter_changes(self._filter.remove(binfo))
+            self._fuzzy_index.discard(binfo)
+        self._unindex_widget(widget)
+
+    def _apply_filter_changes(self, changed: set[BasicBuildInfo]):
+        if len(changed) > _RESET_THRESHOLD:
+            self._reset_rows(self._hidden_widgets())
+            return
+        for binfo in changed:
+            hidden = binfo not in self._filter.matches
+            for widget in self._binfos_cache.get(binfo, ()):
+                self._model.set_hidden(widget, hidden)
+
+    def _hidden_widgets(self) -> set[_WT]:
+        matches = self._filter.matches
+        return {w for w, b in self._widget_binfos.items() if b is not None and b not in matches}
+
+    def _reset_rows(self, hidden: Iterable[_WT], removed: Iterable[_WT] = ()):
+        # The selection is lost when the rows are rebuilt, so it's moved over to the new rows
+        selected = [w for w in self.selected_widgets() if w not in removed]
+        self._model.reset(hidden, removed)
+        for widget in selected:
+            self.set_selected(widget, True)
 
-    def widget_with_link(self, link: Path) -> _WT | None:
+    @staticmethod
+    def _version_key(build_info: BuildInfo) -> tuple:
+        # Mirrors the fallback of BuildInfo.__eq__ for builds without a hash on either side
+        try:
+            v = parse_blender_ver(build_info.subversion)
+            return (v.major, v.minor, v.patch, build_info.branch)
+        except Exception:
+            return (build_info.subversion, build_info.branch)
+
+    def _index_widget(self, widget: _WT):
+        build_info = widget.build_info
         # LibraryWidget/LibraryDamagedWidget use `link`; UnrecoBuildWidget uses `path`.
+        links = [p for p in (getattr(widget, "link", None), getattr(widget, "path", None)) if p is not None]
         try:
-            return next(
-                widget
-                for widget in self.widgets
-                if getattr(widget, "link", None) == link or getattr(widget, "path", None) == link
-            )
-        except StopIteration:
-            return None
+            semversion = build_info.full_semversion
+        except ValueError:
+            semversion = None
+        hash_key = (build_info.build_hash, build_info.branch) if build_info.build_hash else None
+        version_key = self._version_key(build_info)
+
+        for link in links:
+            self._by_link.setdefault(link, set()).add(widget)
+        if semversion is not None:
+            self._by_semversion.setdefault(semversion, set()).add(widget)
+        if hash_key is not None:
+            self._by_hash.setdefault(hash_key, set()).add(widget)
+        self._by_version.setdefault(version_key, set()).add(widget)
+        # Keys are kept so a widget is found again even if its build info was changed in place
+        self._index_keys[widget] = (links, semversion, hash_key, version_key)
+
+    def _unindex_widget(self, widget: _WT):
+        if (keys := self._index_keys.pop(widget, None)) is None:
+            return
+        links, semversion, hash_key, version_key = keys
 
-    def remove_item(self, item):
-        if (w := self.itemWidget(item)) is not None:
-            self.widgets.remove(w)
-            self._binfos_cache[self.basic_from_widget(w)].remove(w)
-        row = self.row(item)
-        self.takeItem(row)
+        def discard(index: dict, key):
+            if (widgets := index.get(key)) is not None:
+                widgets.discard(widget)
+                if not widgets:
+                    del index[key]
+
+        for link in links:
+            discard(self._by_link, link)
+        discard(self._by_semversion, semversion)
+        discard(self._by_hash, hash_key)
+        discard(self._by_version, version_key)
+
+    def widget_with_link(self, link: Path) -> _WT | None:
+        return next(iter(self._by_link.get(link, ())), None)
+
+    def _forget_widget(self, widget: _WT):
+        self.widgets.discard(widget)
+        self._shown.discard(widget)
+        self._uncache_widget(widget)
+        # Widgets are deleted along with their rows
+        widget.deleteLater()
+
+    def remove_item(self, item: BaseListWidgetItem):
+        if (w := self.itemWidget(item)) is not None and w in self._model:
+            self._model.remove(w)
+            self._forget_widget(w)
         self.visible_count_changed.emit(len(self.widgets))
 
-    def items(self):
-        items = []
+    def remove_items(self, items: Iterable[BaseListWidgetItem]):
+        """Remove several items at once."""
+        widgets = {w for item in items if (w := self.itemWidget(item)) is not None and w in self._model}
+        if len(widgets) > _RESET_THRESHOLD:
+            self._reset_rows(self._model.hidden - widgets, removed=widgets)
+        else:
+            for w in widgets:
+                self._model.remove(w)
+        for w in widgets:
+            self._forget_widget(w)
+        self.visible_count_changed.emit(len(self.widgets))
 
-        for i in range(self.count()):
-            item = self.itemWidget(self.item(i))
-            items.append(item)
+    def items(self) -> list[_WT]:
+        """The widgets of the rows in view order, then the widgets filtered out."""
+        return [*self._model.rows, *self._model.hidden]
 
-        return items
+    def is_hidden(self, widget: _WT) -> bool:
+        return widget not in self._model or widget in self._model.hidden
+
+    def is_selected(self, widget: _WT) -> bool:
+        row = self._model.row_of(widget)
+        return row >= 0 and self.selectionModel().isSelected(self._model.index(row))
+
+    def set_selected(self, widget: _WT, selected: bool):
+        if (row := self._model.row_of(widget)) < 0:
+            return
+        flag = QItemSelectionModel.SelectionFlag.Select if selected else QItemSelectionModel.SelectionFlag.Deselect
+        self.selectionModel().select(self._model.index(row), flag)
+
+    def selected_widgets(self) -> list[_WT]:
+        rows = self._model.rows
+        return [rows[index.row()] for index in self.selectionModel().selectedRows()]
+
+    def selectedItems(self) -> list[BaseListWidgetItem]:
+        return [w.item for w in self.selected_widgets()]
+
+    def scroll_to_widget(self, widget: _WT):
+        """Scroll ``widget`` into view and show it."""
+        if (row := self._model.row_of(widget)) >= 0:
+            self.scrollTo(self._model.index(row))
+            self._place_widgets(create=self._model.rowCount())
+
+    def _visible_rows(self) -> range:
+        rect = self.viewport().rect()
+        first = self.indexAt(rect.topLeft())
+        if not first.isValid():
+            return range(0)
+        last = self.indexAt(QPoint(rect.left(), rect.bottom()))
+        return range(first.row(), last.row() + 1 if last.isValid() else self._model.rowCount())
+
+    def _place_widgets(self, create: int = 0):
+        """
+        Show the widgets of the rows in view over their rows and hide the others.
+
+        Up to ``create`` widgets that haven't created their children yet do so now, the rows of the others are
+        painted by the delegate until a later call.
+        """
+        rows = self._model.rows
+        shown: set[_WT] = set()
+        pending = created = False
+        if self.isVisible():
+            for row in self._visible_rows():
+                widget = rows[row]
+                index = self._model.index(row)
+                if not widget.ui_created:
+                    if create <= 0:
+                        pending = True
+                        continue
+                    create -= 1
+                    created = True
+                    widget.create_ui()
+                if self._delegate.fit(widget, index):
+                    # The rows grew, so the ones in view changed
+                    self.executeDelayedItemsLayout()
+                    self._place_widgets(create)
+                    return
+                if widget not in self._shown:
+                    widget.setParent(self.viewport())
+                widget.setGeometry(self.visualRect(index))
+                shown.add(widget)
+
+        for widget in self._shown - shown:
+            widget.setParent(self._parked)
+        for widget in shown - self._shown:
+            widget.show()
+        self._shown = shown
+        if pending:
+            # The next batch right away, or the first one once scrolling pauses
+            self._create_timer.start(0 if created else 30)
+
+    def updateGeometries(self):
+        super().updateGeometries()
+        self._place_widgets()
+
+    def scrollContentsBy(self, dx: int, dy: int):
+        super().scrollContentsBy(dx, dy)
+        self._place_widgets()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._place_widgets(create=_CREATE_BATCH)
 
     def contains_build_info(self, build_info: BuildInfo):
-        fsv = build_info.full_semversion
-        return any(fsv == widget.build_info.full_semversion for widget in self.widgets)
+        return bool(self._by_semversion.get(build_info.full_semversion))
 
     def widget_with_blinfo(self, build_info: BuildInfo) -> _WT | None:
-        try:
-            return next(widget for widget in self.widgets if build_info == widget.build_info)
-        except StopIteration:
-            return None
+        """A widget whose build info is equal to ``build_info``, following the rules of `BuildInfo.__eq__`."""
+        same_version = self._by_version.get(self._version_key(build_info), ())
+        if not build_info.build_hash:
+            return next(iter(same_version), None)
+
+        # With a hash on both sides only the hash and branch are compared
+        if same_hash := self._by_hash.get((build_info.build_hash, build_info.branch)):
+            return next(iter(same_hash))
+        return next((w for w in same_version if not w.build_info.build_hash), None)
 
     def clear_(self):
-        self.clear()
-        self.widgets.clear()
+        self._model.clear()
+        for widget in self.widgets:
+            widget.deleteLater()
+        self.widgets = set()
+        self._shown = set()
         self._binfos_cache = {None: set()}
+        self._widget_binfos = {}
+        self._fuzzy_index = FuzzySearchIndex()
+        self._filter = QueryFilter(self.query, fuzzy_index=self._fuzzy_index)
+        self._build_index = BuildIndex(fuzzy_index=self._fuzzy_index)
+        self._by_link = {}
+        self._by_semversion = {}
+        self._by_hash = {}
+        self._by_version = {}
+        self._index_keys = {}
         self.visible_count_changed.emit(0)
 
     @staticmethod
@@ -141,9 +388,8 @@ class BaseListWidget(Generic[_WT], QListWidget):
         binfo_to_widget = self._binfos_cache
         unknown_widgets = binfo_to_widget[None]
 
-        # binfo_to_widget, unknown_widgets = self.basic_build_infos()
-        # gather all matching widgets in the order returned by search.match
-        matching_binfos = search.match(b for b in binfo_to_widget if b is not None)
+        # gather all matching widgets, newest build first
+        matching_binfos = self._build_index.match(search)
 
         # Flatten matching widgets from binfos
         shown_widgets: list[_WT] = []
@@ -172,33 +418,22 @@ class BaseListWidget(Generic[_WT], QListWidget):
 
 
     def update_all_visibility(self):
-        visible_widgets = self.get_matching_builds(self.query)
+        self._filter = QueryFilter(
+            self.query, (b for b in self._binfos_cache if b is not None), fuzzy_index=self._fuzzy_index
+        )
+        visible_widgets = [w for b in self._filter.matches for w in self._binfos_cache[b]]
+        visible_widgets.extend(self._binfos_cache[None])
         visible_set = set(visible_widgets)
 
-        for widget in self.widgets:
-            widget.item.setHidden(widget not in visible_set)
+        self._reset_rows(self.widgets - visible_set)
 
         self.visible_count_changed.emit(len(visible_widgets))
         return visible_widgets
 
-    def update_visibility(self, item: QListWidgetItem, widget: _WT | None = None):
-        if widget is None and (widget := self.itemWidget(item)) is None:
-            return
-        if (binfo := self.basic_from_widget(widget)) is None:
-            return
-
-        q = self.query
-        success = bool(q.match([binfo]))
-
-        item.setHidden(not success)
-
     def clear_by_folder(self, folder: str):
         def widget_folder(w):
             path = getattr(w, "link", None) or getattr(w, "path", None)
             return Path(path).parent.name if path is not None else None
 
         widgets_to_remove = [widget for widget in self.widgets if widget_folder(widget) == folder]
-        for widget in widgets_to_remove:
-            items = [self.item(i) for i in range(self.count()) if self.itemWidget(self.item(i)) == widget]
-            for item in items:
-                self.remove_item(item)
+        self.remove_items([widget.item for widget in widgets_to_remove])
@@ -7,7 +7,9 @@ from modules.version_matcher import VersionSearchQuery
 from PySide6.QtCore import Qt, QTimer, Signal, Slot
 from PySide6.QtGui import QPixmap
 from PySide6.QtWidgets import QHBoxLayout, QLabel, QPushButton, QSplitter, QVBoxLayout, QWidget
+from threads.disk_usage import get_disk_usage
 from widgets.base_list_widget import _WT, BaseListWidget
+from widgets.library_widget import LibraryWidget
 from widgets.search_bar import SearchBarWidget, SearchButtonWidget
 
 
@@ -41,6 +43,12 @@ class BasePageWidget(QWidget, Generic[_WT]):
         self._save_widths_timer.setInterval(200)
         self._save_widths_timer.timeout.connect(self._save_column_widths)
 
+        # Lists change one row at a time while they're drawn, so the disk usage total is summed once they settle
+        self._disk_usage_timer = QTimer(self)
+        self._disk_usage_timer.setSingleShot(True)
+        self._disk_usage_timer.setInterval(200)
+        self._disk_usage_timer.timeout.connect(self.update_disk_usage)
+
         self.sort_order_asc = True
 
         self.layout: QVBoxLayout = QVBoxLayout(self)
@@ -112,6 +120,11 @@ class BasePageWidget(QWidget, Generic[_WT]):
         self.HeaderReloadButton.setFixedWidth(95)  # Match launchButton width in list items
         self.HeaderReloadButton.setEnabled(show_reload)
 
+        self.DiskUsageLabel = QLabel()
+        self.DiskUsageLabel.setToolTip(t("repo.disk_usage_tooltip"))
+        self.DiskUsageLabel.setContentsMargins(6, 0, 6, 0)
+        self.DiskUsageLabel.hide()
+
         self.HeaderSearchButton = SearchButtonWidget(parent.icons, parent=self)
         self.HeaderSearchButton.state_updated.connect(self.update_search_visible)
 
@@ -161,6 +174,7 @@ class BasePageWidget(QWidget, Generic[_WT]):
 
         self.HeaderLayout.addWidget(self.HeaderReloadButton)
         self.HeaderLayout.addWidget(self.headerSplitter, stretch=1)
+        self.HeaderLayout.addWidget(self.DiskUsageLabel)
         self.HeaderLayout.addWidget(self.HeaderSearchButton)
         # self.HeaderLayout.addSpacing(34)
 
@@ -187,6 +201,21 @@ class BasePageWidget(QWidget, Generic[_WT]):
             self.list_widget.hide()
             self.HeaderWidget.hide()
             self.PlaceholderWidget.show()
+        self._disk_usage_timer.start()
+
+    def total_disk_usage(self) -> int:
+        """Cached size in bytes of the installed builds shown on this page."""
+        index = get_disk_usage()
+        total = 0
+        for widget in self.list_widget.widgets:
+            if isinstance(widget, LibraryWidget) and not widget.item.isHidden():
+                total += index.cached(widget.link) or 0
+        return total
+
+    def update_disk_usage(self):
+        total = self.total_disk_usage()
+        self.DiskUsageLabel.setText(f"{total / 1024**3:.1f} GB")
+        self.DiskUsageLabel.setVisible(total > 0)
 
     def set_sorting_type(self, sorting_type, toggle_order=True):
         if toggle_order and sorting_type == self.sorting_type:
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QPersistentModelIndex, QRect, QSize, Qt
+from PySide6.QtWidgets import QStyle, QStyledItemDelegate, QStyleOptionViewItem
+from widgets.base_build_widget import BaseBuildWidget
+from widgets.datetime_widget import DATETIME_FORMAT
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from PySide6.QtGui import QPainter
+    from widgets.base_list_widget import BaseListWidget
+
+_WT = TypeVar("_WT", bound=BaseBuildWidget)
+
+WIDGET_ROLE = Qt.ItemDataRole.UserRole + 1
+
+
+class BuildListModel(QAbstractListModel, Generic[_WT]):
+    """
+    The rows of a `BaseListWidget`, one per build widget.
+
+    Only the widgets that pass the filter of the list are rows, kept in the order they're sorted in, so the view
+    never lays out or skips over hidden rows. Filtered out widgets are kept aside in `hidden` and are put back in
+    place when they're shown again.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows: list[_WT] = []
+        self.hidden: set[_WT] = set()
+        # Sort keys end with the order widgets were added in, so no two rows compare equal
+        self._keys: dict[_WT, tuple[Any, int]] = {}
+        self._sort_key: Callable[[_WT], Any] = lambda _: 0
+        self._reverse = False
+        self._added = 0
+
+    def rowCount(self, parent: QModelIndex | QPersistentModelIndex = QModelIndex()) -> int:  # noqa: B008
+        return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, index: QModelIndex | QPersistentModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        widget = self.rows[index.row()]
+        if role == WIDGET_ROLE:
+            return widget
+        if role == Qt.ItemDataRole.DisplayRole:
+            return widget.build_info.display_version
+        return None
+
+    def flags(self, index: QModelIndex | QPersistentModelIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return self.rows[index.row()].item.flags()
+
+    def __contains__(self, widget: _WT) -> bool:
+        return widget in self._keys
+
+    def _before(self, a: tuple[Any, int], b: tuple[Any, int]) -> bool:
+        return b < a if self._reverse else a < b
+
+    def _bisect(self, key: tuple[Any, int]) -> int:
+        keys, rows = self._keys, self.rows
+        lo, hi = 0, len(rows)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._before(keys[rows[mid]], key):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def row_of(self, widget: _WT) -> int:
+        """The row of ``widget``, or -1 if it's hidden or not in the list."""
+        if widget not in self._keys or widget in self.hidden:
+            return -1
+        row = self._bisect(self._keys[widget])
+        return row if row < len(self.rows) and self.rows[row] is widget else -1
+
+    def _show(self, widget: _WT):
+        row = self._bisect(self._keys[widget])
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.rows.insert(row, widget)
+        self.endInsertRows()
+
+    def add(self, widget: _WT, hidden: bool = False):
+        self._keys[widget] = (self._sort_key(widget), self._added)
+        self._added += 1
+        if hidden:
+            self.hidden.add(widget)
+        else:
+            self._show(widget)
+
+    def remove(self, widget: _WT):
+        if widget in self.hidden:
+            self.hidden.discard(widget)
+        elif (row := self.row_of(widget)) >= 0:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self.rows[row]
+            self.endRemoveRows()
+        self._keys.pop(widget, None)
+
+    def set_hidden(self, widget: _WT, hidden: bool):
+        if widget not in self._keys or (widget in self.hidden) == hidden:
+            return
+        if hidden:
+            row = self.row_of(widget)
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self.rows[row]
+            self.endRemoveRows()
+            self.hidden.add(widget)
+        else:
+            self.hidden.discard(widget)
+            self._show(widget)
+
+    def reset(self, hidden: Iterable[_WT] = (), removed: Iterable[_WT] = ()):
+        """Hide exactly ``hidden`` and drop ``removed``, all at once. Meant for changes to many rows."""
+        self.beginResetModel()
+        for widget in removed:
+            self._keys.pop(widget, None)
+        self.hidden = {w for w in hidden if w in self._keys}
+        self.rows = sorted(
+            (w for w in self._keys if w not in self.hidden), key=self._keys.__getitem__, reverse=self._reverse
+        )
+        self.endResetModel()
+
+    def sort_rows(self, sort_key: Callable[[_WT], Any], reverse: bool):
+        """Sort the rows by ``sort_key``, keeping the selection and current row on the same widgets."""
+        self._sort_key = sort_key
+        self._reverse = reverse
+        self.layoutAboutToBeChanged.emit()
+        for widget, (_, added) in self._keys.items():
+            self._keys[widget] = (sort_key(widget), added)
+        old = self.persistentIndexList()
+        moved = [self.rows[index.row()] for index in old]
+        self.rows.sort(key=self._keys.__getitem__, reverse=reverse)
+        row = {widget: i for i, widget in enumerate(self.rows)}
+        self.changePersistentIndexList(old, [self.index(row[widget]) for widget in moved])
+        self.layoutChanged.emit()
+
+    def clear(self):
+        self.beginResetModel()
+        self.rows = []
+        self.hidden = set()
+        self._keys = {}
+        self.endResetModel()
+
+
+class BuildItemDelegate(QStyledItemDelegate):
+    """
+    Paints the rows of a `BaseListWidget`.
+
+    Every row is as tall as the tallest build widget shown so far, so the view can lay out thousands of rows
+    without asking for each of their sizes. The widget of a row is only created once the row is scrolled into
+    view, and until then the delegate paints its version, label and date in the columns of the page.
+    """
+
+    def __init__(self, list_widget: BaseListWidget):
+        super().__init__(list_widget)
+        self.list_widget = list_widget
+        self.row_height = 0
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex | QPersistentModelIndex) -> QSize:
+        return QSize(option.rect.width(), self.row_height or option.fontMetrics.height() * 2)
+
+    def fit(self, widget: BaseBuildWidget, index: QModelIndex) -> bool:
+        """Grow the rows to fit ``widget``. Returns whether they grew."""
+        height = widget.sizeHint().height()
+        if height <= self.row_height:
+            return False
+        self.row_height = height
+        self.sizeHintChanged.emit(index)
+        return True
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex | QPersistentModelIndex):
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        opt.text = ""
+        style = opt.widget.style() if opt.widget is not None else None
+        if style is not None:
+            style.drawControl(QStyle.ControlElement.CE_ItemViewItem, opt, painter, opt.widget)
+
+        widget: BaseBuildWidget | None = index.data(WIDGET_ROLE)
+        if widget is None or widget.isVisible():
+            return
+
+        # Same columns as the row widgets: the launch or download button, then the version, label and date
+        version_width, _, commit_time_width = self.list_widget.page.get_column_widths()
+        rect = option.rect.adjusted(2 + 95, 2, -28, -2)
+        version = QRect(rect.left() + 20, rect.top(), version_width - 20, rect.height())
+        commit_time = QRect(rect.right() - commit_time_width, rect.top(), commit_time_width, rect.height())
+        label = QRect(version.right(), rect.top(), commit_time.left() - version.right(), rect.height())
+
+        build_info = widget.build_info
+        center = Qt.AlignmentFlag.AlignVCenter
+        painter.save()
+        painter.setFont(option.font)
+        painter.drawText(version, center | Qt.AlignmentFlag.AlignLeft, build_info.display_version)
+        elided = option.fontMetrics.elidedText(build_info.display_label, Qt.TextElideMode.ElideRight, label.width())
+        painter.drawText(label, center | Qt.AlignmentFlag.AlignLeft, elided)
+        painter.drawText(
+            commit_time, center | Qt.AlignmentFlag.AlignHCenter, build_info.commit_time.strftime(DATETIME_FORMAT)
+        )
+        painter.restore()
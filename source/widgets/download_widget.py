@@ -4,19 +4,19 @@ import logging
 import re
 import shutil
 from enum import Enum
-from pathlib import Path
 from typing import TYPE_CHECKING
 
 from i18n import t
-from modules.build_info import BuildInfo, ReadBuildTask, parse_blender_ver
 from modules.enums import MessageType
 from modules.fonts import Fonts
-from modules.settings import get_install_template, get_library_folder
+from modules.settings import get_deduplicate_builds, get_install_template
 from PySide6.QtCore import Qt, QTimer, Signal, Slot
 from PySide6.QtWidgets import QHBoxLayout, QLabel, QPushButton, QVBoxLayout
-from semver import Version
+from threads.build_info_tasks import ReadBuildTask
+from threads.deduplicator import DedupTask
 from threads.downloader import DownloadTask
 from threads.extractor import ExtractTask
+from threads.installer import archive_name, installed_build_info, library_destination, move_bforartists_patch_note
 from threads.renamer import RenameTask
 from threads.template_installer import TemplateTask
 from widgets.base_build_widget import BaseBuildWidget
@@ -27,6 +27,9 @@ from widgets.elided_text_label import ElidedTextLabel
 from windows.popup_window import Popup
 
 if TYPE_CHECKING:
+    from pathlib import Path
+
+    from modules.build_info import BuildInfo
     from widgets.library_widget import LibraryWidget
     from windows.main_window import BlenderLauncher
 
@@ -60,10 +63,20 @@ class DownloadWidget(BaseBuildWidget):
         self.updating_widget = None
         self._is_removed = False
 
-        self.progressBar = BaseProgressBarWidget()
-        self.progressBar.setFont(Fonts.get().font_8)
-        self.progressBar.setFixedHeight(18)
-        self.progressBar.hide()
+        # Rows are only laid out once they're scrolled into view, see `create_ui`
+        self.ui_created = False
+        # Only rows that get downloaded or are installed need these, so they are created on first use
+        self._progress_bar: BaseProgressBarWidget | None = None
+        self._cancel_button: QPushButton | None = None
+        self._installed_button: QPushButton | None = None
+
+        if installed:
+            self.setInstalled(installed)
+
+    def create_ui(self) -> None:
+        if self.ui_created:
+            return
+        self.ui_created = True
 
         self.downloadButton = QPushButton(t("act.download"))
         self.downloadButton.setFixedWidth(95)  # Match header fakeLabel width
@@ -71,18 +84,6 @@ class DownloadWidget(BaseBuildWidget):
         self.downloadButton.clicked.connect(lambda: self.init_downloader())
         self.downloadButton.setCursor(Qt.CursorShape.PointingHandCursor)
 
-        self.installedButton = QPushButton(t("act.installed"))
-        self.installedButton.setFixedWidth(95)  # Match header fakeLabel width
-        self.installedButton.setProperty("InstalledButton", True)
-        self.installedButton.clicked.connect(self.focus_installed)
-
-        self.cancelButton = QPushButton(t("act.cancel"))
-        self.cancelButton.setFixedWidth(95)  # Match header fakeLabel width
-        self.cancelButton.setProperty("CancelButton", True)
-        self.cancelButton.clicked.connect(self.download_cancelled)
-        self.cancelButton.setCursor(Qt.CursorShape.PointingHandCursor)
-        self.cancelButton.hide()
-
         self.main_hl = QHBoxLayout(self)
         self.main_hl.setContentsMargins(2, 2, 0, 2)
         self.main_hl.setSpacing(0)
@@ -106,7 +107,7 @@ class DownloadWidget(BaseBuildWidget):
 
         self.branchLabel = ElidedTextLabel(self.build_info.display_label, self)
         self.commitTimeLabel = DateTimeWidget(self.build_info.commit_time, self.build_info.build_hash, self)
-        self.build_state_widget = BuildStateWidget(parent.icons, self)
+        self.build_state_widget = BuildStateWidget(self.launcher.icons, self)
 
         self.build_info_hl.addWidget(self.subversionLabel)
         self.build_info_hl.addWidget(self.branchLabel, stretch=1)
@@ -123,22 +124,58 @@ class DownloadWidget(BaseBuildWidget):
         if self.show_new and not self.installed:
             self.build_state_widget.setNewBuild(True)
 
-        self.progress_bar_hl.addWidget(self.progressBar)
-
         self.sub_vl.addLayout(self.build_info_hl)
         self.sub_vl.addLayout(self.progress_bar_hl)
 
         self.main_hl.addWidget(self.downloadButton)
-        self.main_hl.addWidget(self.cancelButton)
-        self.main_hl.addWidget(self.installedButton)
         self.main_hl.addLayout(self.sub_vl)
         self.main_hl.addWidget(self.build_state_widget)
 
-        if installed:
-            self.setInstalled(installed)
-        else:
-            self.installedButton.hide()
-
+        if self.installed:
+            self.downloadButton.hide()
+            self.installedButton.show()
+
+    @property
+    def progressBar(self) -> BaseProgressBarWidget:
+        if self._progress_bar is None:
+            self._progress_bar = BaseProgressBarWidget()
+            self._progress_bar.setFont(Fonts.get().font_8)
+            self._progress_bar.setFixedHeight(18)
+            self._progress_bar.hide()
+            self.progress_bar_hl.addWidget(self._progress_bar)
+        return self._progress_bar
+
+    @property
+    def cancelButton(self) -> QPushButton:
+        if self._cancel_button is None:
+            self._cancel_button = QPushButton(t("act.cancel"))
+            self._cancel_button.setFixedWidth(95)  # Match header fakeLabel width
+            self._cancel_button.setProperty("CancelButton", True)
+            self._cancel_button.clicked.connect(self.download_cancelled)
+            self._cancel_button.setCursor(Qt.CursorShape.PointingHandCursor)
+            self._cancel_button.hide()
+            # Takes the place of the download button
+            self.main_hl.insertWidget(1, self._cancel_button)
+        return self._cancel_button
+
+    @property
+    def installedButton(self) -> QPushButton:
+        if self._installed_button is None:
+            self._installed_button = QPushButton(t("act.installed"))
+            self._installed_button.setFixedWidth(95)  # Match header fakeLabel width
+            self._installed_button.setProperty("InstalledButton", True)
+            self._installed_button.clicked.connect(self.focus_installed)
+            self._installed_button.hide()
+            self.main_hl.insertWidget(1, self._installed_button)
+        return self._installed_button
+
+    def _hide_download_progress(self) -> None:
+        if self._progress_bar is not None:
+            self._progress_bar.hide()
+        if self._cancel_button is not None:
+            self._cancel_button.hide()
+
+    def _populate_menu(self) -> None:
         if self.build_info.branch in {"stable", "lts", "daily", "bforartists"}:
             self.menu.addAction(self.showReleaseNotesAction)
         else:
@@ -153,13 +190,13 @@ class DownloadWidget(BaseBuildWidget):
                     self.showReleaseNotesAction.setText(t("act.a.release_notes_pr"))
                     self.menu.addAction(self.showReleaseNotesAction)
 
-        self.list_widget.sortItems()
-
     def context_menu(self) -> None:
         if self.installed:
             self.installed.context_menu()
             return
 
+        if self._menu is None:
+            self._populate_menu()
         self.menu.trigger()
 
     def mouseDoubleClickEvent(self, _event) -> None:
@@ -178,6 +215,8 @@ class DownloadWidget(BaseBuildWidget):
             self.show_new = False
 
     def init_downloader(self, updating_widget: LibraryWidget | None = None) -> None:
+        # Updates can start the download of a row that was never scrolled into view
+        self.create_ui()
         self.item.setSelected(True)
         self.updating_widget = updating_widget
 
@@ -198,8 +237,7 @@ class DownloadWidget(BaseBuildWidget):
     def set_state(self, state: DownloadState) -> None:
         self.state = state
         if state == DownloadState.IDLE:
-            self.progressBar.hide()
-            self.cancelButton.hide()
+            self._hide_download_progress()
             self.build_state_widget.setDownload(False)
             self.build_state_widget.setExtract(False)
         if state == DownloadState.DOWNLOADING:
@@ -220,23 +258,13 @@ class DownloadWidget(BaseBuildWidget):
     def init_extractor(self, source: Path) -> None:
         self.set_state(DownloadState.EXTRACTING)
 
-        library_folder = Path(get_library_folder())
-
-        if self.build_info.branch in ("stable", "lts"):
-            dist = library_folder / "stable"
-        elif self.build_info.branch == "daily":
-            dist = library_folder / "daily"
-        elif self.build_info.branch == "bforartists":
-            dist = library_folder / "bforartists"
-        elif self.build_info.branch == "upbge-stable":
-            dist = library_folder / "upbge-stable"
-        elif self.build_info.branch == "upbge-weekly":
-            dist = library_folder / "upbge-weekly"
-        else:
-            dist = library_folder / "experimental"
-
         self.source_file = source
-        t = ExtractTask(file=source, destination=dist, is_upbge=self.build_info.branch.startswith("upbge"))
+        t = ExtractTask(
+            file=source,
+            destination=library_destination(self.build_info.branch),
+            is_upbge=self.build_info.branch.startswith("upbge"),
+            reuse_from=self.updating_widget.link if self.updating_widget is not None else None,
+        )
         t.progress.connect(self.progressBar.set_progress)
         t.finished.connect(self.init_template_installer)
         self.launcher.task_queue.append(t)
@@ -262,19 +290,7 @@ class DownloadWidget(BaseBuildWidget):
             logger.error("Build directory is None, cannot move Bforartists patch note.")
             return
 
-        bforartist_lib = self.build_dir.parent
-        txt_files = [f for f in bforartist_lib.glob("*.txt") if f.is_file()]
-        folders = [folder for folder in bforartist_lib.iterdir() if folder.is_dir()]
-
-        for file in txt_files:
-            file_version = ".".join(file.stem[-3:])
-            for folder in folders:
-                if file_version in folder.name:
-                    try:
-                        shutil.move(file, folder / file.name)
-                        break
-                    except shutil.Error as e:
-                        logger.exception(f"Failed to move {file.name} to {folder.name}: {e}")
+        move_bforartists_patch_note(self.build_dir)
 
     def download_cancelled(self) -> None:
         self.item.setSelected(True)
@@ -295,37 +311,12 @@ class DownloadWidget(BaseBuildWidget):
 
     def download_get_info(self) -> None:
         self.set_state(DownloadState.READING)
-        if self.launcher.platform == "Linux":
-            archive_name = Path(self.build_info.link).with_suffix("").stem
-        else:
-            archive_name = Path(self.build_info.link).stem
-
         assert self.build_dir is not None
 
-        if self.build_info.branch == "upbge-weekly":
-            ver = parse_blender_ver(self.build_info.subversion)
-        else:
-            # If the returned version from the executable is invalid it might break loading.
-            ver_ = parse_blender_ver(self.build_dir.name, search=True)
-            ver = Version(
-                ver_.major,
-                ver_.minor,
-                ver_.patch,
-                prerelease=ver_.prerelease,
-            )
-
         t = ReadBuildTask(
             self.build_dir,
-            info=BuildInfo(
-                str(self.build_dir),
-                subversion=str(ver),
-                build_hash=None,
-                commit_time=self.build_info.commit_time,
-                branch=self.build_info.branch,
-                custom_name=self.build_info.custom_name,
-                custom_executable=self.build_info.custom_executable,
-            ),
-            archive_name=archive_name,
+            info=installed_build_info(self.build_info, self.build_dir),
+            archive_name=archive_name(self.build_info.link),
         )
         t.finished.connect(self.download_rename)
         t.failure.connect(lambda e: logger.error(f"ReadBuildTask failed for {self.build_dir}: {e}"))
@@ -358,6 +349,9 @@ class DownloadWidget(BaseBuildWidget):
             assert self.source_file is not None
             self.launcher.clear_temp(self.source_file)
 
+            if get_deduplicate_builds():
+                self.launcher.task_queue.append(DedupTask(builds=[path]))
+
             if self.build_info.branch == "bforartists":
                 message = f"Bforartists {self.subversionLabel.text()} {self.build_info.commit_time}"
             else:
@@ -380,6 +374,7 @@ class DownloadWidget(BaseBuildWidget):
             else:
                 QTimer.singleShot(500, lambda: self.remove_old_build(updating_widget))
         self.launcher.check_library_for_updates()
+        self.launcher.run_retention()
 
     def handle_portable_settings(self, old_widget: LibraryWidget, new_widget: LibraryWidget) -> None:
         """Handle portable settings transfer based on user choice."""
@@ -410,9 +405,6 @@ class DownloadWidget(BaseBuildWidget):
             return
 
         logger.info(f"Portable settings moved from {old_config_path} to {new_config_path}")
-        # Update the new widget to reflect portable status
-        new_widget.makePortableAction.setText(t("act.a.port.rem"))
-        new_widget.showConfigFolderAction.setText(t("act.a.config_portable"))
 
         self.remove_old_build(old_widget)
 
@@ -457,17 +449,19 @@ class DownloadWidget(BaseBuildWidget):
             return
 
         build_widget.destroyed.connect(self.uninstalled)
-        self.downloadButton.hide()
-        self.installedButton.show()
-        self.cancelButton.hide()
-        self.progressBar.hide()
         self.installed = build_widget
+        if self.ui_created:
+            self.downloadButton.hide()
+            self.installedButton.show()
+            self._hide_download_progress()
 
     @Slot()
     def uninstalled(self) -> None:
-        self.installedButton.hide()
-        self.downloadButton.show()
         self.installed = None
+        if self.ui_created:
+            if self._installed_button is not None:
+                self._installed_button.hide()
+            self.downloadButton.show()
 
     @Slot(int, int, int)
     def _update_column_widths(self, version_width: int, _branch_width: int, commit_time_width: int) -> None:
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from i18n import t
+from modules.build_info import LaunchOpenLast
+from modules.fonts import Fonts
+from modules.platform_utils import get_platform
+from modules.settings import get_default_delete_action, get_library_folder
+from PySide6.QtCore import QObject, Qt, Slot
+from PySide6.QtGui import QAction
+from widgets.base_menu_widget import BaseMenuWidget
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from widgets.base_list_widget import BaseListWidget
+    from widgets.library_widget import LibraryWidget
+    from windows.main_window import BlenderLauncher
+
+
+class LibraryContextMenu(QObject):
+    """
+    Context menus of the library widgets in one list.
+
+    Creating the menus and their actions for every row made building a large library noticeably slower, and
+    most rows never have their menu opened. Instead, each list creates one set of menus the first time a menu
+    is opened and points it at the clicked widget. Texts and visibility of the actions are derived from the
+    state of the widget every time the menu opens.
+    """
+
+    def __init__(self, list_widget: BaseListWidget, launcher: BlenderLauncher):
+        super().__init__(list_widget)
+        self.target: LibraryWidget | None = None
+        icons = launcher.icons
+
+        self.menu = BaseMenuWidget(parent=list_widget)
+        self.menu.setFont(Fonts.get().font_10)
+        self.menu_extended = BaseMenuWidget(parent=list_widget)
+        self.menu_extended.setFont(Fonts.get().font_10)
+
+        # For checking if shift is held on menus
+        self.menu.enable_shifting()
+        self.menu_extended.enable_shifting()
+        self.menu.holding_shift.connect(self.update_delete_action)
+        self.menu.holding_shift.connect(self.update_config_action)
+        self.menu_extended.holding_shift.connect(self.update_delete_action)
+
+        self.openRecentAction = self._action(t("act.a.prev"), lambda w: w.launch(launch_mode=LaunchOpenLast()))
+        self.openRecentAction.setIcon(icons.file)
+        self.openRecentAction.setToolTip(t("act.a.prev_tooltip"))
+
+        self.addToQuickLaunchAction = self._action(t("act.a.quick_launch"), lambda w: w.toggle_quick_launch())
+        self.addToQuickLaunchAction.setIcon(icons.quick_launch)
+
+        self.addToFavoritesAction = self._action(t("act.a.fav.add"), lambda w: w.add_to_favorites())
+        self.addToFavoritesAction.setIcon(icons.favorite)
+
+        self.removeFromFavoritesAction = self._action(t("act.a.fav.rem"), lambda w: w.remove_from_favorites())
+        self.removeFromFavoritesAction.setIcon(icons.favorite)
+
+        self.updateBlenderBuildAction = self._action(t("act.a.update"), lambda w: w.trigger_update_download())
+        self.updateBlenderBuildAction.setIcon(icons.update)
+        self.updateBlenderBuildAction.setToolTip(t("act.a.update_tooltip"))
+
+        self.debugMenu = BaseMenuWidget(t("act.a.d.d"), parent=list_widget)
+        self.debugMenu.setFont(Fonts.get().font_10)
+        for text, exe in (
+            ("act.a.d.log", "blender_debug_log.cmd"),
+            ("act.a.d.factory", "blender_factory_startup.cmd"),
+            ("act.a.d.gpu", "blender_debug_gpu.cmd"),
+            ("act.a.d.glitch", "blender_debug_gpu_glitchworkaround.cmd"),
+        ):
+            self.debugMenu.addAction(self._action(t(text), lambda w, exe=exe: w.launch(exe=exe)))
+
+        self.renameBranchAction = self._action(t("act.a.rename"), lambda w: w.rename_branch())
+
+        self.registerExtentionAction = self._action(t("act.a.register"), lambda w: w.register_extension())
+        self.registerExtentionAction.setToolTip(t("act.a.register_tooltip"))
+        self.registerExtentionAction.setVisible(get_platform() == "Windows")
+
+        self.createShortcutAction = self._action(t("act.a.shortcut"), lambda w: w.create_shortcut())
+        self.createSymlinkAction = self._action(t("act.a.symlink"), lambda w: w.create_symlink())
+        self.installTemplateAction = self._action(t("act.a.template"), lambda w: w.install_template())
+        self.makePortableAction = self._action(t("act.a.port.add"), lambda w: w.make_portable())
+        self.copyBuildHash = self._action(t("act.a.hash"), lambda w: w.copy_build_hash())
+        self.freezeUpdate = self._action(t("act.a.freeze.add"), lambda w: w.freeze_update())
+
+        self.showReleaseNotesAction = self._action(t("act.a.release_notes"), lambda w: w.show_release_notes())
+        self.fetchPrNameAction = self._action(t("act.a.fetch_pr_name"), lambda w: w.fetch_pr_name())
+
+        self.showBuildFolderAction = self._action(t("act.a.folder_build"), lambda w: w.show_build_folder())
+        self.showBuildFolderAction.setIcon(icons.folder)
+
+        self.showConfigFolderAction = self._action(t("act.a.config"), lambda w: w.show_config_folder())
+        self.showConfigFolderAction.setIcon(icons.folder)
+
+        self.editAction = self._action(t("act.a.edit"), lambda w: w.edit_build())
+        self.editAction.setIcon(icons.settings)
+
+        self.deleteAction = self._action(t("act.a.delete"), lambda w: w.ask_remove_from_drive())
+        self.deleteAction.setIcon(icons.delete)
+
+        # Actions applied to the whole selection
+        self.bulkAddToFavoritesAction = self._action(t("act.a.fav.add"), lambda w: w.set_selection_favorite(True))
+        self.bulkAddToFavoritesAction.setIcon(icons.favorite)
+
+        self.bulkRemoveFromFavoritesAction = self._action(t("act.a.fav.rem"), lambda w: w.set_selection_favorite(False))
+        self.bulkRemoveFromFavoritesAction.setIcon(icons.favorite)
+
+        self.bulkFreezeAction = self._action(t("act.a.freeze.add"), lambda w: w.set_selection_frozen(True))
+        self.bulkUnfreezeAction = self._action(t("act.a.freeze.rem"), lambda w: w.set_selection_frozen(False))
+
+        self.menu.addAction(self.openRecentAction)
+        self.menu.addAction(self.addToQuickLaunchAction)
+        self.menu.addAction(self.addToFavoritesAction)
+        self.menu.addAction(self.removeFromFavoritesAction)
+        self.menu.addAction(self.updateBlenderBuildAction)
+        self.menu.addMenu(self.debugMenu)
+        self.menu.addAction(self.renameBranchAction)
+        self.menu.addSeparator()
+        self.menu.addAction(self.registerExtentionAction)
+        self.menu.addAction(self.createShortcutAction)
+        self.menu.addAction(self.createSymlinkAction)
+        self.menu.addAction(self.installTemplateAction)
+        self.menu.addAction(self.makePortableAction)
+        self.menu.addAction(self.copyBuildHash)
+        self.menu.addAction(self.freezeUpdate)
+        self.menu.addSeparator()
+        self.menu.addAction(self.showReleaseNotesAction)
+        self.menu.addAction(self.fetchPrNameAction)
+        self.menu.addAction(self.showBuildFolderAction)
+        self.menu.addAction(self.showConfigFolderAction)
+        self.menu.addAction(self.editAction)
+        self.menu.addAction(self.deleteAction)
+
+        self.menu_extended.addAction(self.bulkAddToFavoritesAction)
+        self.menu_extended.addAction(self.bulkRemoveFromFavoritesAction)
+        self.menu_extended.addAction(self.bulkFreezeAction)
+        self.menu_extended.addAction(self.bulkUnfreezeAction)
+        self.menu_extended.addSeparator()
+        self.menu_extended.addAction(self.deleteAction)
+
+    @classmethod
+    def get(cls, list_widget: BaseListWidget, launcher: BlenderLauncher) -> LibraryContextMenu:
+        """The menus of ``list_widget``, created on first use."""
+        menu = list_widget.findChild(cls, options=Qt.FindChildOption.FindDirectChildrenOnly)
+        if menu is None:
+            menu = cls(list_widget, launcher)
+        return menu
+
+    def _action(self, text: str, slot: Callable[[LibraryWidget], object]) -> QAction:
+        action = QAction(text, self)
+        action.triggered.connect(lambda: self.target is not None and slot(self.target))
+        return action
+
+    def open(self, widget: LibraryWidget):
+        self.target = widget
+        self.update_delete_action(widget.hovering_and_shifting)
+        self.update_config_action(widget.hovering_and_shifting)
+
+        if len(widget.list_widget.selectedItems()) > 1:
+            widgets = widget.selected_widgets()
+            self.bulkAddToFavoritesAction.setVisible(any(w.child_widget is None for w in widgets))
+            self.bulkRemoveFromFavoritesAction.setVisible(any(w.child_widget is not None for w in widgets))
+            self.bulkFreezeAction.setVisible(any(not w.build_info.is_frozen for w in widgets))
+            self.bulkUnfreezeAction.setVisible(any(w.build_info.is_frozen for w in widgets))
+            self.deleteAction.setEnabled(not widget.busy)
+            self.menu_extended.trigger()
+            return
+
+        self.sync(widget)
+        self.menu.trigger()
+
+    def sync(self, widget: LibraryWidget):
+        """Show the state of ``widget`` in the actions of the single build menu."""
+        info = widget.build_info
+        favorite = widget.parent_widget is not None or widget.child_widget is not None
+        self.addToFavoritesAction.setVisible(not favorite)
+        self.removeFromFavoritesAction.setVisible(favorite)
+        self.updateBlenderBuildAction.setVisible(widget.update_action_visible)
+        self.renameBranchAction.setVisible(widget.parent_widget is not None)
+
+        self.addToQuickLaunchAction.setText(
+            t("act.a.quick_launch_rem") if widget.is_quick_launch_build() else t("act.a.quick_launch")
+        )
+        self.freezeUpdate.setText(t("act.a.freeze.rem") if info.is_frozen else t("act.a.freeze.add"))
+        self.makePortableAction.setText(
+            t("act.a.port.rem") if widget.make_portable_path().is_dir() else t("act.a.port.add")
+        )
+
+        self.deleteAction.setEnabled(not widget.busy)
+        self.installTemplateAction.setEnabled(not widget.busy)
+
+        link_path = Path(get_library_folder()) / "bl_symlink"
+        self.createSymlinkAction.setEnabled(
+            not (
+                link_path.exists()
+                and (link_path.is_dir() or link_path.is_symlink())
+                and link_path.resolve() == widget.link
+            )
+        )
+
+        self.fetchPrNameAction.setVisible(False)
+        self.showReleaseNotesAction.setText(t("act.a.release_notes"))
+        if widget.branch in {"stable", "lts", "bforartists", "daily"}:
+            self.showReleaseNotesAction.setVisible(True)
+        elif re.search(r"D\d{5}", info.branch):
+            self.showReleaseNotesAction.setText(t("act.a.release_notes_patch"))
+            self.showReleaseNotesAction.setVisible(True)
+        elif re.search(r"pr\d+", info.branch, flags=re.IGNORECASE):
+            self.showReleaseNotesAction.setText(t("act.a.release_notes_pr"))
+            self.showReleaseNotesAction.setVisible(True)
+            self.fetchPrNameAction.setVisible(True)
+        else:
+            self.showReleaseNotesAction.setVisible(False)
+
+    @Slot(bool)
+    def update_delete_action(self, shifting: bool):
+        reverted_behavior = get_default_delete_action() == 1
+        delete_from_drive = not reverted_behavior if shifting else reverted_behavior
+
+        if delete_from_drive:
+            self.deleteAction.setText(t("act.a.delete"))
+        else:
+            self.deleteAction.setText(t("act.a.trash"))
+
+    @Slot(bool)
+    def update_config_action(self, shifting: bool):
+        if self.target is None:
+            return
+
+        if self.target.make_portable_path().is_dir() and not shifting:
+            self.showConfigFolderAction.setText(t("act.a.config_portable"))
+        else:
+            self.showConfigFolderAction.setText(t("act.a.config"))
@@ -11,13 +11,12 @@ from typing import TYPE_CHECKING
 
 from i18n import t
 from items.base_list_widget_item import BaseListWidgetItem
-from modules.blender_update_manager import available_blender_update, is_major_version_update
+from modules.blender_update_manager import is_major_version_update
 from modules.build_info import (
     BuildInfo,
     LaunchMode,
     LaunchOpenLast,
     LaunchWithBlendFile,
-    WriteBuildTask,
     get_fork_config_paths,
     launch_build,
 )
@@ -36,24 +35,26 @@ from modules.settings import (
 )
 from modules.shortcut import generate_blender_shortcut, get_default_shortcut_destination
 from PySide6.QtCore import Qt, QUrl, Signal, Slot
-from PySide6.QtGui import QAction, QDesktopServices, QDragEnterEvent, QDragLeaveEvent, QDropEvent, QHoverEvent
+from PySide6.QtGui import QDesktopServices, QDragEnterEvent, QDragLeaveEvent, QDropEvent, QHoverEvent
 from PySide6.QtWidgets import QApplication, QHBoxLayout, QLabel, QWidget
+from threads.build_info_tasks import BulkWriteBuildTask, WriteBuildTask
 from threads.observer import Observer
 from threads.register import Register
 from threads.remover import RemovalTask
 from threads.template_installer import TemplateTask
 from widgets.base_build_widget import BaseBuildWidget
 from widgets.base_line_edit import BaseLineEdit
-from widgets.base_menu_widget import BaseMenuWidget
 from widgets.build_state_widget import BuildStateWidget
 from widgets.datetime_widget import DateTimeWidget
 from widgets.elided_text_label import ElidedTextLabel
 from widgets.left_icon_button_widget import LeftIconButtonWidget
+from widgets.library_context_menu import LibraryContextMenu
 from windows.custom_build_dialog_window import CustomBuildDialogWindow
 from windows.file_dialog_window import FileDialogWindow
 from windows.popup_window import Popup
 
 if TYPE_CHECKING:
+    from modules.blender_update_manager import UpdateResolver
     from widgets.base_list_widget import BaseListWidget
     from windows.main_window import BlenderLauncher
 
@@ -166,158 +167,15 @@ class LibraryWidget(BaseBuildWidget):
         self.launchButton.setCursor(Qt.CursorShape.PointingHandCursor)
         self.updateButton.setCursor(Qt.CursorShape.PointingHandCursor)
 
-        # Context menu
-        self.menu_extended = BaseMenuWidget(parent=self)
-        self.menu_extended.setFont(Fonts.get().font_10)
-
-        # For checking if shift is held on menus
-        self.menu.enable_shifting()
-        self.menu_extended.enable_shifting()
-        self.menu.holding_shift.connect(self.update_delete_action)
-        self.menu.holding_shift.connect(self.update_config_action)
-        self.menu_extended.holding_shift.connect(self.update_delete_action)
-
-        self.deleteAction = QAction(t("act.a.delete"), self)
-        self.deleteAction.setIcon(self.launcher.icons.delete)
-        self.deleteAction.triggered.connect(self.ask_remove_from_drive)
-
-        self.editAction = QAction(t("act.a.edit"), self)
-        self.editAction.setIcon(self.launcher.icons.settings)
-        self.editAction.triggered.connect(self.edit_build)
-
-        self.openRecentAction = QAction(t("act.a.prev"), self)
-        self.openRecentAction.setIcon(self.launcher.icons.file)
-        self.openRecentAction.triggered.connect(lambda: self.launch(launch_mode=LaunchOpenLast()))
-        self.openRecentAction.setToolTip(t("act.a.prev_tooltip"))
-
-        self.addToQuickLaunchAction = QAction(t("act.a.quick_launch"), self)
-        self.addToQuickLaunchAction.setIcon(self.launcher.icons.quick_launch)
-        self.addToQuickLaunchAction.triggered.connect(self.toggle_quick_launch)
-
-        self.addToFavoritesAction = QAction(t("act.a.fav.add"), self)
-        self.addToFavoritesAction.setIcon(self.launcher.icons.favorite)
-        self.addToFavoritesAction.triggered.connect(self.add_to_favorites)
-
-        self.removeFromFavoritesAction = QAction(t("act.a.fav.rem"), self)
-        self.removeFromFavoritesAction.setIcon(self.launcher.icons.favorite)
-        self.removeFromFavoritesAction.triggered.connect(self.remove_from_favorites)
-
-        if self.parent_widget is not None:
-            self.addToFavoritesAction.setVisible(False)
-        else:
-            self.removeFromFavoritesAction.setVisible(False)
-
-        self.updateBlenderBuildAction = QAction(t("act.a.update"))
-        self.updateBlenderBuildAction.setIcon(self.launcher.icons.update)
-        self.updateBlenderBuildAction.triggered.connect(self.trigger_update_download)
-        self.updateBlenderBuildAction.setToolTip(t("act.a.update_tooltip"))
-        self.updateBlenderBuildAction.setVisible(False)
-
-        self.fetchPrNameAction = QAction(t("act.a.fetch_pr_name"))
-        self.fetchPrNameAction.triggered.connect(self.fetch_pr_name)
-
-        self.registerExtentionAction = QAction(t("act.a.register"))
-        self.registerExtentionAction.setToolTip(t("act.a.register_tooltip"))
-        self.registerExtentionAction.triggered.connect(self.register_extension)
-
-        self.createShortcutAction = QAction(t("act.a.shortcut"))
-        self.createShortcutAction.triggered.connect(self.create_shortcut)
-
-        self.showBuildFolderAction = QAction(t("act.a.folder_build"))
-        self.showBuildFolderAction.setIcon(self.launcher.icons.folder)
-        self.showBuildFolderAction.triggered.connect(self.show_build_folder)
-
-        config_path = self.make_portable_path()
-
-        self.showConfigFolderAction = QAction(t("act.a.config_portable") if config_path.is_dir() else t("act.a.config"))
-        self.showConfigFolderAction.setIcon(self.launcher.icons.folder)
-        self.showConfigFolderAction.triggered.connect(self.show_config_folder)
-
-        self.createSymlinkAction = QAction(t("act.a.symlink"))
-        self.createSymlinkAction.triggered.connect(self.create_symlink)
-
-        self.installTemplateAction = QAction(t("act.a.template"))
-        self.installTemplateAction.triggered.connect(self.install_template)
-
-        self.makePortableAction = QAction(t("act.a.port.rem") if config_path.is_dir() else t("act.a.port.add"))
-        self.makePortableAction.triggered.connect(self.make_portable)
-
-        self.copyBuildHash = QAction(t("act.a.hash"))
-        self.copyBuildHash.triggered.connect(self.copy_build_hash)
-
-        self.freezeUpdate = QAction(t("act.a.freeze.rem") if self.build_info.is_frozen else t("act.a.freeze.add"))
-        self.freezeUpdate.triggered.connect(self.freeze_update)
-
-        self.debugMenu = BaseMenuWidget(t("act.a.d.d"), parent=self)
-        self.debugMenu.setFont(Fonts.get().font_10)
-
-        self.debugLogAction = QAction(t("act.a.d.log"))
-        self.debugLogAction.triggered.connect(lambda: self.launch(exe="blender_debug_log.cmd"))
-        self.debugFactoryStartupAction = QAction(t("act.a.d.factory"))
-        self.debugFactoryStartupAction.triggered.connect(lambda: self.launch(exe="blender_factory_startup.cmd"))
-        self.debugGpuTemplateAction = QAction(t("act.a.d.gpu"))
-        self.debugGpuTemplateAction.triggered.connect(lambda: self.launch(exe="blender_debug_gpu.cmd"))
-        self.debugGpuGWTemplateAction = QAction(t("act.a.d.glitch"))
-        self.debugGpuGWTemplateAction.triggered.connect(
-            lambda: self.launch(exe="blender_debug_gpu_glitchworkaround.cmd")
-        )
-
-        self.debugMenu.addAction(self.debugLogAction)
-        self.debugMenu.addAction(self.debugFactoryStartupAction)
-        self.debugMenu.addAction(self.debugGpuTemplateAction)
-        self.debugMenu.addAction(self.debugGpuGWTemplateAction)
-
-        self.menu.addAction(self.openRecentAction)
-        self.menu.addAction(self.addToQuickLaunchAction)
-        self.menu.addAction(self.addToFavoritesAction)
-        self.menu.addAction(self.removeFromFavoritesAction)
-        self.menu.addAction(self.updateBlenderBuildAction)
-        self.menu.addMenu(self.debugMenu)
-
-        if self.parent_widget is not None:
-            self.renameBranchAction = QAction(t("act.a.rename"))
-            self.renameBranchAction.triggered.connect(self.rename_branch)
-            self.menu.addAction(self.renameBranchAction)
-
-        self.menu.addSeparator()
-
-        if get_platform() == "Windows":
-            self.menu.addAction(self.registerExtentionAction)
-
-        self.menu.addAction(self.createShortcutAction)
-        self.menu.addAction(self.createSymlinkAction)
-        self.menu.addAction(self.installTemplateAction)
-        self.menu.addAction(self.makePortableAction)
-        self.menu.addAction(self.copyBuildHash)
-        self.menu.addAction(self.freezeUpdate)
-        self.menu.addSeparator()
-
-        if self.branch in {"stable", "lts", "bforartists", "daily"}:
-            self.menu.addAction(self.showReleaseNotesAction)
-        else:
-            exp = re.compile(r"D\d{5}")
-            if exp.search(self.build_info.branch):
-                self.showReleaseNotesAction.setText(t("act.a.release_notes_patch"))
-                self.menu.addAction(self.showReleaseNotesAction)
-            else:
-                exp = re.compile(r"pr\d+", flags=re.IGNORECASE)
-                if exp.search(self.build_info.branch):
-                    self.showReleaseNotesAction.setText(t("act.a.release_notes_pr"))
-                    self.menu.addAction(self.showReleaseNotesAction)
-                    self.menu.addAction(self.fetchPrNameAction)
-
-        self.menu.addAction(self.showBuildFolderAction)
-        self.menu.addAction(self.showConfigFolderAction)
-        self.menu.addAction(self.editAction)
-        self.menu.addAction(self.deleteAction)
-
-        self.menu_extended.addAction(self.deleteAction)
+        # The context menu is shared by every widget in the list, see LibraryContextMenu
+        self.busy = False
+        """Running or installing a template; the build can't be removed"""
+        self.update_action_visible = False
 
         if self.show_new:
             self.build_state_widget.setNewBuild(True)
 
         self.setEnabled(True)
-        self.list_widget.sortItems()
 
         if self.build_info.is_favorite and self.parent_widget is None:
             self.add_to_favorites()
@@ -342,39 +200,11 @@ class LibraryWidget(BaseBuildWidget):
         ][get_mark_as_favorite()]
 
     def context_menu(self):
-        self.update_delete_action(self.hovering_and_shifting)
-        self.update_config_action(self.hovering_and_shifting)
-
-        if len(self.list_widget.selectedItems()) > 1:
-            self.menu_extended.trigger()
-            return
-
-        self.createSymlinkAction.setEnabled(True)
-        link_path = Path(get_library_folder()) / "bl_symlink"
-
-        if link_path.exists() and (link_path.is_dir() or link_path.is_symlink()) and link_path.resolve() == self.link:
-            self.createSymlinkAction.setEnabled(False)
-
-        self.menu.trigger()
+        LibraryContextMenu.get(self.list_widget, self.launcher).open(self)
 
-    @Slot(bool)
-    def update_delete_action(self, shifting: bool):
-        reverted_behavior = get_default_delete_action() == 1
-        delete_from_drive = not reverted_behavior if shifting else reverted_behavior
-
-        if delete_from_drive:
-            self.deleteAction.setText(t("act.a.delete"))
-        else:
-            self.deleteAction.setText(t("act.a.trash"))
-
-    @Slot(bool)
-    def update_config_action(self, shifting: bool):
-        config_path = self.make_portable_path()
-
-        if config_path.is_dir() and not shifting:
-            self.showConfigFolderAction.setText(t("act.a.config_portable"))
-        else:
-            self.showConfigFolderAction.setText(t("act.a.config"))
+    def is_quick_launch_build(self) -> bool:
+        build = self.launcher.quick_launch_handler.quick_launch_build
+        return build is not None and build in (self, self.parent_widget, self.child_widget)
 
     def mouseDoubleClickEvent(self, _event):
         if self.hovering_and_shifting:
@@ -467,8 +297,7 @@ class LibraryWidget(BaseBuildWidget):
     def install_template(self):
         self.launchButton.set_text(t("act.updating"))
         self.launchButton.setEnabled(False)
-        self.deleteAction.setEnabled(False)
-        self.installTemplateAction.setEnabled(False)
+        self.busy = True
         a = TemplateTask(self.link)
         a.finished.connect(self.install_template_finished)
         self.launcher.task_queue.append(a)
@@ -476,8 +305,7 @@ class LibraryWidget(BaseBuildWidget):
     def install_template_finished(self):
         self.launchButton.set_text(t("act.launch"))
         self.launchButton.setEnabled(True)
-        self.deleteAction.setEnabled(True)
-        self.installTemplateAction.setEnabled(True)
+        self.busy = False
 
     def launch(self, update_selection=False, exe=None, launch_mode: LaunchMode | None = None):
         if update_selection is True:
@@ -521,9 +349,9 @@ class LibraryWidget(BaseBuildWidget):
         """Hide update button and reset layout."""
         self.updateButton.hide()
         self.launchButton.setFixedWidth(95)
-        self.updateBlenderBuildAction.setVisible(False)
+        self.update_action_visible = False
 
-    def check_for_updates(self, available_downloads):
+    def check_for_updates(self, resolver: UpdateResolver):
         logger.debug(
             f"Checking for updates for {self.build_info.semversion.replace(prerelease=None)} in {self.build_info.branch} branch."
         )
@@ -533,11 +361,11 @@ class LibraryWidget(BaseBuildWidget):
             self._hide_update_button()
             return False
 
-        update = available_blender_update(self.build_info, available_downloads, self.list_widget.items())
+        update = resolver.resolve(self.build_info)
         if update:
-            if get_show_update_button():
+            if resolver.settings.show_update_button:
                 self.show_update_button()
-                self.updateBlenderBuildAction.setVisible(True)
+                self.update_action_visible = True
             else:
                 self._hide_update_button()
 
@@ -649,8 +477,7 @@ class LibraryWidget(BaseBuildWidget):
             self.child_widget.proc_count_changed(count)
 
     def observer_started(self):
-        self.deleteAction.setEnabled(False)
-        self.installTemplateAction.setEnabled(False)
+        self.busy = True
 
         action = get_on_blender_launch_action()
         if action == 1:
@@ -664,8 +491,7 @@ class LibraryWidget(BaseBuildWidget):
     def observer_finished(self):
         self.observer = None
         self.build_state_widget.setCount(0)
-        self.deleteAction.setEnabled(True)
-        self.installTemplateAction.setEnabled(True)
+        self.busy = False
 
         if self.child_widget is not None:
             self.child_widget.observer_finished()
@@ -678,15 +504,11 @@ class LibraryWidget(BaseBuildWidget):
 
         if config_path.is_dir():
             retry_on_permission_error(config_path.rename, _config_path)
-            self.makePortableAction.setText(t("act.a.port.add"))
-            self.showConfigFolderAction.setText(t("act.a.config"))
         else:
             if _config_path.is_dir():
                 retry_on_permission_error(_config_path.rename, config_path)
             else:
                 config_path.mkdir(parents=False, exist_ok=True)
-            self.makePortableAction.setText(t("act.a.port.rem"))
-            self.showConfigFolderAction.setText(t("act.a.config_portable"))
 
     def make_portable_path(self) -> Path:
         version = self.build_info.subversion.rsplit(".", 1)[0]
@@ -719,16 +541,14 @@ class LibraryWidget(BaseBuildWidget):
 
     @Slot()
     def freeze_update(self):
-        if self.build_info.is_frozen:
-            self.build_info.is_frozen = False
-            self.freezeUpdate.setText(t("act.a.freeze.add"))
-        else:
-            self.build_info.is_frozen = True
-            self.freezeUpdate.setText(t("act.a.freeze.rem"))
-            self._hide_update_button()
-
+        self.set_frozen(not self.build_info.is_frozen)
         self.write_build_info()
 
+    def set_frozen(self, frozen: bool):
+        self.build_info.is_frozen = frozen
+        if frozen:
+            self._hide_update_button()
+
     @Slot()
     def rename_branch(self):
         self.lineEdit.setText(self.branchLabel.text)
@@ -821,10 +641,7 @@ class LibraryWidget(BaseBuildWidget):
 
     @Slot()
     def remove_from_drive_extended(self):
-        for item in self.list_widget.selectedItems():
-            widget = self.list_widget.itemWidget(item)
-            if widget is not None and isinstance(widget, LibraryWidget):
-                widget.remove_from_drive()
+        self.remove_selection(trash=False)
 
     @Slot()
     def remove_from_drive(self, trash=False):
@@ -855,10 +672,7 @@ class LibraryWidget(BaseBuildWidget):
 
     @Slot()
     def send_to_trash_extended(self):
-        for item in self.list_widget.selectedItems():
-            widget = self.list_widget.itemWidget(item)
-            if widget is not None and isinstance(widget, LibraryWidget):
-                widget.remove_from_drive(trash=True)
+        self.remove_selection(trash=True)
 
     @Slot()
     def send_to_trash(self):
@@ -886,6 +700,45 @@ class LibraryWidget(BaseBuildWidget):
         self.setEnabled(True)
         return
 
+    def selected_widgets(self) -> list[LibraryWidget]:
+        """Library page widgets of the selected items. Favorites resolve to the build they mirror."""
+        widgets: dict[LibraryWidget, None] = {}
+        for item in self.list_widget.selectedItems():
+            widget = self.list_widget.itemWidget(item)
+            if isinstance(widget, LibraryWidget):
+                widgets[widget.parent_widget or widget] = None
+        return list(widgets)
+
+    def remove_selection(self, trash: bool):
+        widgets = self.selected_widgets()
+        if widgets:
+            self.launcher.remove_builds([Path(get_library_folder()) / w.link for w in widgets], trash=trash)
+
+    def set_selection_favorite(self, favorite: bool):
+        changed = []
+        for widget in self.selected_widgets():
+            if favorite and widget.child_widget is None:
+                # Marking it first keeps add_to_favorites from writing each build on its own
+                widget.build_info.is_favorite = True
+                widget.add_to_favorites()
+                changed.append(widget)
+            elif not favorite and widget.child_widget is not None:
+                widget.detach_from_favorites()
+                changed.append(widget)
+
+        self.write_build_infos(changed)
+
+    def set_selection_frozen(self, frozen: bool):
+        changed = [w for w in self.selected_widgets() if w.build_info.is_frozen != frozen]
+        for widget in changed:
+            widget.set_frozen(frozen)
+
+        self.write_build_infos(changed)
+
+    def write_build_infos(self, widgets: list[LibraryWidget]):
+        if widgets:
+            self.launcher.task_queue.append(BulkWriteBuildTask([(w.link, w.build_info) for w in widgets]))
+
     @Slot()
     def edit_build(self):
         dlg = CustomBuildDialogWindow(self.launcher, Path(self.build_info.link), self.build_info)
@@ -910,30 +763,23 @@ class LibraryWidget(BaseBuildWidget):
 
         self.launchButton.setIcon(self.launcher.icons.quick_launch)
 
-        self.addToQuickLaunchAction.setText(t("act.a.quick_launch_rem"))
-
         # TODO Make more optimal and simpler synchronization
         if self.parent_widget is not None:
             self.parent_widget.launchButton.setIcon(self.launcher.icons.quick_launch)
-            self.parent_widget.addToQuickLaunchAction.setText(t("act.a.quick_launch_rem"))
 
         if self.child_widget is not None:
             self.child_widget.launchButton.setIcon(self.launcher.icons.quick_launch)
-            self.child_widget.addToQuickLaunchAction.setText(t("act.a.quick_launch_rem"))
 
     @Slot()
     def remove_from_quick_launch(self):
         self.launchButton.setIcon(self.launcher.icons.fake)
-        self.addToQuickLaunchAction.setText(t("act.a.quick_launch"))
 
         # TODO Make more optimal and simpler synchronization
         if self.parent_widget is not None:
             self.parent_widget.launchButton.setIcon(self.launcher.icons.fake)
-            self.parent_widget.addToQuickLaunchAction.setText(t("act.a.quick_launch"))
 
         if self.child_widget is not None:
             self.child_widget.launchButton.setIcon(self.launcher.icons.fake)
-            self.child_widget.addToQuickLaunchAction.setText(t("act.a.quick_launch"))
 
     @Slot()
     def add_to_favorites(self):
@@ -960,14 +806,17 @@ class LibraryWidget(BaseBuildWidget):
         self.launcher.FavoritesPage.list_widget.insert_item(item, widget)
         self.child_widget = widget
 
-        self.removeFromFavoritesAction.setVisible(True)
-        self.addToFavoritesAction.setVisible(False)
         if self.build_info.is_favorite is False:
             self.build_info.is_favorite = True
             self.write_build_info()
 
     @Slot()
     def remove_from_favorites(self):
+        self.detach_from_favorites()
+        self.build_info_writer = WriteBuildTask(self.link, self.build_info)
+        self.launcher.task_queue.append(self.build_info_writer)
+
+    def detach_from_favorites(self):
         # Either side may be None if a reload destroyed its counterpart.
         if self.list_widget is self.launcher.FavoritesPage.list_widget:
             fav_widget = self
@@ -981,12 +830,8 @@ class LibraryWidget(BaseBuildWidget):
 
         if lib_widget is not None:
             lib_widget.child_widget = None
-            lib_widget.removeFromFavoritesAction.setVisible(False)
-            lib_widget.addToFavoritesAction.setVisible(True)
 
         self.build_info.is_favorite = False
-        self.build_info_writer = WriteBuildTask(self.link, self.build_info)
-        self.launcher.task_queue.append(self.build_info_writer)
 
     @Slot()
     def register_extension(self):
@@ -6,7 +6,7 @@ from enum import Enum
 from typing import TYPE_CHECKING, cast
 
 from i18n import t
-from modules.build_info import BuildInfo, ReadBuildTask, parse_blender_ver
+from modules.build_info import BuildInfo, parse_blender_ver
 from modules.platform_utils import get_platform
 from PySide6.QtCore import QDateTime, Qt, Signal
 from PySide6.QtWidgets import (
@@ -22,6 +22,7 @@ from PySide6.QtWidgets import (
     QVBoxLayout,
     QWidget,
 )
+from threads.build_info_tasks import ReadBuildTask
 from widgets.lintable_line_edit import LintableLineEdit
 from windows.base_window import BaseWindow
 
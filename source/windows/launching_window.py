@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-import contextlib
-import json
 import logging
 from pathlib import Path
 
@@ -16,12 +14,12 @@ from modules.settings import (
     set_version_specific_queries,
 )
 from modules.tasks import TaskQueue
-from modules.version_matcher import VALID_QUERIES, VersionSearchQuery
+from modules.version_matcher import VALID_QUERIES, BuildIndex, VersionSearchQuery
 from modules.version_matcher import BasicBuildInfo as BBI
 from PySide6.QtCore import Qt, QTimer, Slot
 from PySide6.QtGui import QFont, QFontMetrics, QKeyEvent
 from PySide6.QtWidgets import QApplication, QComboBox, QGridLayout, QLabel, QListWidget, QPushButton, QWidget
-from threads.library_drawer import DrawLibraryTask
+from threads.library_drawer import LibraryIndexTask
 from widgets.lintable_line_edit import LintableLineEdit
 from windows.base_window import BaseWindow
 
@@ -56,10 +54,11 @@ class LaunchingWindow(BaseWindow):
         self.builds: dict[str, BuildInfo] = {}
         self.list_items: dict[BBI, EnablableListWidgetItem] = {}
         self.label_elements: dict[BBI, tuple[str, str, str, str]] = {}
-        self.drawing_task = DrawLibraryTask()
-        self.drawing_task.found.connect(self._build_found)
-        self.drawing_task.finished.connect(self.search_finished)
-        self.task_queue.append(self.drawing_task)
+        self.build_index = BuildIndex()
+        # The library index holds the build info of every build, so the library isn't scanned
+        self.index_task = LibraryIndexTask()
+        self.index_task.finished.connect(self._builds_found)
+        self.task_queue.append(self.index_task)
 
         self.launch_timer = QTimer(self)
         self.launch_timer.setSingleShot(True)
@@ -229,30 +228,31 @@ class LaunchingWindow(BaseWindow):
             self.update_query_from_edits()
             self.update_search()
 
-    @Slot(Path)
-    def _build_found(self, pth: Path):
-        # read the build info file and add it to the list
-        if (blinfo := pth / ".blinfo").exists():
-            with blinfo.open("r", encoding="utf-8") as f:
-                blinfo = json.load(f)
-            with contextlib.suppress(Exception):
-                info = BuildInfo.from_dict(str(pth), blinfo["blinfo"][0])
-
+    @Slot(list)
+    def _builds_found(self, builds: list[tuple[Path, BuildInfo]]):
+        for _, info in builds:
+            try:
                 semversion = self.__version_url(info)
-                combined_url = " ".join(semversion)
-
-                item = EnablableListWidgetItem(
-                    enabled_font=self.__enabled_font,
-                    disable_font=self.__disabled_font,
-                    build=info,
-                    parent=self.builds_list,
-                )
-                item.setText(combined_url)
                 basic_info = BBI.from_buildinfo(info)
+            except Exception as e:
+                logger.debug(f"Skipping {info.link}: {e}")
+                continue
+            combined_url = " ".join(semversion)
+
+            item = EnablableListWidgetItem(
+                enabled_font=self.__enabled_font,
+                disable_font=self.__disabled_font,
+                build=info,
+                parent=self.builds_list,
+            )
+            item.setText(combined_url)
+
+            self.builds[combined_url] = info
+            self.list_items[basic_info] = item
+            self.label_elements[basic_info] = semversion
+            self.build_index.add(basic_info)
 
-                self.builds[combined_url] = info
-                self.list_items[basic_info] = item
-                self.label_elements[basic_info] = semversion
+        self.search_finished()
 
     @staticmethod
     def __version_url(info: BuildInfo) -> tuple[str, str, str, str]:
@@ -379,15 +379,11 @@ class LaunchingWindow(BaseWindow):
             else:
                 self.prepare_launch(build)
 
-    def make_basic_info(self) -> list[BBI]:
-        return list(map(BBI.from_buildinfo, self.builds.values()))
-
     def update_search(self) -> tuple[list[BBI], list[BuildInfo]]:
         """Updates the visibility of each item in the list depending on the search query. returns matches"""
         assert self.version_query is not None
         logger.debug(f"QUERY: {self.version_query!r}")
-        builds = self.make_basic_info()
-        matches = self.version_query.match(builds)
+        matches = self.build_index.match(self.version_query)
         versions = {b.version for b in matches}
 
         enabled_builds: list[BuildInfo] = []
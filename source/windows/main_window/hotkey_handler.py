@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+from functools import cache
 from typing import TYPE_CHECKING
 
 from i18n import t
@@ -13,13 +14,16 @@ from windows.popup_window import Popup
 if TYPE_CHECKING:
     from .window import BlenderLauncher
 
-try:
-    from pynput import keyboard
 
-    HOTKEYS_AVAILABLE = True
-except Exception as e:
-    logging.exception(f"Error importing pynput: {e}\nGlobal hotkeys not supported.")
-    HOTKEYS_AVAILABLE = False
+@cache
+def _keyboard():
+    """pynput's keyboard module, imported when hotkeys are first set up. None if global hotkeys are not supported."""
+    try:
+        from pynput import keyboard
+    except Exception as e:
+        logging.exception(f"Error importing pynput: {e}\nGlobal hotkeys not supported.")
+        return None
+    return keyboard
 
 
 class HotkeyHandler(QObject):
@@ -38,7 +42,7 @@ class HotkeyHandler(QObject):
         self.__hk_listener = None
 
     def setup(self):
-        if HOTKEYS_AVAILABLE:
+        if (keyboard := _keyboard()) is not None:
             self.stop()
             key_seq = get_quick_launch_key_seq()
             keys = key_seq.split("+")
@@ -16,7 +16,7 @@ from i18n import t
 from items.base_list_widget_item import BaseListWidgetItem
 from modules._resources_rc import RESOURCES_AVAILABLE
 from modules.bl_instance_handler import BLInstanceHandler
-from modules.build_info import ReadBuildTask
+from modules.blender_update_manager import UpdateResolver
 from modules.connection_manager import ConnectionManager
 from modules.enums import MessageType
 from modules.file_utils import retry_on_permission_error
@@ -29,9 +29,11 @@ from modules.platform_utils import (
     is_frozen,
 )
 from modules.settings import (
+    build_library_folders,
     create_library_folders,
     get_check_for_new_builds_automatically,
     get_check_for_new_builds_on_startup,
+    get_default_delete_action,
     get_default_downloads_page,
     get_default_library_page,
     get_default_tab,
@@ -46,6 +48,7 @@ from modules.settings import (
     get_new_builds_check_frequency,
     get_proxy_type,
     get_purge_temp_on_startup,
+    get_retention_enabled,
     get_scrape_bfa_builds,
     get_scrape_daily_builds,
     get_scrape_experimental_builds,
@@ -85,8 +88,12 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 from semver import Version
-from threads.library_drawer import DrawLibraryTask
-from threads.remover import RemovalTask, purge_temp_folder
+from threads.build_info_tasks import ReadBuildTask
+from threads.disk_usage import DiskUsageTask
+from threads.extractor import clean_up_interrupted_extractions
+from threads.library_drawer import DrawLibraryTask, LibraryIndexTask
+from threads.remover import BulkRemovalTask, RemovalTask, get_reaper, purge_temp_folder
+from threads.retention import RetentionTask
 from threads.scraper import Scraper
 from widgets.base_page_widget import BasePageWidget
 from widgets.base_tool_box_widget import BaseToolBoxWidget
@@ -109,6 +116,7 @@ from .tray_handler import TrayHandler
 
 if TYPE_CHECKING:
     from modules.build_info import BuildInfo
+    from threads.retention import RetentionPlan
 
 # if get_platform() == "Windows":
 #     from PySide6.QtWinExtras import QWinThumbnailToolBar, QWinThumbnailToolButton
@@ -233,6 +241,10 @@ class BlenderLauncher(BaseWindow):
 
         create_library_folders(get_library_folder())
 
+        # Finish removals and extractions interrupted in a previous session
+        clean_up_interrupted_extractions(Path(get_library_folder()) / folder for folder in build_library_folders)
+        get_reaper().wake()
+
         # Purge temp folder on startup if enabled
         if get_purge_temp_on_startup():
             purge_temp_folder()
@@ -624,11 +636,22 @@ class BlenderLauncher(BaseWindow):
         self.library_drawer = DrawLibraryTask()
         self.library_drawer.found.connect(self.draw_to_library)
         self.library_drawer.unrecognized.connect(self.draw_unrecognized)
+        self.library_drawer.finished.connect(self.refresh_disk_usage)
+        self.library_drawer.finished.connect(self.refresh_library_index)
         if not self.offline:
             self.library_drawer.finished.connect(self.draw_downloads)
 
         self.task_queue.append(self.library_drawer)
 
+    def refresh_disk_usage(self):
+        task = DiskUsageTask()
+        task.finished.connect(self.LibraryPage.update_disk_usage)
+        task.finished.connect(self.FavoritesPage.update_disk_usage)
+        self.task_queue.append(task)
+
+    def refresh_library_index(self):
+        self.task_queue.append(LibraryIndexTask(verify=True))
+
     def reload_custom_builds(self):
         self.LibraryPage.list_widget.clear_by_folder("custom")
         self.library_drawer = DrawLibraryTask(["custom"])
@@ -645,11 +668,15 @@ class BlenderLauncher(BaseWindow):
         self.scraper_finished_signal.connect(self.check_library_for_updates)
 
     def check_library_for_updates(self):
-        all_downloads = self.DownloadsPage.findChildren(DownloadWidget)
         library_list = self.LibraryPage.list_widget
+        # Downloads are indexed and the settings read once for the whole library
+        resolver = UpdateResolver(
+            self.DownloadsPage.findChildren(DownloadWidget),
+            (widget.build_info for widget in library_list.items()),
+        )
         for library_widget in library_list.widgets:
             if isinstance(library_widget, LibraryWidget) and library_widget.link.parent.name != "custom":
-                library_widget.check_for_updates(all_downloads)
+                library_widget.check_for_updates(resolver)
 
     def connection_error(self):
         logger.error("Connection_error")
@@ -728,6 +755,7 @@ class BlenderLauncher(BaseWindow):
         else:
             self.stop_auto_scrape_timer()
         self.ready_to_scrape()
+        self.run_retention()
 
     def ready_to_scrape(self):
         self.app_state = AppState.IDLE
@@ -875,6 +903,8 @@ class BlenderLauncher(BaseWindow):
         assert lst is not None
         self.TabWidget.setCurrentWidget(tab)
         lst.setFocus(Qt.FocusReason.ShortcutFocusReason)
+        # Only the widgets of the rows in view are shown
+        lst.scroll_to_widget(widget)
         widget.setFocus(Qt.FocusReason.ShortcutFocusReason)
 
     def set_version(self, latest_tag, version_notes):
@@ -913,6 +943,79 @@ class BlenderLauncher(BaseWindow):
         a = RemovalTask(path)
         self.task_queue.append(a)
 
+    def remove_builds(self, paths: list[Path], trash: bool):
+        """Remove library builds in one batched task and update the lists once it is done."""
+        library = self.LibraryPage.list_widget
+        widgets = {Path(get_library_folder()) / w.link: w for w in library.widgets if isinstance(w, LibraryWidget)}
+        for path in paths:
+            if (widget := widgets.get(path)) is not None:
+                widget.remover_started()
+
+        task = BulkRemovalTask(paths, trash=trash)
+        task.progress.connect(self.bulk_remover_progress)
+        task.finished.connect(self.bulk_remover_completed)
+        self.task_queue.append(task)
+
+    @Slot(int, int)
+    def bulk_remover_progress(self, done: int, total: int):
+        self.status_bar.showMessage(t("act.prog.removing", done=done, total=total))
+
+    @Slot(list, list)
+    def bulk_remover_completed(self, removed: list[Path], failed: list[Path]):
+        self.status_bar.clearMessage()
+
+        library = self.LibraryPage.list_widget
+        widgets = {Path(get_library_folder()) / w.link: w for w in library.widgets if isinstance(w, LibraryWidget)}
+        removed_widgets = [w for path in removed if (w := widgets.get(path)) is not None]
+
+        self.FavoritesPage.list_widget.remove_items(
+            [w.child_widget.item for w in removed_widgets if w.child_widget is not None]
+        )
+        library.remove_items([w.item for w in removed_widgets])
+
+        for path in failed:
+            if (widget := widgets.get(path)) is not None:
+                widget.remover_completed(1)
+
+    def run_retention(self, dry_run=False):
+        if not dry_run and not get_retention_enabled():
+            return
+
+        library = self.LibraryPage.list_widget
+        running = frozenset(
+            Path(get_library_folder()) / w.link
+            for w in library.widgets
+            if isinstance(w, LibraryWidget) and w.observer is not None
+        )
+        task = RetentionTask(dry_run=dry_run, running=running)
+        task.planned.connect(self.retention_planned)
+        self.task_queue.append(task)
+
+    @Slot(object, bool)
+    def retention_planned(self, plan: RetentionPlan, dry_run: bool):
+        if dry_run:
+            Popup.info(message=self.retention_report(plan), parent=self)
+            return
+
+        trash = get_default_delete_action() == 0
+        for batch in plan.batches():
+            self.remove_builds(batch, trash=trash)
+
+    @staticmethod
+    def retention_report(plan: RetentionPlan, limit: int = 15) -> str:
+        if not plan.remove:
+            return t("msg.popup.retention.nothing")
+
+        lines = [t("msg.popup.retention.report", count=len(plan.remove), kept=plan.kept)]
+        if plan.freed_bytes is not None:
+            lines.append(t("msg.popup.retention.freed", size=f"{plan.freed_bytes / 1024**3:.2f}"))
+        lines.extend(
+            f" - {path.name}: {t(f'msg.popup.retention.{reason.value}')}" for path, reason in plan.remove[:limit]
+        )
+        if len(plan.remove) > limit:
+            lines.append(t("msg.popup.retention.more", count=len(plan.remove) - limit))
+        return "\n".join(lines)
+
     def quit_(self):
         busy = self.task_queue.get_busy_threads()
         if any(busy):
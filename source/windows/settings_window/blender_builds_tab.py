@@ -24,6 +24,10 @@ from modules.settings import (
     get_on_blender_launch_action,
     get_prepend_prnum_on_prlabel,
     get_quick_launch_key_seq,
+    get_retention_enabled,
+    get_retention_keep_newest,
+    get_retention_max_age,
+    get_retention_max_size,
     get_show_bfa_update_button,
     get_show_daily_archive_builds,
     get_show_daily_update_button,
@@ -56,6 +60,10 @@ from modules.settings import (
     set_on_blender_launch_action,
     set_prepend_prnum_on_prlabel,
     set_quick_launch_key_seq,
+    set_retention_enabled,
+    set_retention_keep_newest,
+    set_retention_max_age,
+    set_retention_max_size,
     set_scrape_bfa_builds,
     set_scrape_daily_builds,
     set_scrape_experimental_builds,
@@ -296,6 +304,43 @@ class BlenderBuildsTabWidget(SettingsFormWidget):
                 setter=set_install_template,
             )
 
+        # Retention policy
+        with self.group("settings.blender_builds.retention.title") as grp:
+            with grp.checked_vgroup(
+                "settings.blender_builds.retention.enabled",
+                default=get_retention_enabled(),
+                setter=set_retention_enabled,
+                margin=True,
+            ) as retention:
+                retention.add_spin(
+                    "settings.blender_builds.retention.keep_newest",
+                    default=get_retention_keep_newest(),
+                    setter=set_retention_keep_newest,
+                    min_=0,
+                    max_=100,
+                )
+                max_age = retention.add_spin(
+                    "settings.blender_builds.retention.max_age",
+                    default=get_retention_max_age(),
+                    setter=set_retention_max_age,
+                    min_=0,
+                    max_=3650,
+                )
+                max_age.setSuffix(t("settings.blender_builds.retention.max_age_suffix"))
+                max_size = retention.add_spin(
+                    "settings.blender_builds.retention.max_size",
+                    default=get_retention_max_size(),
+                    setter=set_retention_max_size,
+                    min_=0,
+                    max_=10000,
+                )
+                max_size.setSuffix(" GB")
+
+            grp.add_button(
+                "settings.blender_builds.retention.preview",
+                clicked=lambda: self.launcher.run_retention(dry_run=True),
+            )
+
         with self.group("settings.blender_builds.pr_custom_names.title") as grp:
             grp.add_checkbox(
                 "settings.blender_builds.pr_custom_names.fetch_during_scrape",
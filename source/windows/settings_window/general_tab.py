@@ -11,6 +11,7 @@ from modules.settings import (
     delete_action,
     get_actual_library_folder,
     get_config_file,
+    get_deduplicate_builds,
     get_default_delete_action,
     get_language,
     get_launch_minimized_to_tray,
@@ -21,10 +22,12 @@ from modules.settings import (
     get_purge_temp_on_startup,
     get_show_tray_icon,
     get_use_pre_release_builds,
+    get_use_system_decompressors,
     get_worker_thread_count,
     log_levels,
     migrate_config,
     set_auto_register_winget,
+    set_deduplicate_builds,
     set_default_delete_action,
     set_language,
     set_launch_minimized_to_tray,
@@ -35,6 +38,7 @@ from modules.settings import (
     set_purge_temp_on_startup,
     set_show_tray_icon,
     set_use_pre_release_builds,
+    set_use_system_decompressors,
     set_worker_thread_count,
     user_config,
 )
@@ -43,6 +47,7 @@ from modules.winget_integration import register_with_winget, unregister_from_win
 from PySide6.QtCore import QUrl
 from PySide6.QtGui import QDesktopServices
 from PySide6.QtWidgets import QComboBox, QPushButton
+from threads.deduplicator import DedupTask
 from threads.remover import purge_temp_folder
 from utils.i18n_init import Language
 from widgets.folder_select import FolderSelector
@@ -206,6 +211,22 @@ class GeneralTabWidget(SettingsFormWidget):
             )
             # Purge Temp Now
             grp.add_button("settings.general.advanced.purge_temp_now", clicked=self.purge_temp_now)
+            # System Decompressors
+            grp.add_checkbox(
+                "settings.general.advanced.system_decompressors",
+                default=get_use_system_decompressors(),
+                setter=set_use_system_decompressors,
+            )
+            # Deduplicate Builds
+            grp.add_checkbox(
+                "settings.general.advanced.deduplicate_builds",
+                default=get_deduplicate_builds(),
+                setter=set_deduplicate_builds,
+            )
+            self.deduplicate_now_button = grp.add_button(
+                "settings.general.advanced.deduplicate_now",
+                clicked=self.deduplicate_now,
+            )
 
         # Logging
         with self.group("settings.general.logging.label") as grp:
@@ -308,6 +329,19 @@ class GeneralTabWidget(SettingsFormWidget):
     def toggle_purge_temp_on_startup(self, is_checked):
         set_purge_temp_on_startup(is_checked)
 
+    def deduplicate_now(self):
+        self.deduplicate_now_button.setEnabled(False)
+        task = DedupTask()
+        task.finished.connect(self._deduplicate_finished)
+        self.launcher.task_queue.append(task)
+
+    def _deduplicate_finished(self, linked_files: int, saved_bytes: int):
+        self.deduplicate_now_button.setEnabled(True)
+        Popup.info(
+            message=t("msg.popup.dedup.finished", files=linked_files, size=f"{saved_bytes / 1024**3:.2f}"),
+            parent=self.launcher,
+        )
+
     def purge_temp_now(self):
         success = purge_temp_folder()
         if success:
@@ -5,7 +5,6 @@ import logging
 import os
 from typing import TypedDict
 
-import distro
 from modules.platform_utils import _popen, get_cwd, get_platform
 from modules.tasks import TaskQueue
 from PySide6.QtCore import Qt
@@ -102,6 +101,8 @@ class BlenderLauncherUpdater(BaseWindow):
         if release is None:
             return release_link.format(self.release_tag, self.platform)
 
+        import distro
+
         for key in (
             distro.id().title(),
             distro.like().title(),
@@ -129,7 +130,7 @@ class BlenderLauncherUpdater(BaseWindow):
     def extract(self, source):
         self.ProgressBar.set_state(self.ProgressBar.State.EXTRACTING)
         self.source_zip = source
-        a = ExtractTask(source, self.cwd)
+        a = ExtractTask(source, self.cwd, staged=False)
         a.progress.connect(self.ProgressBar.set_progress)
         a.finished.connect(self.finish)
         self.queue.append(a)
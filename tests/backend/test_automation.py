@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+
+from source.modules.build_info import BuildInfo
+
+ROOT = Path(__file__).parents[2]
+
+pytestmark = pytest.mark.skipif(sys.platform != "linux", reason="the config folder is set through XDG_CONFIG_HOME")
+
+
+@pytest.fixture
+def launcher(tmp_path: Path):
+    """Runs ``main.py`` with a config whose library holds daily builds of 4.2.0 to 4.2.4."""
+    library = tmp_path / "library"
+    for patch in range(5):
+        build = library / "daily" / f"blender-4.2.{patch}"
+        build.mkdir(parents=True)
+        (build / "blender").write_text("#!/bin/sh\n")
+        commit_time = datetime(2025, 1, 1 + patch, tzinfo=UTC)
+        BuildInfo(build.as_posix(), f"4.2.{patch}", f"{patch:012x}", commit_time, "daily").write_to(build)
+
+    config = tmp_path / "config" / "Blender Launcher"
+    config.mkdir(parents=True)
+    (config / "Blender Launcher.ini").write_text(f"[General]\nlibrary_folder={library.as_posix()}\n", encoding="utf-8")
+    env = os.environ | {
+        "XDG_CONFIG_HOME": str(tmp_path / "config"),
+        "XDG_CACHE_HOME": str(tmp_path / "cache"),
+        "QT_QPA_PLATFORM": "offscreen",
+    }
+
+    def run(*args: str) -> tuple[int, dict]:
+        result = subprocess.run(
+            [sys.executable, str(ROOT / "source" / "main.py"), *args, "--json"],
+            cwd=tmp_path,
+            env=env,
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+        # The log goes to stderr, stdout is only the result
+        return result.returncode, json.loads(result.stdout) if result.stdout else {}
+
+    return library, run
+
+
+def test_list(launcher):
+    library, run = launcher
+
+    code, result = run("list")
+    assert code == 0
+    assert [b["subversion"] for b in result["builds"]] == ["4.2.4", "4.2.3", "4.2.2", "4.2.1", "4.2.0"]
+    assert result["builds"][0]["link"] == (library / "daily" / "blender-4.2.4").as_posix()
+
+    code, result = run("list", "-v", "4.2.-")
+    assert code == 0
+    assert [b["subversion"] for b in result["builds"]] == ["4.2.0"]
+
+    code, result = run("list", "-v", "5.*.*")
+    assert (code, result) == (3, {"builds": []})
+
+
+def test_prune(launcher):
+    library, run = launcher
+
+    code, result = run("prune", "--keep-newest", "2", "--dry-run")
+    assert code == 0
+    assert result["dry_run"]
+    assert [Path(r["path"]).name for r in result["removed"]] == ["blender-4.2.2", "blender-4.2.1", "blender-4.2.0"]
+    assert len(list((library / "daily").iterdir())) == 5
+
+    code, result = run("prune", "--keep-newest", "2", "--delete")
+    assert code == 0
+    assert (result["kept"], result["failed"]) == (2, [])
+    assert sorted(p.name for p in (library / "daily").iterdir()) == ["blender-4.2.3", "blender-4.2.4"]
+    # Nothing is left for the GUI to clean up
+    assert list((library / ".trash-pending").iterdir()) == []
@@ -0,0 +1,37 @@
+import sys
+from datetime import UTC, datetime
+
+import pytest
+from semver import Version
+
+from source.modules.build_info import BuildInfo, is_lts_version
+
+# The copy BuildInfo uses, imported from within the source folder as `modules.bl_api_manager`
+bl_api_manager = sys.modules[is_lts_version.__module__]
+
+
+@pytest.fixture
+def api_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(bl_api_manager, "CONFIG_PATH", tmp_path)
+    monkeypatch.setattr(bl_api_manager, "BL_API_PATH", tmp_path / "Blender Launcher API.json")
+    bl_api_manager.invalidate_bl_api()
+    yield
+    bl_api_manager.invalidate_bl_api()
+
+
+def _branch(subversion: str) -> str:
+    return BuildInfo("", subversion, "", datetime(2025, 1, 1, tzinfo=UTC), "stable").branch
+
+
+def test_lts_follows_api_updates(api_file):
+    bl_api_manager.update_local_api_files({"blender_versions": {"9.1": "LTS", "9.0": ""}})
+    assert _branch("9.1.3") == "lts"
+    assert _branch("9.10.0") == "stable"
+    assert _branch("9.0.1") == "stable"
+    assert bl_api_manager.lts_blender_version() == [Version(9, 1, 0)]
+
+    # The classification changes with the API file, not only on restart
+    bl_api_manager.update_local_api_files({"blender_versions": {"9.1": "", "9.0": "LTS"}})
+    assert _branch("9.1.3") == "stable"
+    assert _branch("9.0.1") == "lts"
+    assert bl_api_manager.dropdown_blender_version() == {"9.1": 0, "9.0": 1}
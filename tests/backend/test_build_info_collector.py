@@ -1,4 +1,5 @@
 import datetime
+import json
 import os
 import sys
 from pathlib import Path
@@ -59,3 +60,17 @@ def test_display_label_variants():
     sys.platform = "darwin"  # type: ignore
     assert BuildInfo._display_label("stable", Version(2, 80, 0, prerelease="intel"), "2.80.0-rc2") == "Stable - intel"
     sys.platform = p
+
+
+def test_null_fields_in_blinfo_are_invalid(tmp_path: Path):
+    blinfo = tmp_path / ".blinfo"
+    blinfo.write_text(
+        '{"file_version": "1.5", "blinfo": [{"branch": "stable", "subversion": null, "build_hash": "",'
+        ' "commit_time": "2024-07-16T00:00:00+00:00"}]}',
+        encoding="utf-8",
+    )
+    data = json.loads(blinfo.read_text(encoding="utf-8"))
+    assert not BuildInfo.from_dict(tmp_path.as_posix(), data["blinfo"][0]).is_valid()
+
+    data["blinfo"][0].update(subversion="4.2.0", branch=None)
+    assert not BuildInfo.from_dict(tmp_path.as_posix(), data["blinfo"][0]).is_valid()
@@ -16,26 +16,33 @@ from source.modules.platform_utils import get_platform
 from source.modules.settings import get_bash_arguments, set_bash_arguments
 from tests.config import SKIP_TESTS_THAT_MODIFY_CONFIG
 
+# Version strings as the scrapers and the library find them, and what they parse to
+PARSER_CASES = [
+    (("Blender1.0", True), Version(1, 0, 0)),
+    (("blender-4.3.0-alpha-linux", True), Version(4, 3, 0, prerelease="alpha")),
+    (("3.6.14", False), Version(3, 6, 14)),
+    (("4.3.0-alpha+daily.ddc9f92777cd", True), Version(4, 3, 0, prerelease="alpha", build="daily.ddc9f92777cd")),
+    (
+        ("blender-3.3.21-stable+v33.e016c21db151-linux.x86_64-release.tar.xz", True),
+        Version(3, 3, 21, prerelease="stable", build="v33.e016c21db151"),
+    ),
+    (("blender-4.1.0-linux-x64.tar.xz", False), Version(4, 1, 0)),
+    (("2.80 (sub 75)", False), Version(2, 80, 0, prerelease="(sub 75)")),
+    (("2.79rc1", False), Version(2, 79, 0, prerelease="rc1")),
+    (("3.6", False), Version(3, 6, 0)),
+    (("v4.4.4", True), Version(4, 4, 4)),
+    (("BLENDER1.0", True), Version(1, 0, 0)),
+    (("4.4.0 Alpha", False), Version(4, 4, 0, prerelease="alpha")),
+    (("4.2.1 LTS", False), Version(4, 2, 1)),
+    # UPBGE release tags
+    (("0.36.1", False), Version(0, 36, 1)),
+    (("0.30", False), Version(0, 30, 0)),
+    (("0.50-alpha", False), Version(0, 50, 0, prerelease="alpha")),
+]
+
 
 def test_parser():
-    args = [
-        (("Blender1.0", True), Version(1, 0, 0)),
-        (("blender-4.3.0-alpha-linux", True), Version(4, 3, 0, prerelease="alpha")),
-        (("3.6.14", False), Version(3, 6, 14)),
-        (("4.3.0-alpha+daily.ddc9f92777cd", True), Version(4, 3, 0, prerelease="alpha", build="daily.ddc9f92777cd")),
-        (
-            ("blender-3.3.21-stable+v33.e016c21db151-linux.x86_64-release.tar.xz", True),
-            Version(3, 3, 21, prerelease="stable", build="v33.e016c21db151"),
-        ),
-        (("blender-4.1.0-linux-x64.tar.xz", False), Version(4, 1, 0)),
-        (("2.80 (sub 75)", False), Version(2, 80, 0, prerelease="(sub 75)")),
-        (("2.79rc1", False), Version(2, 79, 0, prerelease="rc1")),
-        (("3.6", False), Version(3, 6, 0)),
-        (("v4.4.4", True), Version(4, 4, 4)),
-        (("BLENDER1.0", True), Version(1, 0, 0)),
-        (("4.4.0 Alpha", False), Version(4, 4, 0, prerelease="alpha")),
-    ]
-    for (txt, search), ver in args:
+    for (txt, search), ver in PARSER_CASES:
         print(txt, search, ver)
         assert parse_blender_ver(txt, search) == ver
         if not search:  # things that do not need to be searched should also work when searched
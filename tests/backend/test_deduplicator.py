@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+
+from source.threads.deduplicator import INDEX_NAME, MIN_FILE_SIZE, DedupIndex, deduplicate
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+SHARED = os.urandom(MIN_FILE_SIZE * 2)
+
+
+def _make_build(library: Path, name: str, unique_size: int) -> Path:
+    build = library / "daily" / name
+    (build / "datafiles").mkdir(parents=True)
+    (build / "datafiles" / "shared.bin").write_bytes(SHARED)
+    (build / "blender").write_bytes(os.urandom(unique_size))
+    (build / "small.txt").write_text("small files are ignored")
+    return build
+
+
+def _same_file(a: Path, b: Path) -> bool:
+    sa, sb = a.stat(), b.stat()
+    return (sa.st_dev, sa.st_ino) == (sb.st_dev, sb.st_ino)
+
+
+def test_deduplicate_links_identical_files(tmp_path: Path):
+    b1 = _make_build(tmp_path, "blender-4.3.0", MIN_FILE_SIZE)
+    b2 = _make_build(tmp_path, "blender-4.3.1", MIN_FILE_SIZE + 1)
+
+    result = deduplicate(tmp_path, [b2], [b1, b2])
+
+    assert result.linked_files == 1
+    assert result.saved_bytes == len(SHARED)
+    assert (b2 / "datafiles" / "shared.bin").read_bytes() == SHARED
+    assert (b2 / "blender").read_bytes() != (b1 / "blender").read_bytes()
+    # Reflinks are not detectable from the inode, but tmp filesystems fall back to hardlinks
+    shared1, shared2 = b1 / "datafiles" / "shared.bin", b2 / "datafiles" / "shared.bin"
+    assert _same_file(shared1, shared2) or shared1.stat().st_nlink == 1
+    assert not _same_file(b1 / "small.txt", b2 / "small.txt")
+
+
+def test_deduplicate_is_incremental(tmp_path: Path):
+    b1 = _make_build(tmp_path, "blender-4.3.0", MIN_FILE_SIZE)
+    b2 = _make_build(tmp_path, "blender-4.3.1", MIN_FILE_SIZE + 1)
+    deduplicate(tmp_path, [b1, b2], [b1, b2])
+    assert (tmp_path / INDEX_NAME).is_file()
+
+    b3 = _make_build(tmp_path, "blender-4.3.2", MIN_FILE_SIZE + 2)
+    result = deduplicate(tmp_path, [b3], [b1, b2, b3])
+
+    # Only the new build's copy needs hashing, the others come from the index
+    assert result.hashed_bytes == len(SHARED)
+    assert result.linked_files == 1
+
+
+def test_deduplicate_prunes_removed_builds(tmp_path: Path):
+    b1 = _make_build(tmp_path, "blender-4.3.0", MIN_FILE_SIZE)
+    b2 = _make_build(tmp_path, "blender-4.3.1", MIN_FILE_SIZE + 1)
+    deduplicate(tmp_path, [b1, b2], [b1, b2])
+
+    deduplicate(tmp_path, [], [b2])
+
+    assert all(k.startswith("daily/blender-4.3.1/") for k in DedupIndex.load(tmp_path).files)
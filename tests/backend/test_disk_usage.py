@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+
+from source.threads.disk_usage import DiskUsageIndex, folder_size
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def _make_build(path: Path, size: int) -> Path:
+    (path / "lib").mkdir(parents=True)
+    (path / "blender").write_bytes(os.urandom(size))
+    (path / "lib" / "libcycles.so").write_bytes(os.urandom(size * 2))
+    return path
+
+
+def test_folder_size(tmp_path: Path):
+    build = _make_build(tmp_path / "daily" / "blender-4.3.0", 100)
+    (build / "link").symlink_to(build / "lib", target_is_directory=True)
+
+    assert folder_size(build) == 300 + len(os.readlink(build / "link"))
+
+
+def test_index_caches_and_detects_stale_builds(tmp_path: Path):
+    build = _make_build(tmp_path / "daily" / "blender-4.3.0", 100)
+    index = DiskUsageIndex(tmp_path)
+    assert index.cached(build) is None
+    assert index.is_stale(build)
+
+    assert index.size(build) == 300
+    assert not index.is_stale(build)
+
+    # Adding something to the build folder invalidates the entry, but the old size stays available
+    (build / "portable").mkdir()
+    os.utime(build, ns=(0, build.stat().st_mtime_ns + 1))
+    assert index.is_stale(build)
+    assert index.cached(build) == 300
+
+    # Paths outside of the library are not tracked
+    assert index.cached(tmp_path.parent / "elsewhere") is None
+
+
+def test_index_persists_and_prunes(tmp_path: Path):
+    b1 = _make_build(tmp_path / "daily" / "blender-4.3.0", 100)
+    b2 = _make_build(tmp_path / "daily" / "blender-4.3.1", 10)
+    index = DiskUsageIndex(tmp_path)
+    index.record(b1)
+    index.record(b2)
+    index.save()
+
+    loaded = DiskUsageIndex.load(tmp_path)
+    assert loaded.cached(b1) == 300
+    assert not loaded.is_stale(b2)
+
+    loaded.prune([b2])
+    assert loaded.cached(b1) is None
+    assert loaded.cached(b2) == 30
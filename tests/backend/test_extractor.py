@@ -0,0 +1,462 @@
+from __future__ import annotations
+
+import io
+import os
+import shutil
+import sys
+import tarfile
+import threading
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from source.modules.decompression import (
+    DecompressionError,
+    DecompressionStream,
+    StreamBackend,
+    available_backends,
+    extract_zip_parallel,
+    get_stream_backend,
+    plan_shards,
+    plan_zip_extraction,
+    zip_member_path,
+)
+from source.threads import extractor
+
+BUILD_FOLDER = "blender-4.2.0-linux-x64"
+
+
+def _make_tree(root: Path) -> dict[str, bytes]:
+    files = {
+        f"{BUILD_FOLDER}/blender": b"#!/bin/sh\n",
+        f"{BUILD_FOLDER}/4.2/datafiles/colormanagement/config.ocio": b"ocio" * 1000,
+        f"{BUILD_FOLDER}/4.2/python/lib/random.bin": os.urandom(64 * 1024),
+        f"{BUILD_FOLDER}/lib/libcycles.so": b"\0" * 200_000,
+    }
+    for name, data in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    return files
+
+
+def _make_tar(tmp_path: Path, mode: str, suffix: str) -> tuple[Path, dict[str, bytes]]:
+    src = tmp_path / "src"
+    files = _make_tree(src)
+    archive = tmp_path / f"{BUILD_FOLDER}.tar{suffix}"
+    with tarfile.open(archive, mode) as tar:
+        tar.add(src / BUILD_FOLDER, arcname=BUILD_FOLDER)
+    return archive, files
+
+
+def _assert_tree(destination: Path, files: dict[str, bytes]):
+    for name, data in files.items():
+        assert (destination / name).read_bytes() == data
+
+
+def test_extract_tar_python(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(extractor, "get_use_system_decompressors", lambda: False)
+    archive, files = _make_tar(tmp_path, "w:xz", ".xz")
+    destination = tmp_path / "out"
+    progress = []
+
+    result = extractor.extract(archive, destination, lambda a, b: progress.append((a, b)))
+
+    assert result == destination / BUILD_FOLDER
+    _assert_tree(destination, files)
+    assert progress[-1][0] == progress[-1][1]
+
+
+@pytest.mark.parametrize("backend", available_backends(".xz"), ids=lambda b: b.name)
+def test_extract_tar_stream_backend(tmp_path: Path, backend):
+    archive, files = _make_tar(tmp_path, "w:xz", ".xz")
+    destination = tmp_path / "out"
+    progress = []
+
+    result = extractor.extract_tar_stream(
+        DecompressionStream(archive, backend),
+        destination,
+        lambda a, b: progress.append((a, b)),
+    )
+
+    assert result == destination / BUILD_FOLDER
+    _assert_tree(destination, files)
+    assert progress[-1] == (archive.stat().st_size, archive.stat().st_size)
+
+
+def _python_backend(script: str) -> StreamBackend:
+    """A decompressor that runs ``script`` after reading and decompressing stdin into ``data``."""
+    prelude = "import lzma, sys; data = lzma.decompress(sys.stdin.buffer.read()); "
+    return StreamBackend("python-xz", ".xz", (sys.executable, "-c", prelude + script))
+
+
+def test_decompression_stream_reads_stderr_concurrently(tmp_path: Path):
+    archive, files = _make_tar(tmp_path, "w:xz", ".xz")
+    # Far more than a pipe buffer; the decompressor blocks on it unless stderr is read while stdout is
+    backend = _python_backend('sys.stderr.write("warning" * 100_000); sys.stdout.buffer.write(data)')
+
+    extractor.extract_tar_stream(DecompressionStream(archive, backend), tmp_path / "out", lambda *_: None)
+
+    _assert_tree(tmp_path / "out", files)
+
+
+def test_extract_tar_falls_back_when_backend_dies(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    archive, files = _make_tar(tmp_path, "w:xz", ".xz")
+    backend = _python_backend('sys.stdout.buffer.write(data[: len(data) // 2]); sys.exit("out of memory")')
+    with pytest.raises(DecompressionError, match="out of memory"):
+        extractor.extract_tar_stream(DecompressionStream(archive, backend), tmp_path / "stream", lambda *_: None)
+
+    monkeypatch.setattr(extractor, "get_use_system_decompressors", lambda: True)
+    monkeypatch.setattr(extractor, "get_stream_backend", lambda *_: backend)
+    result = extractor.extract(archive, tmp_path / "out", lambda *_: None)
+
+    assert result == tmp_path / "out" / BUILD_FOLDER
+    _assert_tree(tmp_path / "out", files)
+
+
+def test_get_stream_backend_python_disables_backends(tmp_path: Path):
+    assert get_stream_backend(tmp_path / "a.tar.xz", "python") is None
+    assert get_stream_backend(tmp_path / "a.tar.unknown") is None
+
+
+def _make_zip(tmp_path: Path, count: int = 300) -> tuple[Path, dict[str, bytes]]:
+    files = {f"{BUILD_FOLDER}/{i % 7}/{i % 3}/file{i}.py": f"print({i})\n".encode() * (i + 1) for i in range(count)}
+    files[f"{BUILD_FOLDER}/blender.exe"] = os.urandom(300_000)
+    archive = tmp_path / f"{BUILD_FOLDER}.zip"
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(f"{BUILD_FOLDER}/", b"")
+        zf.writestr(f"{BUILD_FOLDER}/empty/", b"")
+        for name, data in files.items():
+            zf.writestr(name, data)
+    return archive, files
+
+
+def test_plan_shards_balances_bytes():
+    members = []
+    for i, size in enumerate([1000, 900, 800, 100, 100, 100, 50, 50]):
+        info = zipfile.ZipInfo(f"f{i}")
+        info.file_size = size * 1024 * 1024
+        members.append(info)
+
+    shards = plan_shards(members, 3, lambda m: m.file_size)
+
+    assert sorted(m.filename for shard in shards for m in shard) == sorted(m.filename for m in members)
+    loads = [sum(m.file_size for m in shard) for shard in shards]
+    assert max(loads) - min(loads) <= 200 * 1024 * 1024
+
+
+def test_plan_shards_more_shards_than_members():
+    members = [zipfile.ZipInfo("a"), zipfile.ZipInfo("b")]
+    assert len(plan_shards(members, 16, lambda m: m.file_size)) == 2
+
+
+def test_zip_member_path_sanitizes_like_zipfile():
+    assert zip_member_path("a/b/c.txt") == ("a", "b", "c.txt")
+    assert zip_member_path("../../etc/passwd") == ("etc", "passwd")
+    assert zip_member_path("/abs/./x") == ("abs", "x")
+    assert zip_member_path("./") is None
+
+
+def test_extract_zip_parallel(tmp_path: Path):
+    archive, files = _make_zip(tmp_path)
+    destination = tmp_path / "out"
+    progress = []
+
+    with zipfile.ZipFile(archive) as zf:
+        plan = plan_zip_extraction(zf.infolist(), destination)
+    extract_zip_parallel(archive, plan, lambda a, b: progress.append((a, b)), workers=2)
+
+    _assert_tree(destination, files)
+    assert (destination / BUILD_FOLDER / "empty").is_dir()
+    total = sum(len(data) for data in files.values())
+    assert progress[0] == (0, total)
+    assert progress[-1] == (total, total)
+    assert [p[0] for p in progress] == sorted(p[0] for p in progress)
+
+
+def test_extract_zip_parallel_matches_serial(tmp_path: Path):
+    archive, _ = _make_zip(tmp_path, count=50)
+    with zipfile.ZipFile(archive) as zf:
+        zf.extractall(tmp_path / "serial")
+        plan = plan_zip_extraction(zf.infolist(), tmp_path / "parallel")
+        extract_zip_parallel(archive, plan, lambda *_: None, workers=2)
+
+    serial = {p.relative_to(tmp_path / "serial"): p for p in (tmp_path / "serial").rglob("*")}
+    parallel = {p.relative_to(tmp_path / "parallel"): p for p in (tmp_path / "parallel").rglob("*")}
+    assert serial.keys() == parallel.keys()
+    for rel, path in serial.items():
+        if path.is_file():
+            assert path.read_bytes() == parallel[rel].read_bytes()
+
+
+def _write_zip(path: Path, files: dict[str, bytes]) -> Path:
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, data in files.items():
+            zf.writestr(name, data)
+    return path
+
+
+def _tree(root: Path) -> dict[str, bytes]:
+    return {p.relative_to(root).as_posix(): p.read_bytes() for p in root.rglob("*") if p.is_file()}
+
+
+def test_extract_upbge_bin_release_rewrite(tmp_path: Path):
+    archive = _write_zip(
+        tmp_path / "upbge-0.44-windows.zip",
+        {
+            "bin/Release/blender.exe": b"exe",
+            "bin/Release/4.4/scripts/a.py": b"a",
+            "bin/other.txt": b"dropped",
+        },
+    )
+
+    result = extractor.extract(archive, tmp_path / "out", lambda *_: None, is_upbge=True)
+
+    assert result == tmp_path / "out" / "upbge-0.44-windows"
+    assert _tree(result) == {"blender.exe": b"exe", "4.4/scripts/a.py": b"a"}
+
+
+def test_extract_upbge_nested_rewrite(tmp_path: Path):
+    archive = _write_zip(
+        tmp_path / "upbge-0.36.zip",
+        {
+            "upbge-0.36/": b"",
+            "upbge-0.36/upbge-0.36-windows/": b"",
+            "upbge-0.36/upbge-0.36-windows/blender.exe": b"exe",
+            "upbge-0.36/upbge-0.36-windows/3.6/datafiles/x": b"x",
+        },
+    )
+
+    result = extractor.extract(archive, tmp_path / "out", lambda *_: None, is_upbge=True)
+
+    assert result == tmp_path / "out" / "upbge-0.36"
+    assert _tree(result) == {"blender.exe": b"exe", "3.6/datafiles/x": b"x"}
+
+
+def test_upbge_rewrite_matches_fix_upbge_structure(tmp_path: Path):
+    files = {
+        f"{BUILD_FOLDER}/upbge/blender": b"exe",
+        f"{BUILD_FOLDER}/upbge/lib/a.so": b"a",
+        f"{BUILD_FOLDER}/readme.txt": b"dropped by the fix as well",
+    }
+    src = tmp_path / "src"
+    for name, data in files.items():
+        (src / name).parent.mkdir(parents=True, exist_ok=True)
+        (src / name).write_bytes(data)
+    archive = tmp_path / f"{BUILD_FOLDER}.tar.gz"
+    with tarfile.open(archive, "w:gz") as tar:
+        tar.add(src / BUILD_FOLDER, arcname=BUILD_FOLDER)
+
+    with tarfile.open(archive) as tar:
+        tar.extractall(tmp_path / "fixed")
+    expected = _tree(extractor._fix_upbge_structure(tmp_path / "fixed" / BUILD_FOLDER))
+
+    with tarfile.open(archive) as tar:
+        rewrite = extractor._plan_upbge_rewrite(tar.getnames(), f"{BUILD_FOLDER}/")
+        for member in tar.getmembers():
+            if extractor._rewrite_tar_member(member, rewrite):
+                tar.extract(member, tmp_path / "rewritten")
+
+    assert _tree(tmp_path / "rewritten" / BUILD_FOLDER) == expected == {"blender": b"exe", "lib/a.so": b"a"}
+
+
+def test_extract_task_staged(tmp_path: Path, qapplication):
+    archive, files = _make_zip(tmp_path, count=10)
+    destination = tmp_path / "library" / "daily"
+    destination.mkdir(parents=True)
+    finished = []
+
+    task = extractor.ExtractTask(file=archive, destination=destination)
+    task.finished.connect(lambda path, removed: finished.append((path, removed)))
+    task.run()
+
+    assert finished == [(destination / BUILD_FOLDER, False)]
+    _assert_tree(destination, files)
+    assert [p.name for p in destination.iterdir()] == [BUILD_FOLDER]
+
+
+def test_replaced_build_is_trashed_from_the_library(tmp_path: Path, qapplication, monkeypatch: pytest.MonkeyPatch):
+    archive, files = _make_zip(tmp_path, count=10)
+    destination = tmp_path / "library" / "daily"
+    (destination / BUILD_FOLDER).mkdir(parents=True)
+    (destination / BUILD_FOLDER / "old").write_text("old")
+    trashed: list[tuple[Path, str]] = []
+    done = threading.Event()
+
+    def send2trash(path):
+        trashed.append((Path(path), (Path(path) / "old").read_text()))
+        shutil.rmtree(path)
+        done.set()
+
+    monkeypatch.setattr(extractor, "send2trash", send2trash)
+    finished = []
+    task = extractor.ExtractTask(file=archive, destination=destination)
+    task.finished.connect(lambda path, removed: finished.append((path, removed)))
+    task.run()
+
+    assert finished == [(destination / BUILD_FOLDER, True)]
+    assert done.wait(10)
+    # Restoring it from the trash brings it back next to the new build
+    assert trashed == [(destination / f"{BUILD_FOLDER}-replaced", "old")]
+    _assert_tree(destination, files)
+    assert [p.name for p in destination.iterdir()] == [BUILD_FOLDER]
+
+
+def test_interrupted_replacement_is_trashed_from_the_library(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    trashed = []
+    monkeypatch.setattr(extractor, "send2trash", lambda path: trashed.append(Path(path)))
+    (tmp_path / f"{extractor.REPLACED_PREFIX}1234" / BUILD_FOLDER).mkdir(parents=True)
+
+    extractor.clean_up_interrupted_extractions([tmp_path])
+
+    assert trashed == [tmp_path / f"{BUILD_FOLDER}-replaced"]
+    assert not (tmp_path / f"{extractor.REPLACED_PREFIX}1234").exists()
+
+
+def test_swap_into_place_moves_old_build_aside(tmp_path: Path):
+    final = tmp_path / "build"
+    final.mkdir()
+    (final / "old").write_text("old")
+    staged = tmp_path / ".staging-1" / "build"
+    staged.mkdir(parents=True)
+    (staged / "new").write_text("new")
+
+    old = extractor._swap_into_place(staged, final)
+
+    assert old is not None
+    assert old.parent.name.startswith(extractor.REPLACED_PREFIX)
+    assert (old / "old").read_text() == "old"
+    assert [p.name for p in final.iterdir()] == ["new"]
+
+
+def _delta_archives(tmp_path: Path, fmt: str) -> tuple[Path, Path]:
+    """Archives of an old and a new build, where the new build changed a few files."""
+    old = {
+        "a.txt": b"unchanged" * 1000,
+        "lib/b.so": os.urandom(100_000),
+        "lib/c.so": os.urandom(100_000),
+        "changed_tail.bin": b"x" * 300_000,
+    }
+    new = {
+        **old,
+        "lib/c.so": os.urandom(100_000),
+        "changed_tail.bin": b"x" * 299_999 + b"y",
+        "added.txt": b"new file",
+    }
+    archives = []
+    for name, files in (("blender-4.3.0", old), ("blender-4.3.1", new)):
+        if fmt == "zip":
+            archive = _write_zip(tmp_path / f"{name}.zip", {f"{name}/{k}": v for k, v in files.items()})
+        else:
+            src = tmp_path / "src" / name
+            for rel, data in files.items():
+                (src / rel).parent.mkdir(parents=True, exist_ok=True)
+                (src / rel).write_bytes(data)
+            archive = tmp_path / f"{name}.tar.xz"
+            with tarfile.open(archive, "w:xz") as tar:
+                tar.add(src, arcname=name)
+        archives.append(archive)
+    return archives[0], archives[1]
+
+
+@pytest.mark.parametrize("fmt", ["zip", "tar"])
+def test_extract_delta_matches_full_extraction(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, fmt: str):
+    monkeypatch.setattr(extractor, "get_use_system_decompressors", lambda: False)
+    old_archive, new_archive = _delta_archives(tmp_path, fmt)
+    old_build = extractor.extract(old_archive, tmp_path / "library", lambda *_: None)
+    expected = extractor.extract(new_archive, tmp_path / "full", lambda *_: None)
+    progress = []
+
+    delta = extractor.DeltaSource(old_build)
+    result = extractor.extract(new_archive, tmp_path / "delta", lambda a, b: progress.append((a, b)), delta=delta)
+
+    assert _tree(result) == _tree(expected)
+    assert delta.reused_files == 2
+    assert progress[-1][0] == progress[-1][1]
+    if fmt == "tar":
+        assert (result / "lib" / "b.so").stat().st_mtime == (expected / "lib" / "b.so").stat().st_mtime
+
+
+def test_extract_tar_delta_without_data_filter(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    # Python before 3.11.4
+    monkeypatch.delattr(tarfile, "data_filter")
+    monkeypatch.setattr(extractor, "get_use_system_decompressors", lambda: False)
+    old_archive, new_archive = _delta_archives(tmp_path, "tar")
+    old_build = extractor.extract(old_archive, tmp_path / "library", lambda *_: None)
+    expected = extractor.extract(new_archive, tmp_path / "full", lambda *_: None)
+
+    delta = extractor.DeltaSource(old_build)
+    result = extractor.extract(new_archive, tmp_path / "delta", lambda *_: None, delta=delta)
+
+    assert _tree(result) == _tree(expected)
+    assert delta.reused_files == 0
+
+
+def test_extract_zip_delta_decides_parallelism_on_changed_members(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    old_archive, new_archive = _delta_archives(tmp_path, "zip")
+    old_build = extractor.extract(old_archive, tmp_path / "library", lambda *_: None)
+    decided = []
+    monkeypatch.setattr(extractor, "should_extract_in_parallel", lambda members: decided.append(members) or False)
+
+    extractor.extract(new_archive, tmp_path / "delta", lambda *_: None, delta=extractor.DeltaSource(old_build))
+
+    assert sorted(m.filename for m in decided[0]) == [
+        "blender-4.3.1/added.txt",
+        "blender-4.3.1/changed_tail.bin",
+        "blender-4.3.1/lib/c.so",
+    ]
+
+
+@pytest.mark.parametrize("backend", available_backends(".xz"), ids=lambda b: b.name)
+def test_extract_tar_stream_delta(tmp_path: Path, backend):
+    old_archive, new_archive = _delta_archives(tmp_path, "tar")
+    with tarfile.open(old_archive) as tar:
+        tar.extractall(tmp_path / "library")
+    with tarfile.open(new_archive) as tar:
+        tar.extractall(tmp_path / "full")
+
+    delta = extractor.DeltaSource(tmp_path / "library" / "blender-4.3.0")
+    result = extractor.extract_tar_stream(
+        DecompressionStream(new_archive, backend), tmp_path / "delta", lambda *_: None, delta
+    )
+
+    assert _tree(result) == _tree(tmp_path / "full" / "blender-4.3.1")
+    assert delta.reused_files == 2
+
+
+def test_extract_tar_delta_rejects_paths_outside(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(extractor, "get_use_system_decompressors", lambda: False)
+    old_build = tmp_path / "library" / "blender-4.3.0"
+    old_build.mkdir(parents=True)
+    # The old copy the member is compared with
+    (tmp_path / "outside.txt").write_bytes(b"evil")
+    archive = tmp_path / "blender-4.3.1.tar.xz"
+    with tarfile.open(archive, "w:xz") as tar:
+        info = tarfile.TarInfo("blender-4.3.1/../../outside.txt")
+        info.size = 4
+        tar.addfile(info, io.BytesIO(b"evil"))
+
+    with pytest.raises(tarfile.OutsideDestinationError):
+        extractor.extract(archive, tmp_path / "out" / "delta", lambda *_: None, delta=extractor.DeltaSource(old_build))
+    assert not (tmp_path / "out" / "outside.txt").exists()
+
+
+def test_extract_tar_delta_links_only_matching_modes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(extractor, "get_use_system_decompressors", lambda: False)
+    old_archive, new_archive = _delta_archives(tmp_path, "tar")
+    old_build = extractor.extract(old_archive, tmp_path / "library", lambda *_: None)
+    (old_build / "a.txt").chmod(0o600)
+    old_mtime = (old_build / "lib" / "b.so").stat().st_mtime_ns - 10**9
+    os.utime(old_build / "lib" / "b.so", ns=(old_mtime, old_mtime))
+
+    delta = extractor.DeltaSource(old_build, hardlink=True)
+    result = extractor.extract(new_archive, tmp_path / "delta", lambda *_: None, delta=delta)
+
+    assert delta.reused_files == 2
+    # A file whose mode changed is copied, so the old build keeps its own mode
+    assert not (result / "a.txt").samefile(old_build / "a.txt")
+    assert (old_build / "a.txt").stat().st_mode & 0o777 == 0o600
+    # A linked file isn't touched, which would change the old build as well
+    assert (result / "lib" / "b.so").samefile(old_build / "lib" / "b.so")
+    assert (old_build / "lib" / "b.so").stat().st_mtime_ns == old_mtime
@@ -0,0 +1,85 @@
+"""
+Import time budgets for starting the launcher.
+
+Modules are measured with ``python -X importtime`` in a fresh interpreter. The budgets are well above what a
+developer machine needs, so they catch a slow dependency moving back onto a startup path rather than noise.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parents[2]
+
+# Milliseconds, the best of RUNS
+GUI_BUDGET = 1000
+CLI_BUDGET = 300
+RUNS = 3
+
+# Only needed once builds are scraped, extracted, read or the keyring is opened
+HEAVY_MODULES = {
+    "dateparser",
+    "bs4",
+    "lxml",
+    "py7zr",
+    "webdav4",
+    "zstandard",
+    "keyring",
+    "distro",
+    "pynput",
+    "markdown",
+}
+
+
+def import_times(*modules: str) -> tuple[float, set[str]]:
+    """Milliseconds it takes to import ``modules`` and the names of all modules that got imported."""
+    env = os.environ | {"PYTHONPATH": str(ROOT / "source"), "QT_QPA_PLATFORM": "offscreen"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(modules)}"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    total = 0
+    imported = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue  # header
+        imported.add(name.strip())
+        # Everything imported by the statement is nested under the modules it names
+        if name.strip() in modules and not name.startswith("  "):
+            total += int(cumulative)
+    return total / 1000, imported
+
+
+@pytest.mark.parametrize(
+    ("modules", "budget", "forbidden"),
+    [
+        (("main", "windows.main_window"), GUI_BUDGET, HEAVY_MODULES),
+        # Launching or listing builds from the command line and printing help don't need Qt at all
+        (
+            ("main", "modules.headless", "modules.automation", "modules.cli_launching"),
+            CLI_BUDGET,
+            HEAVY_MODULES | {"PySide6", "shiboken6"},
+        ),
+    ],
+    ids=["gui", "cli-launch"],
+)
+def test_startup_import_time(modules: tuple[str, ...], budget: int, forbidden: set[str]):
+    runs = [import_times(*modules) for _ in range(RUNS)]
+    imported = runs[0][1]
+
+    assert not forbidden & (imported | {name.split(".")[0] for name in imported})
+    best = min(ms for ms, _ in runs)
+    assert best < budget, f"importing {', '.join(modules)} took {best:.0f} ms, the budget is {budget} ms"
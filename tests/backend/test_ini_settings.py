@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+from PySide6.QtCore import QSettings
+
+from source.modules.ini_settings import KEYS, IniSettings
+
+VALUES = {
+    "library_folder": "C:\\Users\\user\\Blender Launcher\\library",
+    "Internal/favorite_path": "/home/user/Blender Launcher/library/stable/blender-4.2.0",
+    "version_specific_queries": json.dumps({"4.2.0": "4.2.^", "3.6.0": '3.6.*@"lts"'}),
+    "bash_arguments": "  env VAR=1, --flag ; not a comment  ",
+    "log_level": "DEBUG",
+    "blender_startup_arguments": "--python-expr \"print('héllo')\"\t@",
+}
+
+
+def test_reads_what_qsettings_wrote(tmp_path):
+    file = tmp_path / "Blender Launcher.ini"
+    written = QSettings(file.as_posix(), QSettings.Format.IniFormat)
+    for key, value in VALUES.items():
+        written.setValue(key, value)
+    written.setValue("auto_register_winget", False)
+    written.setValue("window/geometry", b"\x01\x02")
+    written.sync()
+
+    ini = IniSettings(file)
+    for key, value in VALUES.items():
+        assert ini.value(key) == value, key
+        assert ini.value(key, type=str) == value, key
+    assert ini.value("auto_register_winget", defaultValue=True, type=bool) is False
+    assert sorted(KEYS - VALUES.keys()) == ["auto_register_winget"]
+
+
+def test_reads_hand_edited_files(tmp_path):
+    file = tmp_path / "Blender Launcher.ini"
+    file.write_bytes(
+        b"\xef\xbb\xbf; comment\n"
+        b"[General]\n"
+        b"log_level = INFO ; trailing comment\n"
+        b'bash_arguments=" quoted "\n'
+        b"blender_startup_arguments=@@at\n"
+        b"[Internal]\n"
+        b"favorite_path=@Invalid()\n"
+    )
+
+    ini = IniSettings(file)
+    read = QSettings(file.as_posix(), QSettings.Format.IniFormat)
+    for key in read.allKeys():
+        assert ini.value(key) == read.value(key), key
+    assert ini.value("log_level") == "INFO"
+    assert ini.value("Internal/favorite_path", defaultValue="default") is None
+    assert ini.value("library_folder", defaultValue="default") == "default"
+
+
+def test_other_keys_are_read_through_qsettings(tmp_path):
+    with pytest.raises(KeyError, match="show_tray_icon"):
+        IniSettings(tmp_path / "Blender Launcher.ini").value("show_tray_icon")
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import io
+import json
+import sys
+import tarfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+
+import pytest
+
+from source.modules.build_info import BuildInfo
+from source.threads import installer
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+URL = "https://builder.blender.org/download/daily/"
+
+
+class FakeResponse(io.BytesIO):
+    def __init__(self, data: bytes, status: int = 200):
+        super().__init__(data)
+        self.status = status
+        self.headers = {"Content-Type": "application/x-xz", "Content-Length": str(len(data))}
+
+
+class FakeManager:
+    def __init__(self, archives: dict[str, bytes]):
+        self.archives = archives
+
+    def request(self, method: str, url: str, **kwargs):
+        if url not in self.archives:
+            return FakeResponse(b"", status=404)
+        return FakeResponse(self.archives[url])
+
+
+def _make_archive(folder: str, version: str) -> bytes:
+    exe = f'#!/bin/sh\necho "Blender {version}"\necho "build hash: 0123456789ab"\n'.encode()
+    data = io.BytesIO()
+    with tarfile.open(fileobj=data, mode="w:xz") as tar:
+        info = tarfile.TarInfo(f"{folder}/blender")
+        info.size = len(exe)
+        info.mode = 0o755
+        tar.addfile(info, io.BytesIO(exe))
+    return data.getvalue()
+
+
+@pytest.fixture
+def library(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    # The tasks are imported by the installer as `threads.*`, not as `source.threads.*` like in the tests
+    for module in (installer, sys.modules["threads.downloader"], sys.modules["threads.disk_usage"]):
+        monkeypatch.setattr(module, "get_library_folder", lambda: tmp_path)
+    monkeypatch.setattr(installer, "get_platform", lambda: "Linux")
+    monkeypatch.setattr(installer, "get_install_template", lambda: False)
+    monkeypatch.setattr(installer, "get_deduplicate_builds", lambda: False)
+    return tmp_path
+
+
+def _build(name: str, version: str) -> BuildInfo:
+    return BuildInfo(f"{URL}{name}.tar.xz", version, "0123456789ab", datetime(2025, 1, 1, tzinfo=UTC), "daily")
+
+
+def test_install_builds_side_by_side(library: Path, qapplication):
+    # The version of a build is read from the name of its folder
+    names = {"4.2.1-stable": "blender-4.2.1-stable+v42.0123456789ab-linux.x86_64-release", "4.3.0": "blender-4.3.0"}
+    manager = FakeManager({f"{URL}{name}.tar.xz": _make_archive(name, v) for v, name in names.items()})
+    builds = [_build(name, v) for v, name in names.items()]
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = list(pool.map(lambda build: installer.install_build(manager, build), builds))
+
+    for (path, info), version in zip(results, names, strict=True):
+        assert path.parent == library / "daily"
+        assert path.name == f"blender-{info.full_semversion}"
+        assert info.subversion == version
+        blinfo = json.loads((path / ".blinfo").read_text())["blinfo"][0]
+        assert blinfo["subversion"] == version
+        assert blinfo["branch"] == "daily"
+    # Archives are removed once they are extracted
+    assert list((library / ".temp").iterdir()) == []
+
+
+def test_install_reports_failed_download(library: Path, qapplication):
+    with pytest.raises(installer.TaskFailed, match="HTTP 404"):
+        installer.install_build(FakeManager({}), _build("blender-4.2.1", "4.2.1"))
+    assert not (library / "daily").exists()
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+from typing import TYPE_CHECKING
+
+from source.modules.build_info import BuildInfo
+from source.modules.library_index import LibraryIndex
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+
+
+def _make_build(library: Path, folder: str, name: str, subversion: str) -> Path:
+    build = library / folder / name
+    build.mkdir(parents=True)
+    blinfo = {"branch": folder, "subversion": subversion, "build_hash": "", "commit_time": "2024-07-16T00:00:00+00:00"}
+    (build / ".blinfo").write_text(json.dumps({"file_version": "1.5", "blinfo": [blinfo]}), encoding="utf-8")
+    return build
+
+
+def _touch(path: Path):
+    # Modification times may not advance between quick writes
+    os.utime(path, ns=(0, path.stat().st_mtime_ns + 1_000_000))
+
+
+def _versions(index: LibraryIndex, verify: bool = False) -> set[str]:
+    return {info.subversion for _, info in index.refresh(["daily", "stable"], verify)}
+
+
+def test_index_reads_only_what_changed(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    _make_build(tmp_path, "daily", "blender-4.3.0", "4.3.0")
+    stable = _make_build(tmp_path, "stable", "blender-4.2.0", "4.2.0")
+    (tmp_path / "stable" / "broken").mkdir()
+
+    index = LibraryIndex(tmp_path)
+    assert _versions(index) == {"4.3.0", "4.2.0"}
+    index.save()
+
+    module = sys.modules[LibraryIndex.__module__]
+    reads = []
+    read_blinfo = module._read_blinfo
+    monkeypatch.setattr(module, "_read_blinfo", lambda path: reads.append(path) or read_blinfo(path))
+
+    # Nothing changed, so nothing is read
+    index = LibraryIndex.load(tmp_path)
+    assert _versions(index) == {"4.3.0", "4.2.0"}
+    assert reads == []
+
+    # Build info changed outside of the launcher is only found when verifying
+    blinfo = json.loads((stable / ".blinfo").read_text(encoding="utf-8"))
+    blinfo["blinfo"][0]["subversion"] = "4.2.1"
+    (stable / ".blinfo").write_text(json.dumps(blinfo), encoding="utf-8")
+    _touch(stable / ".blinfo")
+    assert _versions(index) == {"4.3.0", "4.2.0"}
+    assert reads == []
+    assert _versions(index, verify=True) == {"4.3.0", "4.2.1"}
+    assert reads == [stable / ".blinfo"]
+
+    # Build info written by the launcher touches the stamp, so it is found right away
+    reads.clear()
+    info = BuildInfo.from_dict(str(stable), blinfo["blinfo"][0])
+    info.subversion = "4.2.2"
+    # BuildInfo.write_to imports the index as `modules.library_index`, not as `source.modules.library_index`
+    monkeypatch.setattr("modules.library_index.get_library_folder", lambda: tmp_path)
+    info.write_to(stable)
+    _touch(stable / ".blinfo")
+    assert _versions(index) == {"4.3.0", "4.2.2"}
+    assert reads == [stable / ".blinfo"]
+
+    # Build info that shows up in a build without any is found without the folder changing
+    (tmp_path / "stable" / "broken" / ".blinfo").write_text(json.dumps(blinfo), encoding="utf-8")
+    assert len(index.refresh(["stable"], verify=True)) == 2
+
+    # Added and removed builds change the modification time of their folder
+    reads.clear()
+    _make_build(tmp_path, "daily", "blender-4.4.0", "4.4.0")
+    (tmp_path / "stable" / "broken" / ".blinfo").unlink()
+    (tmp_path / "stable" / "broken").rmdir()
+    _touch(tmp_path / "daily")
+    _touch(tmp_path / "stable")
+    assert _versions(index) == {"4.3.0", "4.4.0", "4.2.2"}
+    assert reads == [tmp_path / "daily" / "blender-4.4.0" / ".blinfo"]
+
+
+def test_unreadable_index_is_rebuilt(tmp_path: Path):
+    _make_build(tmp_path, "daily", "blender-4.3.0", "4.3.0")
+    (tmp_path / ".library-index.json").write_text("{", encoding="utf-8")
+
+    index = LibraryIndex.load(tmp_path)
+    assert _versions(index) == {"4.3.0"}
+    index.save()
+    assert _versions(LibraryIndex.load(tmp_path)) == {"4.3.0"}
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import os
+import stat
+from typing import TYPE_CHECKING
+
+import pytest
+
+from source.threads import remover
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture
+def library(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(remover, "get_library_folder", lambda: tmp_path)
+    return tmp_path
+
+
+def _make_build(path: Path) -> Path:
+    for i in range(20):
+        sub = path / f"dir{i % 4}" / f"sub{i % 3}"
+        sub.mkdir(parents=True, exist_ok=True)
+        (sub / f"file{i}").write_bytes(b"x" * i)
+    return path
+
+
+def _wait_for_reaper():
+    assert remover.get_reaper().idle.wait(timeout=10)
+
+
+def test_parallel_rmtree(tmp_path: Path):
+    build = _make_build(tmp_path / "build")
+    outside = _make_build(tmp_path / "outside")
+    (build / "link").symlink_to(outside, target_is_directory=True)
+    read_only = build / "read_only"
+    read_only.write_text("x")
+    read_only.chmod(stat.S_IREAD)
+
+    remover.parallel_rmtree(build)
+
+    assert not build.exists()
+    # Symlinked folders are unlinked, not followed
+    assert len(list(outside.rglob("*"))) == len(list(_make_build(tmp_path / "again").rglob("*")))
+
+
+def test_removal_task_tombstones_and_reaps(library: Path, qapplication):
+    build = _make_build(library / "daily" / "blender-4.3.0")
+    results = []
+
+    task = remover.RemovalTask(build, trash=False)
+    task.finished.connect(results.append)
+    task.run()
+
+    assert results == [0]
+    assert not build.exists()
+    _wait_for_reaper()
+    assert list((library / remover.TOMBSTONE_FOLDER).iterdir()) == []
+
+
+def test_reaper_resumes_leftovers(library: Path):
+    leftover = library / remover.TOMBSTONE_FOLDER / "interrupted"
+    _make_build(leftover / "blender-4.2.0")
+    (leftover / remover.TOMBSTONE_MARKER).touch()
+    unmarked = library / remover.TOMBSTONE_FOLDER / "unmarked"
+    _make_build(unmarked / "blender-4.1.0")
+
+    remover.get_reaper().wake()
+    _wait_for_reaper()
+
+    assert not leftover.exists()
+    # Without the marker it isn't a tombstone; leave it alone
+    assert (unmarked / "blender-4.1.0").is_dir()
+
+
+def test_reaper_recovers_from_errors(library: Path, monkeypatch: pytest.MonkeyPatch):
+    build = _make_build(library / "daily" / "blender-4.3.0")
+
+    def fail(tomb: Path):
+        raise RuntimeError("unexpected")
+
+    monkeypatch.setattr(remover.get_reaper(), "reap", fail)
+    tomb = remover.tombstone(build).parent
+    # A failed reaper still goes idle, and the next wake starts over
+    _wait_for_reaper()
+    assert tomb.is_dir()
+
+    monkeypatch.undo()
+    monkeypatch.setattr(remover, "get_library_folder", lambda: library)
+    remover.get_reaper().wake()
+    _wait_for_reaper()
+    assert not tomb.exists()
+
+
+def test_removal_task_trashes_in_place(library: Path, monkeypatch: pytest.MonkeyPatch, qapplication):
+    builds = [_make_build(library / "daily" / f"blender-4.3.{i}") for i in range(3)]
+    trashed = []
+    monkeypatch.setattr(remover, "send2trash", trashed.append)
+
+    remover.RemovalTask(builds[0], trash=True).run()
+    remover.BulkRemovalTask(builds[1:], trash=True).run()
+
+    # The original paths are trashed, so restoring puts them back into the library
+    assert sorted(trashed) == builds
+    assert not (library / remover.TOMBSTONE_FOLDER).exists()
+
+
+def test_purge_temp_folder(library: Path):
+    temp = library / ".temp"
+    temp.mkdir()
+    (temp / "download.zip").write_bytes(os.urandom(100))
+    _make_build(temp / "partial")
+
+    assert remover.purge_temp_folder() is True
+
+    assert list(temp.iterdir()) == []
+    _wait_for_reaper()
+    assert list((library / remover.TOMBSTONE_FOLDER).iterdir()) == []
+
+
+def test_bulk_removal_task(library: Path, monkeypatch: pytest.MonkeyPatch, qapplication):
+    builds = [_make_build(library / "daily" / f"blender-4.3.{i}") for i in range(5)]
+    missing = library / "daily" / "blender-4.2.0"
+    elsewhere = builds[3]
+
+    tombstone = remover.tombstone
+
+    def fake_tombstone(path: Path):
+        if path == elsewhere:
+            raise OSError("Invalid cross-device link")
+        return tombstone(path)
+
+    monkeypatch.setattr(remover, "tombstone", fake_tombstone)
+    progress = []
+    results = []
+
+    task = remover.BulkRemovalTask([*builds, missing], trash=False)
+    task.progress.connect(lambda done, total: progress.append((done, total)))
+    task.finished.connect(lambda removed, failed: results.append((removed, failed)))
+    task.run()
+
+    removed, failed = results[0]
+    assert sorted(removed) == sorted([*builds, missing])
+    assert failed == []
+    assert progress[-1] == (6, 6)
+    assert not any(b.exists() for b in builds)
+    _wait_for_reaper()
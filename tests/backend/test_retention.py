@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import shutil
+import subprocess
+import sys
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from source.modules.build_info import BuildInfo
+from source.threads.retention import RetentionPolicy, RetentionReason, plan_retention, running_builds
+
+NOW = datetime(2025, 6, 1, tzinfo=UTC)
+
+
+def _build(folder: str, version: str, days_old: int, branch="daily", **kwargs) -> tuple[Path, BuildInfo]:
+    path = Path("/library") / folder / f"blender-{version}-{days_old}"
+    info = BuildInfo(path.as_posix(), version, "abc", NOW - timedelta(days=days_old), branch, **kwargs)
+    return path, info
+
+
+def test_keep_newest_per_minor_version():
+    builds = [_build("daily", "4.3.0", d) for d in (1, 5, 3, 9)] + [_build("daily", "4.2.0", 20)]
+
+    plan = plan_retention(builds, RetentionPolicy(keep_newest=2), now=NOW)
+
+    assert {p.name for p in plan.paths} == {"blender-4.3.0-5", "blender-4.3.0-9"}
+    assert all(reason == RetentionReason.NEWEST for _, reason in plan.remove)
+    assert plan.kept == 3
+
+
+def test_protected_builds_are_kept():
+    favorite = _build("daily", "4.3.0", 10, is_favorite=True)
+    frozen = _build("daily", "4.3.0", 11, is_frozen=True)
+    quick_launch = _build("daily", "4.3.0", 12)
+    old = _build("daily", "4.3.0", 13)
+    builds = [_build("daily", "4.3.0", 1), favorite, frozen, quick_launch, old]
+
+    plan = plan_retention(builds, RetentionPolicy(keep_newest=1, max_age_days=5), {quick_launch[0]}, now=NOW)
+
+    assert plan.paths == [old[0]]
+
+
+def test_max_age_and_size():
+    builds = [_build("experimental", "4.4.0", d, branch="experimental") for d in (1, 2, 3, 40)]
+    sizes = {path: 10 for path, _ in builds}
+
+    plan = plan_retention(builds, RetentionPolicy(max_age_days=30, max_total_size=20), now=NOW, size_of=sizes.get)
+
+    assert [(p.name, r) for p, r in plan.remove] == [
+        ("blender-4.4.0-40", RetentionReason.AGE),
+        ("blender-4.4.0-3", RetentionReason.SIZE),
+    ]
+    assert plan.freed_bytes == 20
+    assert plan.batches(1) == [[builds[3][0]], [builds[2][0]]]
+
+
+def test_age_counts_from_installation():
+    old = _build("daily", "4.3.0", 40)
+    reinstalled = _build("daily", "4.3.0", 41)
+    installed = {old[0]: NOW - timedelta(days=35), reinstalled[0]: NOW - timedelta(hours=1)}
+
+    plan = plan_retention([old, reinstalled], RetentionPolicy(max_age_days=30), now=NOW, installed=installed.get)
+
+    assert plan.paths == [old[0]]
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="running builds are found through /proc")
+def test_running_builds(tmp_path: Path):
+    builds = [tmp_path / "daily" / f"blender-4.3.{i}" for i in range(2)]
+    for build in builds:
+        (build / "bin").mkdir(parents=True)
+    exe = builds[1] / "bin" / "blender"
+    shutil.copy(shutil.which("sleep") or "/bin/sleep", exe)
+
+    with subprocess.Popen([exe, "10"]) as process:
+        try:
+            assert running_builds(builds) == {builds[1]}
+        finally:
+            process.kill()
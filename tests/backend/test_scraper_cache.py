@@ -88,3 +88,14 @@ def test_scraper_cache_deserialize():
             ),
         }
     )
+
+
+def test_cached_builds_share_their_values():
+    folder = StableFolder.from_dict({**STABLE_FOLDER_CACHE, "assets": STABLE_FOLDER_CACHE["assets"] * 2})
+    a, b = folder.assets
+
+    assert not hasattr(a, "__dict__")
+    assert a.branch is b.branch
+    assert a.subversion is b.subversion
+    assert a.commit_time is b.commit_time
+    assert a.semversion is a.semversion
@@ -0,0 +1,56 @@
+from PySide6.QtCore import QSettings
+
+from source.modules.settings_store import SettingsStore
+
+
+def test_store_writes_through(tmp_path):
+    file = tmp_path / "config" / "Blender Launcher.ini"
+    store = SettingsStore(file)
+
+    assert store.value("show_update_button", defaultValue=True, type=bool) is True
+    assert not store.contains("show_update_button")
+
+    store.setValue("show_update_button", False)
+    assert store.value("show_update_button", defaultValue=True, type=bool) is False
+    assert store.contains("show_update_button")
+
+    # Still readable with a plain QSettings
+    on_disk = QSettings(file.as_posix(), QSettings.Format.IniFormat)
+    assert on_disk.value("show_update_button", type=bool) is False
+
+    calls = []
+    assert store.derived("show_update_button", lambda: calls.append(1) or len(calls)) == 1
+    assert store.derived("show_update_button", lambda: calls.append(1) or len(calls)) == 1
+    store.remove("show_update_button")
+    assert store.derived("show_update_button", lambda: calls.append(1) or len(calls)) == 2
+    assert store.value("show_update_button", defaultValue=True, type=bool) is True
+
+
+def test_credentials_are_read_once(monkeypatch, tmp_path):
+    from source.modules import settings
+
+    stored = {settings.KEYRING_TOKEN_USERNAME: "token"}
+    reads: list[str] = []
+
+    def get_password(service: str, key: str) -> str | None:
+        reads.append(key)
+        return stored.get(key)
+
+    monkeypatch.setattr(settings, "_credentials", {})
+    monkeypatch.setattr("keyring.get_password", get_password)
+    monkeypatch.setattr("keyring.set_password", lambda service, key, val: stored.__setitem__(key, val))
+    store = SettingsStore(tmp_path / "Blender Launcher.ini")
+    monkeypatch.setattr(settings, "get_settings", lambda: store)
+
+    settings.preload_credentials().join()
+    assert sorted(reads) == sorted(settings.KEYRING_KEYS)
+
+    reads.clear()
+    assert settings.get_github_token() == "token"
+    assert settings.get_proxy_user() == ""
+    assert reads == []
+
+    # Setters update the cached value
+    settings.set_github_token(" other ")
+    assert settings.get_github_token() == "other"
+    assert reads == []
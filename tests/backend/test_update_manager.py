@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from source.modules.blender_update_manager import UPDATE_CATEGORIES, UpdateResolver, UpdateSettings
+from source.modules.build_info import BuildInfo
+
+NOW = datetime(2025, 6, 1, tzinfo=UTC)
+
+
+@dataclass
+class Download:
+    build_info: BuildInfo
+
+
+def _info(version: str, build_hash: str, days_old: int, branch="stable") -> BuildInfo:
+    return BuildInfo(
+        f"https://example.com/{branch}-{version}-{build_hash}",
+        version,
+        build_hash,
+        NOW - timedelta(days=days_old),
+        branch,
+    )
+
+
+def _settings(behavior: int, visible=True) -> UpdateSettings:
+    return UpdateSettings(
+        visible=dict.fromkeys(UPDATE_CATEGORIES, visible),
+        behavior=dict.fromkeys(UPDATE_CATEGORIES, behavior),
+    )
+
+
+def _resolve(current: BuildInfo, downloads: list[BuildInfo], behavior: int, installed=(), visible=True):
+    resolver = UpdateResolver(
+        [Download(d) for d in downloads], [current, *installed], settings=_settings(behavior, visible)
+    )
+    update = resolver.resolve(current)
+    return update.build_info if update is not None else None
+
+
+def test_update_behavior_limits_versions():
+    current = _info("4.1.1", "a", 30)
+    downloads = [_info("4.1.3", "b", 10), _info("4.4.0", "c", 5), _info("5.0.0", "d", 1)]
+
+    assert _resolve(current, downloads, behavior=0) == downloads[2]
+    assert _resolve(current, downloads, behavior=1) == downloads[1]
+    assert _resolve(current, downloads, behavior=2) == downloads[0]
+    assert _resolve(current, downloads, behavior=0, visible=False) is None
+
+    # Versions at or below the highest installed version are no update
+    assert _resolve(current, downloads, behavior=1, installed=[_info("4.5.0", "e", 1)]) is None
+
+
+def test_newer_build_of_same_version():
+    current = _info("4.3.0", "a", 10, branch="daily")
+    downloads = [
+        _info("4.3.0", "a", 10, branch="daily"),  # installed hash
+        _info("4.3.0", "b", 5, branch="daily"),
+        _info("4.3.0", "c", 2, branch="daily"),
+        _info("4.3.0", "d", 1, branch="stable"),  # other branch
+    ]
+
+    assert _resolve(current, downloads, behavior=2) == downloads[2]
+    assert _resolve(current, downloads[:1], behavior=2) is None
+
+
+def test_experimental_branches_share_settings():
+    current = _info("4.4.0", "a", 10, branch="Pr1234")
+    downloads = [_info("4.4.0", "b", 1, branch="Pr1234"), _info("4.4.0", "c", 1, branch="Pr999")]
+    settings = _settings(0)
+    settings.visible["experimental"] = False
+
+    assert _resolve(current, downloads, behavior=0) == downloads[0]
+    assert UpdateResolver([Download(d) for d in downloads], [current], settings=settings).resolve(current) is None
+    # Custom branches never get updates
+    custom = _info("4.4.0", "a", 10, branch="my-fork")
+    assert _resolve(custom, [_info("5.0.0", "b", 1, branch="my-fork")], behavior=0) is None
@@ -1,8 +1,16 @@
 import datetime
+import random
 
+from fuzzysearch import find_near_matches
 from semver import Version
 
-from source.modules.version_matcher import BasicBuildInfo, VersionSearchQuery
+from source.modules.version_matcher import (
+    BasicBuildInfo,
+    BuildIndex,
+    FuzzySearchIndex,
+    QueryFilter,
+    VersionSearchQuery,
+)
 
 utc = datetime.timezone.utc  # noqa: UP017
 
@@ -153,3 +161,87 @@ def test_search_query_parser():
         pass
 
     print("test_search_query_parser successful!")
+
+
+def test_query_filter_incremental():
+    rng = random.Random(4)
+    for query in (
+        VersionSearchQuery.any(),
+        VersionSearchQuery.default(),
+        VersionSearchQuery.version("^", "^", "*"),
+        VersionSearchQuery.version("-", "*", "^"),
+        VersionSearchQuery.version("^", "*", "*", branch=("daily",), commit_time="^"),
+        VersionSearchQuery(fuzzy_text="daly"),
+        VersionSearchQuery(fuzzy_text="stbe", patch="^"),
+    ):
+        query_filter = QueryFilter(query)
+        present: list[BasicBuildInfo] = []
+        for _ in range(60):
+            build = rng.choice(builds)
+            before = set(query_filter.matches)
+            if build in present:
+                present.remove(build)
+                changed = query_filter.remove(build)
+            else:
+                present.append(build)
+                changed = query_filter.add(build)
+
+            # Same result as evaluating the query from scratch, and every change is reported
+            assert query_filter.matches == set(query.match(present)), query
+            assert before ^ query_filter.matches <= changed
+
+
+def test_fuzzy_index_matches_brute_force():
+    def brute_force(search: str, text: str) -> int | None:
+        for d in range(4):
+            if find_near_matches(search, text, max_l_dist=d, max_deletions=1, max_substitutions=1, max_insertions=1):
+                return d
+        return None
+
+    index = FuzzySearchIndex()
+    # Typed one character at a time, then a different search, so the lower bounds are reused and dropped
+    searches = [*(("stable 2024-07")[:n] for n in range(1, 15)), "daly", "dly 4.3", "lts"]
+    for search in searches:
+        for build in builds:
+            expected = brute_force(search.casefold(), build.fuzzy_text.casefold())
+            assert index.distance(search, build) == expected, (search, build)
+            if expected:
+                # Asking for fewer edits than needed finds nothing
+                assert index.distance(search, build, limit=expected - 1) is None
+
+
+def test_build_index_matches_match_versions():
+    rng = random.Random(7)
+    places = ["*", "^", "-", 0, 1, 2, 3, 4]
+    for _ in range(300):
+        present = [
+            BasicBuildInfo(
+                Version(rng.randint(2, 4), rng.randint(0, 3), rng.randint(0, 2)),
+                rng.choice(("stable", "daily", "lts")),
+                rng.choice(("", "cb886aba06d5")),
+                datetime.datetime(2024, 7, rng.randint(1, 4), tzinfo=utc),
+                rng.choice((None, "daily", "stable")),
+            )
+            for _ in range(rng.randint(0, 30))
+        ]
+        # Built in pieces so adding and removing is covered as well
+        index = BuildIndex(present[::2])
+        for build in present:
+            index.add(build)
+        removed = rng.sample(present, len(present) // 4)
+        for build in removed:
+            index.discard(build)
+        present = [build for build in dict.fromkeys(present) if build not in removed]
+
+        query = VersionSearchQuery(
+            major=rng.choice(places),
+            minor=rng.choice(places),
+            patch=rng.choice(places),
+            branch=rng.choice((None, ("daily",), ("stable", "lts"))),
+            commit_time=rng.choice((None, "^", "-", datetime.datetime(2024, 7, 2, tzinfo=utc))),
+            folder=rng.choice((None, "daily")),
+            build_hash=rng.choice((None, "cb886aba06d5")),
+        )
+        matches = index.match(query)
+        assert sorted(matches) == sorted(query.match(present)), query
+        assert matches == sorted(matches, reverse=True)
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+from PySide6.QtCore import QSize, Qt
+from PySide6.QtWidgets import QApplication, QWidget
+
+from source.items.base_list_widget_item import BaseListWidgetItem
+from source.modules.build_info import BuildInfo
+from source.modules.version_matcher import VersionSearchQuery
+from source.widgets.base_build_widget import BaseBuildWidget
+from source.widgets.base_list_widget import BaseListWidget
+from source.widgets.base_page_widget import SortingType
+
+ROWS = 1000
+
+
+class Page(QWidget):
+    sorting_type = SortingType.DATETIME
+    sorting_order = Qt.SortOrder.DescendingOrder
+
+    def get_column_widths(self):
+        return 85, 200, 118
+
+
+def _build_info(i: int) -> BuildInfo:
+    # Every third build has no hash, like stable builds scraped from their download URL
+    return BuildInfo(
+        f"https://example.com/blender-{i}.zip",
+        f"4.{i % 7}.{i % 50}",
+        f"{i:012x}" if i % 3 else "",
+        datetime(2025, 1, 1, tzinfo=UTC) + timedelta(hours=i),
+        ("daily", "experimental", "stable")[i % 3],
+    )
+
+
+def _add(list_widget: BaseListWidget, build_info: BuildInfo, link: Path) -> BaseBuildWidget:
+    item = BaseListWidgetItem(build_info.commit_time)
+    widget = BaseBuildWidget(None, item, build_info)  # type: ignore[arg-type]
+    widget.link = link  # type: ignore[attr-defined]
+    list_widget.add_item(item, widget)
+    return widget
+
+
+@pytest.fixture
+def rows(qapplication: QApplication):
+    page = Page()
+    list_widget = BaseListWidget(page)  # type: ignore[arg-type]
+    widgets = [_add(list_widget, _build_info(i), Path("daily") / f"build-{i}") for i in range(ROWS)]
+    yield list_widget, widgets
+    page.deleteLater()
+
+
+def _rows(list_widget: BaseListWidget) -> list[BaseBuildWidget]:
+    return list(list_widget._model.rows)
+
+
+class LazyWidget(BaseBuildWidget):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.ui_created = False
+
+    def sizeHint(self):
+        return QSize(200, 40)
+
+    def create_ui(self):
+        self.ui_created = True
+
+
+def test_lookups_match_linear_scan(rows):
+    list_widget, widgets = rows
+
+    for i in range(0, ROWS, 37):
+        query = _build_info(i)
+        found = list_widget.widget_with_blinfo(query)
+        assert found is not None and query == found.build_info
+        assert list_widget.contains_build_info(query)
+        assert list_widget.widget_with_link(Path("daily") / f"build-{i}") is widgets[i]
+
+        # A hash only matches the same hash, a missing hash falls back to the version
+        other = BuildInfo(query.link, query.subversion, "ffffffffffff", query.commit_time, query.branch)
+        expected = any(other == w.build_info for w in widgets)
+        assert (list_widget.widget_with_blinfo(other) is not None) == expected
+
+    assert list_widget.widget_with_link(Path("daily") / "missing") is None
+    assert not list_widget.contains_build_info(BuildInfo("", "9.9.9", "", datetime.now(tz=UTC), "daily"))
+
+
+def test_indexes_follow_removal(rows):
+    list_widget, widgets = rows
+
+    list_widget.remove_item(widgets[1].item)
+    assert list_widget.widget_with_link(Path("daily") / "build-1") is None
+    assert list_widget.widget_with_blinfo(widgets[1].build_info) in (*widgets[2:], None)
+
+    list_widget.clear_by_folder("daily")
+    assert list_widget.count() == 0
+    assert list_widget.widget_with_blinfo(widgets[2].build_info) is None
+    assert not list_widget.contains_build_info(widgets[2].build_info)
+
+
+def test_lookups_scale(rows):
+    list_widget, widgets = rows
+    queries = [_build_info(i) for i in range(ROWS)]
+
+    start = time.perf_counter()
+    for query in queries:
+        if not list_widget.contains_build_info(query):
+            list_widget.widget_with_blinfo(query)
+    indexed = time.perf_counter() - start
+
+    # What every lookup used to do; a tenth of the queries is enough to tell
+    start = time.perf_counter()
+    for query in queries[::10]:
+        fsv = query.full_semversion
+        if not any(fsv == w.build_info.full_semversion for w in widgets):
+            next((w for w in widgets if query == w.build_info), None)
+    scanned = (time.perf_counter() - start) * 10
+
+    assert indexed * 20 < scanned
+
+
+def test_sorting(rows):
+    list_widget, widgets = rows
+    page = list_widget.page
+
+    # Newest first
+    list_widget.sortItems(Qt.SortOrder.AscendingOrder)
+    assert _rows(list_widget) == widgets[::-1]
+    list_widget.sortItems(Qt.SortOrder.DescendingOrder)
+    assert _rows(list_widget) == widgets
+
+    page.sorting_type = SortingType.LABEL
+    list_widget.sortItems(Qt.SortOrder.AscendingOrder)
+    labels = [w.build_info.display_label for w in _rows(list_widget)]
+    assert labels == sorted(labels)
+
+    page.sorting_type = SortingType.VERSION
+    list_widget.sortItems(Qt.SortOrder.AscendingOrder)
+    keys = [(w.build_info.semversion, w.item.date) for w in _rows(list_widget)]
+    assert keys == sorted(keys, reverse=True)
+
+    # New rows go where they're sorted
+    widget = _add(list_widget, _build_info(ROWS + 1), Path("daily") / "new")
+    assert list_widget._model.row_of(widget) == _rows(list_widget).index(widget)
+
+
+def test_filtered_rows_leave_the_model(rows):
+    list_widget, widgets = rows
+
+    list_widget.update_tab_filter(VersionSearchQuery.any().with_branch(("daily",)))
+    daily = [w for w in widgets if w.build_info.branch == "daily"]
+    assert set(_rows(list_widget)) == set(daily)
+    assert all(w.item.isHidden() != (w in daily) for w in widgets)
+    assert list_widget.count() == ROWS
+
+    # The selection is kept while the filter changes
+    daily[0].item.setSelected(True)
+    list_widget.update_tab_filter(VersionSearchQuery.any())
+    assert _rows(list_widget) == widgets
+    assert list_widget.selected_widgets() == [daily[0]]
+
+
+def test_only_rows_in_view_get_widgets(qapplication: QApplication):
+    page = Page()
+    page.resize(400, 400)
+    list_widget = BaseListWidget(page)  # type: ignore[arg-type]
+    list_widget.resize(400, 400)
+    widgets = []
+    for i in range(200):
+        item = BaseListWidgetItem(_build_info(i).commit_time)
+        widget = LazyWidget(None, item, _build_info(i))  # type: ignore[arg-type]
+        list_widget.add_item(item, widget)
+        widgets.append(widget)
+    page.show()
+    list_widget.scroll_to_widget(widgets[0])
+    qapplication.processEvents()
+
+    shown = [w for w in widgets if w.isVisible()]
+    assert shown and len(shown) <= 400 // 40 + 2
+    assert all(w.ui_created for w in shown)
+    assert sum(w.ui_created for w in widgets) < len(widgets) // 2
+
+    list_widget.scroll_to_widget(widgets[-1])
+    assert widgets[-1].ui_created and widgets[-1].isVisible()
+    assert not widgets[0].isVisible()
+    page.deleteLater()